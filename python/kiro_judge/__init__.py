@@ -0,0 +1,7 @@
+# Judge of the KIRO 2023 edition : checks that a solution is valid and gives it a score.
+# Importing the package has no side effect and only imports the pure python modules,
+# the numpy engine (vectorized_cost) and the compiled instances are imported when used.
+# The command line is rteparser.main (parser for a full report), installed as the kiro-judge console script.
+
+from .api import load_instance, score, validate
+from .errors import InstanceError
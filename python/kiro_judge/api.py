@@ -0,0 +1,75 @@
+from .constraints import check_constraints
+from .converter import convert_instance
+from .cost import cost, PYTHON_ENGINE
+from .errors import InstanceError
+from .loader import load_json
+from .solution_pipeline import check_and_convert_solution
+import copy
+import os
+
+# Public API of the judge, re-exported by the package :
+#   instance = load_instance("instances/input/huge.json")
+#   problems = validate(instance, solution)  # [] if the solution is valid
+#   total = score(instance, solution)
+# A solution is given either as the path to its json file or as the dictionnary loaded from it,
+# which is not modified. Nothing here imports numpy, the fast engines are imported when asked for.
+
+
+def load_instance(path, compiled=False):
+    """
+    Loads and converts an instance, once for any number of solutions
+    :param path: file path to the json instance
+    :param compiled: whether to load it from its compiled file instead (see compiled_file.py, needs numpy),
+    written next to the instance if it is missing or stale
+    :return: the converted instance, or its CompiledInstance
+    :raises FileNotFoundError if the file doesn't exist
+    :raises InstanceError if the file is not valid json
+    """
+    if compiled:
+        from .compiled_file import open_compiled_instance
+
+        return open_compiled_instance(path)
+    return convert_instance(load_json(path))
+
+
+def checked_solution(instance, solution):
+    """
+    :param instance: the instance, see load_instance
+    :param solution: the solution, as a file path or as loaded from its json file
+    :return: the converted solution
+    :raises InstanceError with details if the solution is not valid
+    """
+    if isinstance(solution, (str, os.PathLike)):
+        solution = load_json(solution)
+    else:
+        # The conversion modifies the raw solution
+        solution = copy.deepcopy(solution)
+    converted = check_and_convert_solution(instance, solution)
+    check_constraints(converted, instance)
+    return converted
+
+
+def validate(instance, solution):
+    """
+    :param instance: the instance, see load_instance
+    :param solution: the solution, as a file path or as loaded from its json file
+    :return: the list of the problems of the solution, empty if it is valid
+    :raises FileNotFoundError if the solution file doesn't exist
+    """
+    try:
+        checked_solution(instance, solution)
+    except InstanceError as errors:
+        return errors.list
+    return []
+
+
+def score(instance, solution, engine=PYTHON_ENGINE):
+    """
+    :param instance: the instance, see load_instance
+    :param solution: the solution, as a file path or as loaded from its json file
+    :param engine: the engine used for the operational cost, see cost.ENGINES
+    :return: the total cost of the solution, construction plus operational
+    :raises InstanceError with details if the solution is not valid
+    :raises FileNotFoundError if the solution file doesn't exist
+    """
+    return cost(instance, checked_solution(instance, solution), engine)
@@ -0,0 +1,257 @@
+from concurrent.futures import ProcessPoolExecutor
+from .converter import convert_instance
+from .loader import load_json
+from .solution_pipeline import check_and_convert_solution
+from .constraints import check_constraints
+from .cost import construction_cost, operational_cost_engine, PYTHON_ENGINE, ENGINES
+from .errors import InstanceError
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+# Fields of each result, in the order of the CSV columns
+FIELDS = [
+    "solution",
+    "score",
+    "construction_cost",
+    "operational_cost",
+    "errors",
+    "time",
+    "cached",
+]
+
+# The converted instance, the engine and the score cache, set once in every worker by init_worker
+_instance = None
+_engine = PYTHON_ENGINE
+_cache = None
+_instance_hash = None
+
+
+def init_worker(instance, engine, instance_hash=None, cache_path=None):
+    """Initializer of the worker processes, the instance is sent once to each worker
+    :param instance: the converted instance
+    :param engine: the engine used for the operational cost, see cost.ENGINES
+    :param instance_hash: the hash of the instance file, see score_cache.file_hash, no score cache if None
+    :param cache_path: the SQLite file of the score cache, shared by the workers, memory only if None
+    """
+    global _instance, _engine, _cache, _instance_hash
+    _instance = instance
+    _engine = engine
+    _instance_hash = instance_hash
+    _cache = None
+    if instance_hash is not None:
+        from .score_cache import ScoreCache
+
+        _cache = ScoreCache(path=cache_path)
+
+
+def init_compiled_worker(instance_path, engine, instance_hash=None, cache_path=None):
+    """Initializer of the worker processes, each worker maps the compiled file of the instance,
+    whose pages are then shared by all the workers
+    :param instance_path: file path to the json instance, already compiled
+    (see init_worker for the other parameters)
+    """
+    from .compiled_file import open_compiled_instance
+
+    init_worker(
+        open_compiled_instance(instance_path, write=False), engine, instance_hash, cache_path
+    )
+
+
+def score_solution(solution_path):
+    """Checks and scores one solution against the instance of the worker
+    :param solution_path: file path to the candidate's solution
+    :return: a dictionnary with the keys of FIELDS, the score is -1 if the solution is not valid
+    or cannot be read
+    """
+    start = time.perf_counter()
+    result = {
+        "solution": solution_path,
+        "score": -1,
+        "construction_cost": None,
+        "operational_cost": None,
+        "errors": [],
+        "cached": False,
+    }
+    costs = None
+    try:
+        if _cache is not None:
+            file_key, costs = _cache.lookup_file(_instance_hash, _engine, solution_path)
+        if costs is None:
+            raw_solution = load_json(solution_path)
+            # The checks only need the size of the lists of the instance, which the conversion keeps
+            solution = check_and_convert_solution(_instance, raw_solution)
+            check_constraints(solution, _instance)
+            if _cache is not None:
+                keys, costs = _cache.lookup_solution(_instance_hash, _engine, solution, file_key)
+        if costs is None:
+            costs = (
+                construction_cost(_instance, solution),
+                operational_cost_engine(_engine)(_instance, solution),
+            )
+            if _cache is not None:
+                _cache.put(keys, *costs)
+        else:
+            result["cached"] = True
+        const_cost, oper_cost = costs
+        result["construction_cost"] = const_cost
+        result["operational_cost"] = oper_cost
+        result["score"] = oper_cost + const_cost
+    except FileNotFoundError:
+        result["errors"] = ["Error: File not found, parsing aborted"]
+    except OSError as err:
+        # A directory matched by the pattern, or a file that cannot be read : only this solution fails
+        result["errors"] = [f"Error: cannot read the solution ({err.strerror}), parsing aborted"]
+    except UnicodeDecodeError as err:
+        # A file that is not text, which load_json cannot decode
+        result["errors"] = [f"Error: cannot read the solution ({err.reason}), parsing aborted"]
+    except InstanceError as errors:
+        result["errors"] = errors.list
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+def solution_paths(pattern):
+    """Lists the solutions to score, in a fixed order
+    :param pattern: a directory, in which case every json file in it is scored, or a glob pattern
+    :return: the sorted list of paths
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.json")
+    return sorted(glob.glob(pattern))
+
+
+def batch_judge(
+    instance_path,
+    paths,
+    workers=1,
+    engine=PYTHON_ENGINE,
+    compiled=False,
+    cache=False,
+    cache_path=None,
+):
+    """Scores many solutions of the same instance, which is loaded and converted only once
+    :param instance_path: file path to the instance
+    :param paths: the file paths to the candidates' solutions
+    :param workers: the number of worker processes
+    :param engine: the engine used for the operational cost, see cost.ENGINES
+    :param compiled: whether to load the instance from its compiled file, see compiled_file.py,
+    instead of sending the converted instance to every worker
+    :param cache: whether to skip the solutions already scored, see score_cache.py
+    :param cache_path: the SQLite file of the score cache, which is then used even if cache is False
+    :return: the list of results (see score_solution), in the same order as paths
+    :raises InstanceError: if the instance itself is not valid
+    """
+    # The score cache and the compiled files (and numpy) are only imported when used
+    instance_hash = None
+    if cache or cache_path is not None:
+        from .score_cache import file_hash
+
+        instance_hash = file_hash(instance_path)
+    if compiled:
+        from .compiled_file import open_compiled_instance
+
+        instance = open_compiled_instance(instance_path)
+        initializer = init_compiled_worker
+        initargs = (instance_path, engine, instance_hash, cache_path)
+    else:
+        instance = convert_instance(load_json(instance_path))
+        initializer, initargs = init_worker, (instance, engine, instance_hash, cache_path)
+    if workers == 1:
+        init_worker(instance, engine, instance_hash, cache_path)
+        return [score_solution(path) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        # map yields the results in the order of paths, whatever the worker that computed them
+        return list(executor.map(score_solution, paths, chunksize=4))
+
+
+def write_results(results, file, output_format):
+    """Writes the results as JSON Lines ("jsonl") or CSV ("csv")"""
+    if output_format == "csv":
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({**result, "errors": json.dumps(result["errors"])})
+    else:
+        for result in results:
+            file.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Check and score every solution of a directory against one instance "
+        "of the Rte KIRO Problem."
+    )
+    python_parser.add_argument("-i", "--instance", dest="instance_path", required=True)
+    python_parser.add_argument(
+        "-s",
+        "--solutions",
+        dest="solutions",
+        required=True,
+        help="directory of json solutions, or glob pattern",
+    )
+    python_parser.add_argument("-w", "--workers", dest="workers", type=int, default=1)
+    python_parser.add_argument(
+        "-o", "--output", dest="output_path", default=None, help="default: stdout"
+    )
+    python_parser.add_argument(
+        "-f", "--format", dest="output_format", choices=["jsonl", "csv"], default=None,
+        help="default: csv if the output ends with .csv, jsonl otherwise",
+    )
+    python_parser.add_argument(
+        "-e", "--engine", dest="engine", choices=ENGINES, default=PYTHON_ENGINE
+    )
+    python_parser.add_argument(
+        "-c", "--compiled", dest="compiled", action="store_true",
+        help="load the instance from its compiled file, written next to it if needed",
+    )
+    python_parser.add_argument(
+        "--cache", dest="cache", action="store_true",
+        help="score identical or reordered solutions only once, see score_cache.py",
+    )
+    python_parser.add_argument(
+        "--cache-db", dest="cache_path", default=None,
+        help="SQLite file keeping the scores between runs, implies --cache",
+    )
+
+    args = python_parser.parse_args()
+
+    output_format = args.output_format
+    if output_format is None:
+        output_format = "csv" if (args.output_path or "").endswith(".csv") else "jsonl"
+
+    try:
+        results = batch_judge(
+            args.instance_path,
+            solution_paths(args.solutions),
+            args.workers,
+            args.engine,
+            args.compiled,
+            args.cache,
+            args.cache_path,
+        )
+    except FileNotFoundError:
+        print(-1)
+        print("Error: File not found, parsing aborted")
+        exit(1)
+    except InstanceError as errors:
+        print(-1)
+        print("Error: instance is not valid, traceback list for information:")
+        for i in errors.list:
+            print(i)
+        exit(1)
+
+    if args.output_path:
+        with open(args.output_path, "w", newline="") as file:
+            write_results(results, file, output_format)
+    else:
+        write_results(results, sys.stdout, output_format)
+    if args.cache or args.cache_path:
+        cached = sum(result["cached"] for result in results)
+        print(f"Score cache: {cached} of {len(results)} solutions found", file=sys.stderr)
@@ -0,0 +1,6 @@
+# Benchmark of the judge : generator.py writes synthetic instances and solutions of any size,
+# runner.py times every stage on them and compares the results with a baseline saved on the same machine.
+# Both are run as modules of the package : python -m kiro_judge.benchmark.runner
+# The other modules each time one part of the judge against the code it replaced, on the shipped
+# or generated instances (python -m kiro_judge.benchmark.neighborhood, ...), named after the module measured.
+# Their results are checked by the tests of the same name in tests/.
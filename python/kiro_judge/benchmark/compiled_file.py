@@ -0,0 +1,113 @@
+from .generator import generate_instance, generate_solution
+from ..loader import save_json
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Compares the startup plus the first score of a fresh judge process with the json instance
+# (load_json + convert_instance) and with its compiled file (see compiled_file.py).
+# tests/test_compiled_file.py checks that both give the same instance.
+#   python -m kiro_judge.benchmark.compiled_file -i ../instances/input/huge.json
+
+JSON_PATH = "json"
+COMPILED_PATH = "compiled"
+
+
+def first_score(method, instance_path, solution_path, engine):
+    """Loads the instance and scores one solution, in the current process
+    :return: the time taken by the imports, the loading and the score, in seconds"""
+    start = time.perf_counter()
+    from ..loader import load_json
+    from ..rteparser import score_solution
+
+    if method == JSON_PATH:
+        from ..converter import convert_instance
+    else:
+        from ..compiled_file import open_compiled_instance
+    imported = time.perf_counter()
+    if method == JSON_PATH:
+        instance = convert_instance(load_json(instance_path))
+    else:
+        instance = open_compiled_instance(instance_path)
+    loaded = time.perf_counter()
+    score_solution(instance, load_json(solution_path), engine)
+    return imported - start, loaded - imported, time.perf_counter() - loaded
+
+
+def run(method, instance_path, solution_path, engine):
+    """:return: the wall time of a fresh process, and its import, loading and scoring times"""
+    start = time.perf_counter()
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "kiro_judge.benchmark.compiled_file",
+            "--run",
+            method,
+            instance_path,
+            solution_path,
+            engine,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    wall = time.perf_counter() - start
+    return (wall, *json.loads(output))
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Benchmark of the startup of a judge process with a compiled instance."
+    )
+    python_parser.add_argument(
+        "-i", "--instance", dest="instance_path", default="../instances/input/huge.json"
+    )
+    python_parser.add_argument(
+        "-t",
+        "--turbines",
+        dest="turbines",
+        type=int,
+        default=None,
+        help="use a synthetic instance with this many turbines instead",
+    )
+    python_parser.add_argument("-w", "--scenarios", dest="scenarios", type=int, default=10000)
+    python_parser.add_argument("-e", "--engine", dest="engine", default="python")
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=5)
+    python_parser.add_argument("--run", dest="run", nargs=4, help=argparse.SUPPRESS)
+    args = python_parser.parse_args()
+
+    if args.run:
+        print(json.dumps(first_score(*args.run)))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # A copy, so that its compiled file is written in the temporary directory
+        instance_path = os.path.join(directory, os.path.basename(args.instance_path))
+        if args.turbines is None:
+            shutil.copy(args.instance_path, instance_path)
+            name = args.instance_path
+        else:
+            save_json(generate_instance(args.turbines, 100, 10, args.scenarios), instance_path)
+            name = f"{args.turbines} turbines, {args.scenarios} scenarios"
+        solution_path = os.path.join(directory, "solution.json")
+        with open(instance_path) as file:
+            save_json(generate_solution(json.load(file)), solution_path)
+        # Writes the compiled file once, as the compile command would
+        run(COMPILED_PATH, instance_path, solution_path, args.engine)
+
+        print(f"{name}, {args.engine} engine, best of {args.repeat} fresh processes")
+        for method in [JSON_PATH, COMPILED_PATH]:
+            wall, imports, load, score = min(
+                run(method, instance_path, solution_path, args.engine)
+                for _ in range(args.repeat)
+            )
+            print(
+                f"{method:<8}: {1000 * wall:.1f} ms wall, {1000 * imports:.1f} ms imports, "
+                f"{1000 * load:.2f} ms loading, {1000 * score:.2f} ms first score"
+            )
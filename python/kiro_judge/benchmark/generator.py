@@ -0,0 +1,155 @@
+from ..constants import *
+from ..converter import convert_instance, convert_solution
+from ..loader import save_json
+import argparse
+import os
+import random
+
+# Seeded generator of synthetic instances and valid solutions, of any size.
+# The instances follow the schema of constants.py, with the ids of every list being 1 ... N in order
+# (as solution_format_checker assumes), and values in the ranges of instances/input/huge.json.
+
+# Number of turbines, sites, types (of substations and of both kinds of cables) and scenarios
+SCALES = {
+    "1e2": {"turbines": 100, "sites": 10, "types": 4, "scenarios": 100},
+    "1e3": {"turbines": 1000, "sites": 30, "types": 8, "scenarios": 1000},
+    "1e4": {"turbines": 10000, "sites": 100, "types": 16, "scenarios": 10000},
+    "1e5": {"turbines": 100000, "sites": 300, "types": 32, "scenarios": 100000},
+}
+
+
+def point(rng, x_min, x_max, y_min, y_max):
+    return {X: round(rng.uniform(x_min, x_max), 2), Y: round(rng.uniform(y_min, y_max), 2)}
+
+
+def generate_instance(turbines, sites, types, scenarios, seed=0):
+    """
+    :param turbines: the number of wind turbines
+    :param sites: the number of substation locations
+    :param types: the number of substation types, and of each kind of cable types
+    :param scenarios: the number of wind scenarios
+    :param seed: the seed of the generator, the same seed giving the same instance
+    :return: the raw instance, as loaded from a json file
+    """
+    rng = random.Random(seed)
+    max_power = 18.0
+    ratings = sorted(rng.choice([100, 200, 300, 500, 750, 900, 1450, 2400]) for _ in range(types))
+    instance = {
+        GEN_PARAMETERS: {
+            MAX_POWER: max_power,
+            CURTAILING_COST: 87.5,
+            CURTAILING_PENA: 8750.0,
+            MAX_CURTAILING: 750.0,
+            FIX_COST_CABLE: 5.0,
+            VAR_COST_CABLE: 0.5,
+            MAIN_LAND_STATION: {X: 0, Y: 0},
+        },
+        SUBSTATION_TYPES: [
+            {
+                ID: i + 1,
+                COST: 1.2 * ratings[i],
+                RATING: ratings[i],
+                PROB_FAIL: rng.choice([1, 10]) / 73000,
+            }
+            for i in range(types)
+        ],
+        LAND_SUB_CABLE_TYPES: [
+            {
+                ID: i + 1,
+                FIX_COST: 120.0,
+                VAR_COST: round(rng.uniform(2, 10), 1),
+                PROB_FAIL: rng.choice([2, 20]) / 7300,
+                RATING: ratings[i],
+            }
+            for i in range(types)
+        ],
+        SUB_SUB_CABLE_TYPES: [
+            {ID: i + 1, FIX_COST: 100.0, VAR_COST: 5.0, RATING: ratings[i]}
+            for i in range(types)
+        ],
+        SUBSTATION_LOCATION: [
+            {ID: i + 1, **point(rng, 20, 80, -10, 10)} for i in range(sites)
+        ],
+        WIND_TURBINES: [
+            {ID: i + 1, **point(rng, 80, 120, -20, 20)} for i in range(turbines)
+        ],
+    }
+    weights = [rng.random() for _ in range(scenarios)]
+    total = sum(weights)
+    instance[WIND_SCENARIOS] = [
+        {
+            ID: i + 1,
+            POWER_GENERATION: round(rng.uniform(0, max_power), 3),
+            PROBABILITY: weights[i] / total,
+        }
+        for i in range(scenarios)
+    ]
+    return instance
+
+
+def generate_solution(instance, seed=0):
+    """
+    A valid solution : about half the sites are built, every turbine is linked to one of them,
+    and about half the built substations are linked in pairs by a cable
+    :param instance: the raw instance
+    :param seed: the seed of the generator, the same seed giving the same solution
+    :return: the raw solution, as loaded from a json file
+    """
+    rng = random.Random(seed)
+    sites = [site[ID] for site in instance[SUBSTATION_LOCATION]]
+    built = rng.sample(sites, max(1, len(sites) // 2))
+    nb_sub_types = len(instance[SUBSTATION_TYPES])
+    nb_land_types = len(instance[LAND_SUB_CABLE_TYPES])
+    nb_cable_types = len(instance[SUB_SUB_CABLE_TYPES])
+    # Each substation has at most one cable
+    linked = built[: len(built) // 4 * 2]
+    return {
+        SUBSTATIONS: [
+            {
+                ID: site,
+                SUB_TYPE: rng.randint(1, nb_sub_types),
+                LAND_CABLE_TYPE: rng.randint(1, nb_land_types),
+            }
+            for site in sorted(built)
+        ],
+        TURBINES: [
+            {ID: turbine[ID], SUBSTATION_ID: rng.choice(built)}
+            for turbine in instance[WIND_TURBINES]
+        ],
+        SUBSTATION_SUBSTATION_CABLES: [
+            {
+                SUBSTATION_ID: linked[i],
+                OTHER_SUB_ID: linked[i + 1],
+                CABLE_TYPE_SUBSUB: rng.randint(1, nb_cable_types),
+            }
+            for i in range(0, len(linked), 2)
+        ],
+    }
+
+
+def converted_problem(raw_instance, seeds):
+    """
+    Generates a solution of the instance for each seed, before converting the instance,
+    which the converter modifies
+    :param raw_instance: the raw instance, converted in place
+    :param seeds: the seeds of the solutions
+    :return: the converted instance and the list of its converted solutions
+    """
+    raw_solutions = [generate_solution(raw_instance, seed) for seed in seeds]
+    return convert_instance(raw_instance), [convert_solution(solution) for solution in raw_solutions]
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Writes a synthetic instance and a valid solution."
+    )
+    python_parser.add_argument("scale", choices=SCALES.keys())
+    python_parser.add_argument("-o", "--output", dest="output_dir", default=".")
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    instance = generate_instance(**SCALES[args.scale], seed=args.seed)
+    solution = generate_solution(instance, seed=args.seed)
+    name = f"synthetic_{args.scale}_{args.seed}"
+    save_json(instance, os.path.join(args.output_dir, f"{name}.json"))
+    save_json(solution, os.path.join(args.output_dir, f"{name}_sol.json"))
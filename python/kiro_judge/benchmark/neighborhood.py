@@ -0,0 +1,85 @@
+from .generator import converted_problem
+from ..api import checked_solution
+from ..constants import *
+from ..converter import convert_instance
+from ..cost import cost
+from ..loader import load_json
+from ..neighborhood import turbine_move_deltas
+import argparse
+import copy
+import random
+import time
+
+# Checks the batched neighborhood evaluation (see neighborhood.py) against full rescoring :
+# sampled turbine moves are applied to a copy of the solution and scored by cost.cost,
+# whose change must match the delta given up to --tolerance times the cost of the solution.
+# Also compares the time of the whole matrix with the time full rescoring would take for every move
+# (tests/test_neighborhood.py checks the deltas on the shipped instances).
+#   python -m kiro_judge.benchmark.neighborhood -i ../instances/input/huge.json
+
+
+def rescored_delta(instance, solution, current, turbine_id, site_id):
+    """:return: the change of cost.cost when turbine_id is linked to site_id, and the time it took"""
+    start = time.perf_counter()
+    moved = copy.deepcopy(solution)
+    moved[TURBINES][turbine_id][SUBSTATION_ID] = site_id
+    delta = cost(instance, moved) - current
+    return delta, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Compares the batched turbine move deltas with full rescoring."
+    )
+    python_parser.add_argument("-i", "--instance", dest="instance", required=True)
+    python_parser.add_argument(
+        "-s", "--solution", dest="solution", help="generated from the instance if not given"
+    )
+    python_parser.add_argument("-n", "--samples", dest="samples", type=int, default=50)
+    python_parser.add_argument("--tolerance", dest="tolerance", type=float, default=1e-12)
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    if args.solution is None:
+        instance, (solution,) = converted_problem(load_json(args.instance), [args.seed])
+    else:
+        instance = convert_instance(load_json(args.instance))
+        solution = checked_solution(instance, load_json(args.solution))
+
+    start = time.perf_counter()
+    deltas, turbine_ids, site_ids = turbine_move_deltas(instance, solution)
+    batched = time.perf_counter() - start
+    print(
+        f"{len(turbine_ids)} turbines x {len(site_ids)} substations : "
+        f"{deltas.size} moves scored in {batched:.3f} s"
+    )
+
+    current = cost(instance, solution)
+    rng = random.Random(args.seed)
+    samples = [
+        (rng.randrange(len(turbine_ids)), rng.randrange(len(site_ids)))
+        for _ in range(args.samples)
+    ]
+    rescoring = 0
+    errors = 0
+    worst = 0
+    for i, j in samples:
+        delta, seconds = rescored_delta(instance, solution, current, turbine_ids[i], site_ids[j])
+        rescoring += seconds
+        error = abs(delta - deltas[i, j]) / current
+        worst = max(worst, error)
+        if error > args.tolerance:
+            errors += 1
+            print(
+                f"Error: moving turbine {turbine_ids[i]} to {site_ids[j]} changes the cost "
+                f"by {delta!r}, not {deltas[i, j]!r}"
+            )
+    estimate = rescoring / len(samples) * deltas.size
+    print(
+        f"full rescoring : {rescoring / len(samples) * 1000:.1f} ms per move, "
+        f"about {estimate:.1f} s for every move ({estimate / batched:.0f}x slower)"
+    )
+    print(
+        f"{len(samples) - errors}/{len(samples)} sampled deltas match full rescoring, "
+        f"largest difference {worst:.1e} times the cost"
+    )
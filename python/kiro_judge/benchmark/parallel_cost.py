@@ -0,0 +1,58 @@
+from .generator import generate_instance, generate_solution
+from ..constants import SUBSTATIONS
+from ..converter import convert_instance, convert_solution
+from ..cost import evaluation_context, operational_cost
+import argparse
+import os
+import time
+
+# Scaling of the parallel operational cost (see parallel_cost.py) from 1 to N workers
+# on a synthetic instance with many scenarios. For n workers, efficiency = T(1) / (n * T(n)),
+# T including the start of the pool and the transfer of the instance to the workers.
+# tests/test_parallel_cost.py checks that every number of workers gives the same cost.
+#   python -m kiro_judge.benchmark.parallel_cost -n 8
+
+
+def time_workers(instance, solution, context, workers, repeat):
+    """:return: the best time of the operational cost with this number of workers, and the cost"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cost = operational_cost(instance, solution, context, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best, cost
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Scaling efficiency of the parallel operational cost."
+    )
+    python_parser.add_argument(
+        "-n", "--max-workers", dest="max_workers", type=int, default=os.cpu_count()
+    )
+    python_parser.add_argument("-s", "--scenarios", dest="scenarios", type=int, default=100000)
+    python_parser.add_argument("--sites", dest="sites", type=int, default=100)
+    python_parser.add_argument("-t", "--turbines", dest="turbines", type=int, default=2000)
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=3)
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    raw_instance = generate_instance(args.turbines, args.sites, 8, args.scenarios, args.seed)
+    solution = convert_solution(generate_solution(raw_instance, args.seed))
+    instance = convert_instance(raw_instance)
+    context = evaluation_context(instance, solution)
+    print(
+        f"{os.cpu_count()} cpu(s), {args.scenarios} scenarios, "
+        f"{len(solution[SUBSTATIONS])} substations"
+    )
+
+    print(f"{'workers':>7} {'time':>10} {'speedup':>8} {'efficiency':>10}")
+    reference = None
+    for workers in range(1, args.max_workers + 1):
+        seconds, cost = time_workers(instance, solution, context, workers, args.repeat)
+        if reference is None:
+            reference = seconds, cost
+        elif cost != reference[1]:
+            print(f"Error: {workers} workers give {cost!r} instead of {reference[1]!r}")
+        speedup = reference[0] / seconds
+        print(f"{workers:>7} {seconds:>8.3f} s {speedup:>7.2f}x {speedup / workers:>10.0%}")
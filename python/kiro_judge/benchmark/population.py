@@ -0,0 +1,49 @@
+from .generator import converted_problem
+from .runner import best_time
+from ..compiled_instance import compile_instance
+from ..cost import cost, ENGINES
+from ..loader import load_json
+from ..population import encode_population, score_population
+import argparse
+
+# Throughput of score_population (see population.py) against cost.cost called on each solution,
+# on a population of generated solutions of an instance. The costs must be exactly the same
+# (checked by tests/test_population.py).
+#   python -m kiro_judge.benchmark.population -i ../instances/input/huge.json -k 500
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Throughput of the population scoring against cost.cost."
+    )
+    python_parser.add_argument(
+        "-i", "--instance", dest="instance", default="../instances/input/large.json"
+    )
+    python_parser.add_argument("-k", "--solutions", dest="solutions", type=int, default=200)
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=3)
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    instance, solutions = converted_problem(
+        load_json(args.instance), range(args.seed, args.seed + args.solutions)
+    )
+    compiled = compile_instance(instance)
+    population = encode_population(compiled, solutions)
+
+    seconds, costs = best_time(lambda: score_population(compiled, *population), args.repeat)
+    print(f"{len(solutions)} solutions of {args.instance}")
+    print(f"{'score_population':>16} {seconds:>8.3f} s {len(solutions) / seconds:>10.1f} solutions/s")
+    for engine in ENGINES:
+        seconds, references = best_time(
+            lambda: [cost(instance, solution, engine) for solution in solutions], 1
+        )
+        print(f"{engine:>16} {seconds:>8.3f} s {len(solutions) / seconds:>10.1f} solutions/s")
+        if engine != ENGINES[0]:
+            continue
+        identical = 0
+        for k, reference in enumerate(references):
+            if costs[k] == reference:
+                identical += 1
+            else:
+                print(f"Error: solution {k} costs {costs[k]!r} instead of {reference!r}")
+        print(f"{identical}/{len(solutions)} costs identical to cost.cost")
@@ -0,0 +1,216 @@
+from .generator import SCALES, generate_instance, generate_solution
+from ..converter import convert_instance, convert_solution
+from ..constants import SORTED_SCENARIOS
+from ..cost import construction_cost, operational_cost_engine, ENGINES, SORTED_ENGINE
+from ..loader import load_json, save_json
+from ..solution_format_checker import solution_checker
+from ..solution_pipeline import check_and_convert_solution
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Times every stage of the judge on synthetic instances, writes the results as json,
+# and compares them with a stored baseline :
+#   python -m kiro_judge.benchmark.runner --save-baseline (first, and after a deliberate change of performance)
+#   python -m kiro_judge.benchmark.runner
+# The times depend on the machine, so the baseline is not part of the repository : it must be saved
+# locally before comparing. Only the stages slower than --min-ms are compared, and a slowdown is only
+# a regression beyond the tolerance plus the spread of the runs of the stage, in both results.
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Stages timed, in the order the judge runs them
+LOAD = "load"  # load_json of the instance and of the solution
+CHECK = "check"  # solution_checker
+CONVERSION = "conversion"  # convert_instance and convert_solution
+CHECK_AND_CONVERT = "check_and_convert"  # check_and_convert_solution, used by the judge instead
+CONSTRUCTION_COST = "construction_cost"
+OPERATIONAL_COST = "operational_cost"
+
+
+def run_times(function, repeat, setup=tuple):
+    """
+    :param function: the function timed
+    :param repeat: the number of runs
+    :param setup: gives the arguments of each run of function, untimed
+    :return: the list of the times of the runs in seconds, and the result of the last one
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def best_time(function, repeat, setup=tuple):
+    """Same as run_times
+    :return: the best time of the runs in seconds, and the result of the last one
+    """
+    times, result = run_times(function, repeat, setup)
+    return min(times), result
+
+
+def time_stages(instance_path, solution_path, engine, repeat):
+    """
+    :param instance_path: file path to the instance
+    :param solution_path: file path to a valid solution
+    :param engine: the engine used for the operational cost, see cost.ENGINES
+    :param repeat: the number of runs of each stage, the best one is kept
+    :return: a dictionnary with the time of every stage in seconds, the spread of the times of its runs
+    (slowest - fastest, in seconds), and the score
+    """
+    times = {}
+    spreads = {}
+
+    def stage(name, function, setup=tuple):
+        """Times the runs of a stage
+        :return: the result of the last run"""
+        runs, result = run_times(function, repeat, setup)
+        times[name], spreads[name] = min(runs), max(runs) - min(runs)
+        return result
+
+    raw_instance, raw_solution = stage(
+        LOAD, lambda: (load_json(instance_path), load_json(solution_path))
+    )
+
+    def raw_copies():
+        # The conversions modify what they convert
+        return copy.deepcopy(raw_instance), copy.deepcopy(raw_solution)
+
+    stage(CHECK, solution_checker, lambda: (raw_instance, raw_solution))
+    instance, solution = stage(
+        CONVERSION,
+        lambda instance, solution: (convert_instance(instance), convert_solution(solution)),
+        raw_copies,
+    )
+    stage(CHECK_AND_CONVERT, check_and_convert_solution, raw_copies)
+    const_cost = stage(CONSTRUCTION_COST, construction_cost, lambda: (instance, solution))
+
+    def uncached():
+        # The sorted engine caches the sorted scenarios in the instance
+        instance.pop(SORTED_SCENARIOS, None)
+        return instance, solution
+
+    oper_cost = stage(OPERATIONAL_COST, operational_cost_engine(engine), uncached)
+    return {"times": times, "spreads": spreads, "score": const_cost + oper_cost}
+
+
+def run_benchmark(scales, engine, repeat, seed=0):
+    """
+    Times the stages on a synthetic instance and solution of each scale, see generator.SCALES
+    :return: the results, as written in json
+    """
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "engine": engine,
+        "repeat": repeat,
+        "seed": seed,
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            instance = generate_instance(**SCALES[scale], seed=seed)
+            instance_path = os.path.join(directory, f"{scale}.json")
+            solution_path = os.path.join(directory, f"{scale}_sol.json")
+            save_json(instance, instance_path)
+            save_json(generate_solution(instance, seed=seed), solution_path)
+            results["scales"][scale] = time_stages(instance_path, solution_path, engine, repeat)
+    return results
+
+
+def compare(results, baseline, tolerance, min_seconds):
+    """
+    :param results: the results of run_benchmark
+    :param baseline: results of run_benchmark stored before
+    :param tolerance: the relative slowdown above which a stage is a regression,
+    once the spreads of its runs in both results are taken off
+    :param min_seconds: stages faster than this in either result are not compared, their time being mostly noise
+    :return: the lines of the comparison, and the list of (scale, stage) that regressed
+    """
+    lines = [f"{'scale':<6} {'stage':<18} {'baseline':>12} {'now':>12} {'ratio':>7}"]
+    regressions = []
+    for scale, result in results["scales"].items():
+        if scale not in baseline["scales"]:
+            continue
+        for stage, seconds in result["times"].items():
+            before = baseline["scales"][scale]["times"].get(stage)
+            if before is None or min(seconds, before) < min_seconds:
+                continue
+            noise = result.get("spreads", {}).get(stage, 0)
+            noise += baseline["scales"][scale].get("spreads", {}).get(stage, 0)
+            ratio = seconds / before
+            flag = ""
+            if seconds - noise > (1 + tolerance) * before:
+                regressions.append((scale, stage))
+                flag = " REGRESSION"
+            lines.append(
+                f"{scale:<6} {stage:<18} {1000 * before:>9.2f} ms {1000 * seconds:>9.2f} ms {ratio:>6.2f}x{flag}"
+            )
+    if results["engine"] != baseline["engine"]:
+        lines.append(
+            f"Warning: the baseline used the {baseline['engine']} engine, not {results['engine']}"
+        )
+    for key in ["python", "machine"]:
+        if results[key] != baseline[key]:
+            lines.append(f"Warning: the baseline was run on {key} {baseline[key]}, not {results[key]}")
+    return lines, regressions
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Benchmark of every stage of the judge on synthetic instances."
+    )
+    python_parser.add_argument(
+        "--scales", dest="scales", nargs="+", choices=SCALES.keys(), default=["1e2", "1e3", "1e4"]
+    )
+    python_parser.add_argument(
+        "-e", "--engine", dest="engine", choices=ENGINES, default=SORTED_ENGINE
+    )
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=3)
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    python_parser.add_argument(
+        "-o", "--output", dest="output_path", default=None, help="json results, default: stdout"
+    )
+    python_parser.add_argument("-b", "--baseline", dest="baseline_path", default=BASELINE_PATH)
+    python_parser.add_argument(
+        "--save-baseline", dest="save_baseline", action="store_true",
+        help="store the results as the new baseline instead of comparing",
+    )
+    python_parser.add_argument(
+        "-t", "--tolerance", dest="tolerance", type=float, default=0.25,
+        help="relative slowdown reported as a regression",
+    )
+    python_parser.add_argument(
+        "--min-ms", dest="min_ms", type=float, default=10.0,
+        help="stages faster than this are not compared",
+    )
+    args = python_parser.parse_args()
+
+    results = run_benchmark(args.scales, args.engine, args.repeat, args.seed)
+    if args.output_path is None:
+        print(json.dumps(results, indent=4))
+    else:
+        save_json(results, args.output_path)
+
+    if args.save_baseline:
+        save_json(results, args.baseline_path)
+    elif os.path.exists(args.baseline_path):
+        baseline = load_json(args.baseline_path)
+        lines, regressions = compare(results, baseline, args.tolerance, args.min_ms / 1000)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            sys.exit(1)
+    else:
+        print(
+            f"No baseline at {args.baseline_path}, run with --save-baseline first on this machine",
+            file=sys.stderr,
+        )
@@ -0,0 +1,77 @@
+from .generator import converted_problem, generate_instance
+from ..constants import BOUND_ORDER, SCENARIO_GROUPS, SORTED_SCENARIOS
+from ..cost import cost, scenario_groups, wind_scenarios, ENGINES
+from ..loader import load_json
+import argparse
+import time
+
+# Speed-up of evaluating the scenarios once per distinct power (see converter.group_scenarios),
+# against one evaluation per scenario, for every engine. Both must give identical scores
+# (up to rounding for the sorted engine, whose prefix sums merge the probabilities), see tests/test_scenario_groups.py.
+#   python -m kiro_judge.benchmark.scenario_groups -s 100000 1000000
+
+
+def ungrouped(instance):
+    """Sets the instance to evaluate every scenario on its own, as if all the powers were distinct"""
+    instance[SCENARIO_GROUPS] = [(power, [prob]) for power, prob in wind_scenarios(instance)]
+    instance.pop(SORTED_SCENARIOS, None)
+    instance.pop(BOUND_ORDER, None)
+
+
+def time_engines(instance, solution, repeat):
+    """:return: the dictionnary of the best time and the score of the solution with each engine"""
+    results = {}
+    for engine in ENGINES:
+        # The first call imports the engine
+        cost(instance, solution, engine)
+        best = float("inf")
+        for _ in range(repeat):
+            instance.pop(SORTED_SCENARIOS, None)
+            start = time.perf_counter()
+            score = cost(instance, solution, engine)
+            best = min(best, time.perf_counter() - start)
+        results[engine] = best, score
+    return results
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Speed-up of the scenarios merged by power, for every engine."
+    )
+    python_parser.add_argument(
+        "-i", "--instances", dest="instances", nargs="*",
+        default=["../instances/input/large.json", "../instances/input/huge.json"],
+    )
+    python_parser.add_argument(
+        "-s", "--synthetic", dest="synthetic", type=int, nargs="*", default=[100000],
+        help="numbers of scenarios of synthetic instances (powers rounded to 3 decimals)",
+    )
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=3)
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    raw_instances = [(path, load_json(path)) for path in args.instances]
+    raw_instances += [
+        (f"synthetic, {scenarios} scenarios", generate_instance(200, 40, 8, scenarios, args.seed))
+        for scenarios in args.synthetic
+    ]
+    for name, raw_instance in raw_instances:
+        instance, (solution,) = converted_problem(raw_instance, [args.seed])
+        nb_scenarios, nb_powers = len(wind_scenarios(instance)), len(scenario_groups(instance))
+        print(
+            f"{name}: {nb_scenarios} scenarios, {nb_powers} distinct powers "
+            f"(reduction {nb_scenarios / nb_powers:.2f}x)"
+        )
+        grouped = time_engines(instance, solution, args.repeat)
+        ungrouped(instance)
+        single = time_engines(instance, solution, args.repeat)
+        for engine in ENGINES:
+            (seconds, score), (single_seconds, single_score) = grouped[engine], single[engine]
+            if score == single_score:
+                same = "identical"
+            else:
+                same = f"relative difference {abs(score - single_score) / abs(single_score):.1e}"
+            print(
+                f"    {engine:>6} {1000 * single_seconds:>9.1f} ms -> {1000 * seconds:>9.1f} ms "
+                f"{single_seconds / seconds:>6.2f}x, {same}"
+            )
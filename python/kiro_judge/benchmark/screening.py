@@ -0,0 +1,65 @@
+from .generator import converted_problem
+from ..cost import evaluation_context, operational_cost, scenario_groups, wind_scenarios
+from ..loader import load_json
+import argparse
+import glob
+import os
+import time
+
+# Screening mode of the operational cost (see screening.py) against the exact cost : on each instance,
+# generated solutions are screened with several seeds, reporting the share of the intervals containing
+# the exact cost (the coverage, checked by tests/test_screening.py), their width, the error of the estimate
+# and the speed-up. Screening twice with the same seed must give the same result.
+#   python -m kiro_judge.benchmark.screening                       (the shipped instances)
+#   python -m kiro_judge.benchmark.screening -i instance.json ... -b 200
+
+
+def check(raw_instance, name, budget, nb_solutions, nb_seeds):
+    """Screens generated solutions of an instance and prints the coverage of the intervals
+    :return: the coverage, and whether the same seed always gave the same result"""
+    instance, solutions = converted_problem(raw_instance, range(nb_solutions))
+    covered = 0
+    deterministic = True
+    widths = []
+    errors = []
+    exact_time = screening_time = 0
+    for solution in solutions:
+        context = evaluation_context(instance, solution)
+        start = time.perf_counter()
+        exact = operational_cost(instance, solution, context)
+        exact_time += time.perf_counter() - start
+        for seed in range(nb_seeds):
+            start = time.perf_counter()
+            estimate, low, high = operational_cost(instance, solution, context, budget=budget, seed=seed)
+            screening_time += time.perf_counter() - start
+            covered += low <= exact <= high
+            widths.append((high - low) / 2 / exact if exact else 0)
+            errors.append(abs(estimate - exact) / exact if exact else 0)
+        again = operational_cost(instance, solution, context, budget=budget, seed=0)
+        deterministic &= again == operational_cost(instance, solution, context, budget=budget)
+    coverage = covered / len(widths)
+    print(
+        f"{name}: {len(wind_scenarios(instance))} scenarios, {len(scenario_groups(instance))} powers, "
+        f"coverage {coverage:.1%}, half-width {sum(widths) / len(widths):.2%}, "
+        f"error {sum(errors) / len(errors):.2%} of the cost, "
+        f"{exact_time * nb_seeds / screening_time:.1f}x faster"
+        + ("" if deterministic else ", NOT DETERMINISTIC")
+    )
+    return coverage, deterministic
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Coverage of the confidence intervals of the screening mode."
+    )
+    python_parser.add_argument(
+        "-i", "--instances", dest="instances", nargs="+",
+        default=sorted(glob.glob(os.path.join("..", "instances", "input", "*.json"))),
+    )
+    python_parser.add_argument("-b", "--budget", dest="budget", type=int, default=100)
+    python_parser.add_argument("-k", "--solutions", dest="solutions", type=int, default=10)
+    python_parser.add_argument("--seeds", dest="seeds", type=int, default=20)
+    args = python_parser.parse_args()
+
+    for path in args.instances:
+        check(load_json(path), path, args.budget, args.solutions, args.seeds)
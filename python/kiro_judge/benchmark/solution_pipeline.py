@@ -0,0 +1,39 @@
+from .generator import generate_instance, generate_solution
+from .runner import best_time
+from ..converter import convert_solution
+from ..solution_format_checker import solution_checker
+from ..solution_pipeline import check_and_convert_solution
+import argparse
+
+# Compares solution_checker + convert_solution with the single pass check_and_convert_solution
+# on a valid solution of generator.py (tests/test_solution_pipeline.py checks that both give the same result).
+#   python -m kiro_judge.benchmark.solution_pipeline -t 1000000
+
+
+def two_passes(instance, solution):
+    """The checks and the conversion of the solution, as done before check_and_convert_solution"""
+    solution_checker(instance, solution)
+    return convert_solution(solution)
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Benchmark of the single pass solution checker and converter."
+    )
+    python_parser.add_argument("-t", "--turbines", dest="turbines", type=int, default=1000000)
+    python_parser.add_argument("-s", "--sites", dest="sites", type=int, default=100)
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=3)
+    args = python_parser.parse_args()
+
+    instance = generate_instance(args.turbines, args.sites, 10, 1)
+
+    def setup():
+        # A fresh solution for each run, the conversion modifies the solution
+        return instance, generate_solution(instance)
+
+    before, _ = best_time(two_passes, args.repeat, setup)
+    after, _ = best_time(check_and_convert_solution, args.repeat, setup)
+    print(f"{args.turbines} turbines, {args.sites} sites")
+    print(f"solution_checker + convert_solution : {before:.3f} s")
+    print(f"check_and_convert_solution          : {after:.3f} s")
+    print(f"speedup                             : {before / after:.2f}x")
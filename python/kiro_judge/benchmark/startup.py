@@ -0,0 +1,108 @@
+from .generator import generate_solution
+from ..loader import load_json, save_json
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Startup check of the judge CLI, run thousands of times by the grading harness :
+#   python -m kiro_judge.benchmark.startup
+# Scores one solution of instances/input/tiny.json with the CLI under python -X importtime,
+# fails if a module only some modes need is imported (see HEAVY_MODULES), and if the run
+# takes more than a budget above the startup of a bare interpreter.
+
+# The directory of the kiro_judge package, from which the CLI runs even if it is not installed
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TINY_INSTANCE = os.path.join(PYTHON_DIR, "..", "instances", "input", "tiny.json")
+
+# Modules that scoring one solution must not import
+HEAVY_MODULES = [
+    "numpy",  # numpy and sorted engines, compiled instances
+    "sqlite3",  # score cache
+    "hashlib",  # score cache, compiled files
+    "cProfile",  # --profile
+    "concurrent.futures",  # batch_judge and parallel_cost
+    "multiprocessing",
+    "ijson",  # streaming_loader
+    "orjson",
+]
+
+
+def imported_modules(stderr):
+    """
+    :param stderr: the output of python -X importtime
+    :return: the dictionnary of every imported module, with its cumulative import time in microseconds,
+    and the total import time of the modules imported at top level
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return modules, total
+
+
+def best_run(command, repeat):
+    """:return: the best wall time of the command in seconds, and its stderr"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=PYTHON_DIR, capture_output=True, text=True)
+        best = min(best, time.perf_counter() - start)
+        if process.returncode != 0:
+            raise RuntimeError(f"{command} failed:\n{process.stderr}")
+    return best, process.stderr
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Checks the imports and the startup time of the judge CLI."
+    )
+    python_parser.add_argument("-i", "--instance", dest="instance_path", default=TINY_INSTANCE)
+    python_parser.add_argument("-r", "--repeat", dest="repeat", type=int, default=10)
+    python_parser.add_argument(
+        "--max-ms", dest="max_ms", type=float, default=50,
+        help="maximum time of the scoring above the startup of a bare interpreter",
+    )
+    args = python_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        solution_path = os.path.join(directory, "solution.json")
+        save_json(generate_solution(load_json(args.instance_path)), solution_path)
+        command = [
+            "-m", "kiro_judge.rteparser", "-i", os.path.abspath(args.instance_path), "-s", solution_path
+        ]
+
+        _, stderr = best_run([sys.executable, "-X", "importtime", *command], 1)
+        _, bare_stderr = best_run([sys.executable, "-X", "importtime", "-c", "pass"], 1)
+        modules, import_us = imported_modules(stderr)
+        _, bare_import_us = imported_modules(bare_stderr)
+        bare_seconds, _ = best_run([sys.executable, "-c", "pass"], args.repeat)
+        seconds, _ = best_run([sys.executable, *command], args.repeat)
+
+    heavy = [name for name in HEAVY_MODULES if name in modules]
+    overhead_ms = 1000 * (seconds - bare_seconds)
+    print(f"bare interpreter {1000 * bare_seconds:.1f} ms, scoring {1000 * seconds:.1f} ms")
+    print(f"imports above the bare interpreter {(import_us - bare_import_us) / 1000:.1f} ms")
+    slowest = sorted(modules.items(), key=lambda item: -item[1])[:10]
+    for name, cumulative in slowest:
+        print(f"    {name:<30} {cumulative / 1000:>7.1f} ms")
+
+    failed = False
+    if heavy:
+        print(f"Error: scoring one solution imports {', '.join(heavy)}")
+        failed = True
+    if overhead_ms > args.max_ms:
+        print(
+            f"Error: scoring takes {overhead_ms:.1f} ms above the bare interpreter, "
+            f"more than {args.max_ms} ms"
+        )
+        failed = True
+    if failed:
+        sys.exit(1)
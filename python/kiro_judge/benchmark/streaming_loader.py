@@ -0,0 +1,109 @@
+from .generator import generate_instance, generate_solution
+from ..loader import save_json
+from ..streaming_loader import available_backends
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Compares the peak memory (RSS) of loading a big instance and solution with load_json + convert_instance
+# against streaming_loader with each available backend, on an instance and a solution of generator.py.
+# The files are written and each load runs in its own process. The peak is VmHWM, as ru_maxrss of a process
+# on linux starts with the peak RSS of its parent (here the process writing the files, or pytest).
+#   python -m kiro_judge.benchmark.streaming_loader -t 1000000 -w 100000
+
+LOAD_JSON = "load_json"
+NO_SOLUTION = "-"
+# The directory of the kiro_judge package, from which the processes run even if it is not installed
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_files(directory, turbines, sites, scenarios):
+    """Writes instance.json and solution.json in directory, in the current process"""
+    instance = generate_instance(turbines, sites, 10, scenarios)
+    save_json(generate_solution(instance), os.path.join(directory, "solution.json"))
+    save_json(instance, os.path.join(directory, "instance.json"))
+
+
+def peak_memory():
+    """:return: the peak RSS of the current process, in MB"""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    # In kB
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    # In KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load(method, instance_path, solution_path):
+    """Loads the instance and the solution (unless solution_path is NO_SOLUTION), in the current process
+    :return: the peak RSS of the process, in MB"""
+    if method == LOAD_JSON:
+        from ..compiled_instance import compile_instance
+        from ..converter import convert_instance
+        from ..loader import load_json
+        from ..solution_pipeline import check_and_convert_solution
+
+        instance = compile_instance(convert_instance(load_json(instance_path)))
+        if solution_path != NO_SOLUTION:
+            check_and_convert_solution(instance, load_json(solution_path))
+    else:
+        from ..streaming_loader import load_compiled_instance, load_converted_solution
+
+        instance = load_compiled_instance(instance_path, method)
+        if solution_path != NO_SOLUTION:
+            load_converted_solution(instance, solution_path, method)
+    return peak_memory()
+
+
+def run(*options):
+    """:return: the output of a fresh process of this module run with options (with absolute paths)"""
+    return subprocess.run(
+        [sys.executable, "-m", "kiro_judge.benchmark.streaming_loader", *options],
+        cwd=PYTHON_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def peak_rss(method, instance_path, solution_path):
+    """:return: the peak RSS (MB) of a fresh process loading the files with method"""
+    return float(run("--run", method, instance_path, solution_path))
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Benchmark of the peak memory of the streaming loader."
+    )
+    python_parser.add_argument("-t", "--turbines", dest="turbines", type=int, default=1000000)
+    python_parser.add_argument("-s", "--sites", dest="sites", type=int, default=10)
+    python_parser.add_argument("-w", "--scenarios", dest="scenarios", type=int, default=100000)
+    python_parser.add_argument("--run", dest="run", nargs=3, help=argparse.SUPPRESS)
+    python_parser.add_argument("--write", dest="write", help=argparse.SUPPRESS)
+    args = python_parser.parse_args()
+
+    if args.run:
+        print(load(*args.run))
+        sys.exit(0)
+    if args.write:
+        write_files(args.write, args.turbines, args.sites, args.scenarios)
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        instance_path = os.path.join(directory, "instance.json")
+        solution_path = os.path.join(directory, "solution.json")
+        run("--write", directory, "-t", str(args.turbines), "-s", str(args.sites), "-w", str(args.scenarios))
+        size = (os.path.getsize(instance_path) + os.path.getsize(solution_path)) / 2**20
+        print(f"{args.turbines} turbines, {args.sites} sites, {args.scenarios} scenarios ({size:.0f} MB of json)")
+        for method in [LOAD_JSON] + available_backends():
+            instance_rss = peak_rss(method, instance_path, NO_SOLUTION)
+            rss = peak_rss(method, instance_path, solution_path)
+            print(f"{method:<10}: peak RSS {instance_rss:.0f} MB (instance), {rss:.0f} MB (instance and solution)")
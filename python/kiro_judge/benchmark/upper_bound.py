@@ -0,0 +1,76 @@
+from .generator import converted_problem
+from ..cost import cost
+from ..loader import load_json
+import argparse
+import time
+
+# Early exits of the bounded cost (see cost.bounded_cost) on a population of generated solutions :
+# as a solver keeping the best solution seen so far (each solution scored with the incumbent as bound),
+# and with fixed bounds taken at quantiles of the costs of the population.
+# Every bounded result is checked against the full cost (as tests/test_upper_bound.py does).
+#   python -m kiro_judge.benchmark.upper_bound -i ../instances/input/huge.json
+
+
+def bounded_run(instance, solutions, bounds):
+    """Scores each solution with its bound, None for the incumbent (the best exact cost seen so far)
+    :return: the time taken, and the list of (value, exceeded, bound)"""
+    incumbent = float("inf")
+    results = []
+    start = time.perf_counter()
+    for solution, bound in zip(solutions, bounds):
+        bound = incumbent if bound is None else bound
+        value, exceeded = cost(instance, solution, upper_bound=bound)
+        if not exceeded:
+            incumbent = min(incumbent, value)
+        results.append((value, exceeded, bound))
+    return time.perf_counter() - start, results
+
+
+def check(results, references):
+    """:return: the number of bounded results inconsistent with the full costs"""
+    errors = 0
+    for (value, exceeded, bound), reference in zip(results, references):
+        if exceeded:
+            valid = value <= reference and reference > bound
+        else:
+            valid = value == reference and reference <= bound
+        errors += not valid
+    return errors
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Early exits of the cost computed with an upper bound."
+    )
+    python_parser.add_argument(
+        "-i", "--instance", dest="instance", default="../instances/input/large.json"
+    )
+    python_parser.add_argument("-k", "--solutions", dest="solutions", type=int, default=50)
+    python_parser.add_argument(
+        "-q", "--quantiles", dest="quantiles", type=float, nargs="*", default=[0.1, 0.5, 0.9]
+    )
+    python_parser.add_argument("--seed", dest="seed", type=int, default=0)
+    args = python_parser.parse_args()
+
+    instance, solutions = converted_problem(
+        load_json(args.instance), range(args.seed, args.seed + args.solutions)
+    )
+
+    start = time.perf_counter()
+    references = [cost(instance, solution) for solution in solutions]
+    full = time.perf_counter() - start
+    print(f"{len(solutions)} solutions of {args.instance}, full cost in {full:.3f} s")
+
+    print(f"{'bound':>14} {'exits':>7} {'time':>9} {'speedup':>8} {'errors':>6}")
+    ranked = sorted(references)
+    runs = [("incumbent", [None] * len(solutions))]
+    for quantile in args.quantiles:
+        bound = ranked[min(len(ranked) - 1, int(quantile * len(ranked)))]
+        runs.append((f"quantile {quantile:g}", [bound] * len(solutions)))
+    for name, bounds in runs:
+        seconds, results = bounded_run(instance, solutions, bounds)
+        exits = sum(exceeded for _, exceeded, _ in results) / len(results)
+        errors = check(results, references)
+        print(
+            f"{name:>14} {exits:>7.0%} {seconds:>7.3f} s {full / seconds:>7.2f}x {errors:>6}"
+        )
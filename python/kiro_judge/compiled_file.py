@@ -0,0 +1,185 @@
+from .compiled_instance import CompiledInstance
+from .converter import convert_instance
+from .errors import InstanceError
+from .score_cache import content_hash
+import argparse
+import json
+import mmap
+import numpy as np
+import os
+
+# Binary file of a CompiledInstance, written next to its json instance (huge.json -> huge.compiled) :
+# MAGIC, the length of the header (8 bytes, little endian), the json header, then every array,
+# each one starting on a multiple of ALIGNMENT bytes.
+# The header holds the version of the format, the sha256 of the json instance it was compiled from,
+# the scalar parameters, and the dtype, shape and offset of every array.
+# The arrays are read-only views on a memory map of the file, so that all the processes
+# loading the same instance share its pages.
+
+MAGIC = b"RTEJUDGE"
+VERSION = 3  # To increase whenever the fields of CompiledInstance change
+ALIGNMENT = 64
+COMPILED_EXTENSION = ".compiled"
+
+
+def compiled_path(instance_path):
+    """:return: the path of the compiled file of an instance"""
+    return os.path.splitext(instance_path)[0] + COMPILED_EXTENSION
+
+
+def array_fields():
+    """:return: the names of the fields of CompiledInstance stored as arrays and as scalars"""
+    scalars = [
+        "max_power",
+        "curtailing_cost",
+        "curtailing_penalty",
+        "max_curtailing",
+        "fixed_cost_cable",
+        "variable_cost_cable",
+        "land_x",
+        "land_y",
+    ]
+    arrays = [name for name in CompiledInstance.__slots__ if name not in scalars + ["cache"]]
+    return arrays, scalars
+
+
+def aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_compiled(instance, path, sha256):
+    """
+    Writes a compiled instance in the binary format above
+    The file is written next to its final path then renamed, so that a reader never sees it half written
+    :param instance: the CompiledInstance
+    :param path: the path of the file written
+    :param sha256: the hash of the json instance it was compiled from, see score_cache.content_hash
+    """
+    arrays, scalars = array_fields()
+    header = {
+        "version": VERSION,
+        "sha256": sha256,
+        "scalars": {name: getattr(instance, name) for name in scalars},
+        "arrays": {},
+    }
+    offset = 0
+    for name in arrays:
+        array = np.ascontiguousarray(getattr(instance, name))
+        header["arrays"][name] = [array.dtype.str, list(array.shape), offset]
+        offset = aligned(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode()
+    start = aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(header_bytes).to_bytes(8, "little"))
+        file.write(header_bytes)
+        for name in arrays:
+            array = np.ascontiguousarray(getattr(instance, name))
+            file.seek(start + header["arrays"][name][2])
+            file.write(array.tobytes())
+    os.replace(temp_path, path)
+
+
+def read_compiled(path, sha256=None):
+    """
+    Maps a compiled file in memory
+    :param path: the path of the compiled file
+    :param sha256: the expected hash of the json instance, not checked if None
+    :return: the CompiledInstance, its arrays backed by the file, or None if the file
+    is not a compiled file of this version and hash, or is truncated or corrupt
+    :raises FileNotFoundError if the file doesn't exist
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return None
+    header_start = len(MAGIC) + 8
+    if len(buffer) < header_start or buffer[: len(MAGIC)] != MAGIC:
+        return None
+    header_length = int.from_bytes(buffer[len(MAGIC) : header_start], "little")
+    if header_start + header_length > len(buffer):
+        return None
+    start = aligned(header_start + header_length)
+    arrays, scalars = array_fields()
+    views = {}
+    try:
+        header = json.loads(buffer[header_start : header_start + header_length])
+        if (
+            header["version"] != VERSION
+            or (sha256 is not None and header["sha256"] != sha256)
+            or set(header["arrays"]) != set(arrays)
+            or set(header["scalars"]) != set(scalars)
+        ):
+            return None
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            # A file truncated after its header
+            if offset < 0 or start + offset + count * dtype.itemsize > len(buffer):
+                return None
+            views[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=start + offset)
+            views[name] = views[name].reshape(shape)
+    except (ValueError, KeyError, TypeError):
+        # A header that is not the json written by write_compiled
+        return None
+
+    instance = CompiledInstance.__new__(CompiledInstance)
+    for name, value in header["scalars"].items():
+        setattr(instance, name, value)
+    for name, array in views.items():
+        setattr(instance, name, array)
+    instance.cache = {}
+    return instance
+
+
+def open_compiled_instance(instance_path, write=True):
+    """
+    Loads an instance from its compiled file, when it is fresher than the json instance
+    and was compiled from the same content, else compiles the json instance
+    :param instance_path: file path to the json instance
+    :param write: whether to (re)write the compiled file when it is missing or stale
+    :return: the CompiledInstance
+    :raises FileNotFoundError if the json instance doesn't exist, InstanceError if it is not valid
+    """
+    with open(instance_path, "rb") as file:
+        content = file.read()
+    sha256 = content_hash(content)
+    path = compiled_path(instance_path)
+    if (
+        os.path.exists(path)
+        and os.path.getmtime(path) >= os.path.getmtime(instance_path)
+    ):
+        instance = read_compiled(path, sha256)
+        if instance is not None:
+            return instance
+
+    try:
+        instance = CompiledInstance(convert_instance(json.loads(content)))
+    except json.decoder.JSONDecodeError as err:
+        raise InstanceError([f"Error: bad JSON formatting : {err}"])
+    if write:
+        write_compiled(instance, path, sha256)
+        # The mapped file, to share its pages with the other processes
+        return read_compiled(path)
+    return instance
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Compiles json instances into binary files, written next to them."
+    )
+    python_parser.add_argument("instances", nargs="+", help="file paths to the json instances")
+    python_parser.add_argument(
+        "-f", "--force", dest="force", action="store_true", help="compile even if up to date"
+    )
+    args = python_parser.parse_args()
+
+    for instance_path in args.instances:
+        if args.force and os.path.exists(compiled_path(instance_path)):
+            os.remove(compiled_path(instance_path))
+        instance = open_compiled_instance(instance_path)
+        print(f"{compiled_path(instance_path)} : {instance.nbytes() / 2**20:.1f} MB of arrays")
@@ -0,0 +1,253 @@
+import numpy as np
+from .constants import *
+from math import fsum
+from .errors import InstanceError
+
+# Compact representation of an instance : every list of the instance is stored as dense arrays,
+# the element of id i being at position i - 1 (the ids are 1 ... N without skips,
+# as solution_format_checker already assumes).
+# cost.py runs directly on a CompiledInstance as well as on a converted instance.
+
+# Largest number of entries of the turbine-site distance table (80 MB of floats) : above it,
+# the distances are computed for each solution instead, see CompiledInstance.turbine_site_dist
+MAX_TURBINE_SITE_TABLE = 10**7
+
+
+class CompiledInstance:
+    """Dense, array-backed version of a converted instance"""
+
+    __slots__ = (
+        # General parameters
+        "max_power",
+        "curtailing_cost",
+        "curtailing_penalty",
+        "max_curtailing",
+        "fixed_cost_cable",
+        "variable_cost_cable",
+        "land_x",
+        "land_y",
+        # Substation types
+        "sub_cost",
+        "sub_rating",
+        "sub_prob_fail",
+        # Land-substation cable types
+        "land_fix_cost",
+        "land_var_cost",
+        "land_rating",
+        "land_prob_fail",
+        # Substation-substation cable types
+        "subsub_fix_cost",
+        "subsub_var_cost",
+        "subsub_rating",
+        # Substation locations and wind turbines
+        "site_x",
+        "site_y",
+        "turbine_x",
+        "turbine_y",
+        # Wind scenarios
+        "scenario_power",
+        "scenario_prob",
+        # Precomputed distances
+        "site_land_dist",
+        "site_site_dist",
+        "turbine_site_table",  # Empty above MAX_TURBINE_SITE_TABLE entries
+        # Per-instance data cached by the cost engines
+        "cache",
+    )
+
+    def __init__(self, instance, turbines=None, scenarios=None):
+        """
+        :param instance: the converted instance, see converter.convert_instance
+        :param turbines: the (x, y) arrays of the turbines, read from the instance if not given
+        :param scenarios: the (power, probability) arrays of the scenarios, read from the instance if not given
+        (see streaming_loader.py, which never builds these two lists)
+        :raises InstanceError if the ids of a list are not 1 ... N
+        """
+        gen_parameters = instance[GEN_PARAMETERS]
+        self.max_power = gen_parameters[MAX_POWER]
+        self.curtailing_cost = gen_parameters[CURTAILING_COST]
+        self.curtailing_penalty = gen_parameters[CURTAILING_PENA]
+        self.max_curtailing = gen_parameters[MAX_CURTAILING]
+        self.fixed_cost_cable = gen_parameters[FIX_COST_CABLE]
+        self.variable_cost_cable = gen_parameters[VAR_COST_CABLE]
+        self.land_x = gen_parameters[MAIN_LAND_STATION][X]
+        self.land_y = gen_parameters[MAIN_LAND_STATION][Y]
+
+        self.sub_cost, self.sub_rating, self.sub_prob_fail = dense_arrays(
+            instance, SUBSTATION_TYPES, [COST, RATING, PROB_FAIL]
+        )
+        (
+            self.land_fix_cost,
+            self.land_var_cost,
+            self.land_rating,
+            self.land_prob_fail,
+        ) = dense_arrays(
+            instance, LAND_SUB_CABLE_TYPES, [FIX_COST, VAR_COST, RATING, PROB_FAIL]
+        )
+        # Their probability of failure plays no part in the cost, and is not always given
+        self.subsub_fix_cost, self.subsub_var_cost, self.subsub_rating = dense_arrays(
+            instance, SUB_SUB_CABLE_TYPES, [FIX_COST, VAR_COST, RATING]
+        )
+        self.site_x, self.site_y = dense_arrays(instance, SUBSTATION_LOCATION, [X, Y])
+        if turbines is None:
+            turbines = dense_arrays(instance, WIND_TURBINES, [X, Y])
+        self.turbine_x, self.turbine_y = turbines
+        if scenarios is None:
+            scenarios = dense_arrays(
+                instance, WIND_SCENARIOS, [POWER_GENERATION, PROBABILITY]
+            )
+        self.scenario_power, self.scenario_prob = scenarios
+
+        # Same operations as cost.dist, so that the distances are exactly the same
+        self.site_land_dist = np.sqrt(
+            (self.site_x - self.land_x) ** 2 + (self.site_y - self.land_y) ** 2
+        )
+        self.site_site_dist = np.sqrt(
+            (self.site_x[:, None] - self.site_x[None, :]) ** 2
+            + (self.site_y[:, None] - self.site_y[None, :]) ** 2
+        )
+        if len(self.turbine_x) * len(self.site_x) > MAX_TURBINE_SITE_TABLE:
+            self.turbine_site_table = np.empty((0, 0))
+        else:
+            self.turbine_site_table = np.sqrt(
+                (self.turbine_x[:, None] - self.site_x[None, :]) ** 2
+                + (self.turbine_y[:, None] - self.site_y[None, :]) ** 2
+            )
+        self.cache = {}
+
+    def nbytes(self):
+        """:return: the memory used by the arrays of the instance, in bytes"""
+        return sum(
+            getattr(self, name).nbytes
+            for name in self.__slots__
+            if isinstance(getattr(self, name), np.ndarray)
+        )
+
+    def list_size(self, key):
+        """:return: the number of elements of the list at key in the instance"""
+        return len(
+            {
+                SUBSTATION_TYPES: self.sub_cost,
+                LAND_SUB_CABLE_TYPES: self.land_fix_cost,
+                SUB_SUB_CABLE_TYPES: self.subsub_fix_cost,
+                SUBSTATION_LOCATION: self.site_x,
+                WIND_TURBINES: self.turbine_x,
+                WIND_SCENARIOS: self.scenario_power,
+            }[key]
+        )
+
+    def turbine_site_dist(self, turbines, sites):
+        """Distances between turbines and sites, pair by pair, read from the precomputed table,
+        or computed when the instance is too large for it (see MAX_TURBINE_SITE_TABLE)
+        :param turbines: the positions of the turbines
+        :param sites: the positions of the sites, an array broadcast with turbines
+        :return: the array of the distances, exactly the ones of cost.dist"""
+        if self.turbine_site_table.size:
+            return self.turbine_site_table[turbines, sites]
+        return np.sqrt(
+            (self.turbine_x[turbines] - self.site_x[sites]) ** 2
+            + (self.turbine_y[turbines] - self.site_y[sites]) ** 2
+        )
+
+    def curtailing_parameters(self):
+        """:return: linear_cost, pena_cost, max_curtailing, see cost.curtailing_parameters"""
+        return self.curtailing_cost, self.curtailing_penalty, self.max_curtailing
+
+    def wind_scenarios(self):
+        """:return: the list of (power generation, probability) of every scenario"""
+        return list(zip(self.scenario_power.tolist(), self.scenario_prob.tolist()))
+
+    def evaluation_context(self, solution):
+        """Same as cost.evaluation_context, read from the arrays
+        :param solution: the converted solution
+        :return: the evaluation context of the solution"""
+        context = {}
+        for id in sorted(solution[SUBSTATIONS]):
+            substation = solution[SUBSTATIONS][id]
+            sub_type = substation[SUB_TYPE] - 1
+            cable_type = substation[LAND_CABLE_TYPE] - 1
+            context[id] = {
+                NB_TURBINES: 0,
+                CAPACITY: min(
+                    self.sub_rating[sub_type].item(), self.land_rating[cable_type].item()
+                ),
+                PROB_FAIL: self.sub_prob_fail[sub_type].item()
+                + self.land_prob_fail[cable_type].item(),
+                CABLE_RATING: None,
+                OTHER_SUB_ID: None,
+            }
+        for turbine in solution[TURBINES].values():
+            context[turbine[SUBSTATION_ID]][NB_TURBINES] += 1
+        for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items():
+            cable_type = cable[CABLE_TYPE_SUBSUB] - 1
+            context[id][CABLE_RATING] = self.subsub_rating[cable_type].item()
+            context[id][OTHER_SUB_ID] = cable[OTHER_SUB_ID]
+        return context
+
+    def construction_cost(self, solution):
+        """Same as cost.construction_cost, with the terms gathered from the precomputed tables
+        and the same fsum, so that both give exactly the same cost
+        :param solution: the converted solution
+        :return: the construction cost of the solution"""
+        substations = solution[SUBSTATIONS]
+        sites = id_array(substations.keys())
+        sub_types = id_array(sub[SUB_TYPE] for sub in substations.values())
+        land_types = id_array(sub[LAND_CABLE_TYPE] for sub in substations.values())
+        turbines = solution[TURBINES]
+        turbine_ids = id_array(turbines.keys())
+        turbine_sites = id_array(tu[SUBSTATION_ID] for tu in turbines.values())
+        # Each cable is duplicated one way each by the converter, and counted from its end with the lowest id
+        cables = [
+            (id, cable[OTHER_SUB_ID], cable[CABLE_TYPE_SUBSUB])
+            for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items()
+            if id <= cable[OTHER_SUB_ID]
+        ]
+        cable_ends = id_array(cable[0] for cable in cables)
+        cable_others = id_array(cable[1] for cable in cables)
+        cable_types = id_array(cable[2] for cable in cables)
+
+        terms = [
+            self.sub_cost[sub_types],
+            self.land_fix_cost[land_types],
+            self.land_var_cost[land_types] * self.site_land_dist[sites],
+            np.full(len(turbines), self.fixed_cost_cable),
+            self.variable_cost_cable * self.turbine_site_dist(turbine_ids, turbine_sites),
+            self.subsub_fix_cost[cable_types],
+            self.subsub_var_cost[cable_types] * self.site_site_dist[cable_ends, cable_others],
+        ]
+        return fsum(np.concatenate(terms).tolist())
+
+
+def id_array(ids):
+    """:return: the positions in the arrays of the given ids, as an integer array"""
+    return np.fromiter(ids, dtype=np.intp) - 1
+
+
+def dense_arrays(instance, key, fields):
+    """Gathers some fields of the elements of instance[key] in arrays, the element of id i at position i - 1
+    :param instance: the converted instance
+    :param key: the key of the list in the instance
+    :param fields: the keys of the fields wanted
+    :return: one float array per field
+    :raises InstanceError if the ids are not 1 ... N
+    """
+    elements = instance[key]
+    if set(elements.keys()) != set(range(1, len(elements) + 1)):
+        raise InstanceError([f"The ids of the {key} must be 1 ... {len(elements)}"])
+    try:
+        return [
+            np.array(
+                [elements[id][field] for id in range(1, len(elements) + 1)], dtype=float
+            )
+            for field in fields
+        ]
+    except KeyError as err:
+        raise InstanceError([f"An element of the {key} is missing its {err} key"])
+
+
+def compile_instance(instance):
+    """
+    :param instance: the converted instance, see converter.convert_instance
+    :return: the CompiledInstance of this instance
+    """
+    return CompiledInstance(instance)
@@ -90,3 +90,23 @@ KEYS_EXPECTED_TURBINES = [ID, SUBSTATION_ID]
 
 # Keys needed in the substation-substation cable types
 KEYS_EXPECTED_SUB_SUB_CABLE = [SUBSTATION_ID, OTHER_SUB_ID, CABLE_TYPE_SUBSUB]
+
+
+# INTERNAL PARAMETERS NAMES
+
+# Evaluation context of a solution, one dictionnary per built substation,
+# also holding its PROB_FAIL and OTHER_SUB_ID
+NB_TURBINES = "nb_turbines"
+CAPACITY = "capacity"  # min(substation rating, land cable rating)
+CABLE_RATING = "cable_rating"  # Rating of the outgoing sub-sub cable, None if none
+
+# Scenarios sorted by power with their prefix sums, cached in the converted instance
+SORTED_SCENARIOS = "sorted_scenarios"
+# Scenarios by decreasing probability x power, for the bounded cost, cached in the converted instance
+BOUND_ORDER = "bound_order"
+# Distinct powers of the wind scenarios with the probabilities of their scenarios, built by convert_instance
+SCENARIO_GROUPS = "scenario_groups"
+# Distances used by the construction cost, built by convert_instance, see converter.distance_tables
+SITE_LAND_DIST = "site_land_dist"
+SITE_SITE_DIST = "site_site_dist"
+TURBINE_SITE_DIST = "turbine_site_dist"
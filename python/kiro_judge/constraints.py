@@ -1,5 +1,5 @@
-from constants import *
-from errors import InstanceError
+from .constants import *
+from .errors import InstanceError
 
 # ALL THE CONSTRAINTS ARE CHECKED BY THE SOLUTION FORMAT CHECKET AND THE SOLUTION CONVERTER
 # THIS IS SPECIFIC TO THE 2023 EDITION
@@ -1,5 +1,16 @@
-from errors import InstanceError
-from constants import *
+from .errors import InstanceError
+from .constants import *
+from math import fsum, sqrt
+
+# Largest difference to 1 accepted for the sum of the probabilities of the wind scenarios
+PROBABILITY_TOLERANCE = 1e-6
+# Largest number of pairs of a distance table built by convert_instance (about 7 MB and 0.05 s per 100000 pairs) :
+# above it, the turbine-site or site-site distances are computed for each solution instead
+MAX_DISTANCE_PAIRS = 100000
+
+
+def dist(a, b):
+    return sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2)
 
 
 def list_to_dic_ids(lis, key_of_list, str_list):
@@ -100,9 +111,71 @@ def convert_instance(raw_instance):
     if str_errors:
         raise InstanceError(str_errors)
 
+    try:
+        scenarios = [
+            (scenario[POWER_GENERATION], scenario[PROBABILITY])
+            for scenario in return_dic[WIND_SCENARIOS].values()
+        ]
+    except KeyError as err:
+        raise InstanceError([f"A wind scenario is missing its {err} key"])
+    return_dic[SCENARIO_GROUPS] = group_scenarios(scenarios)
+    return_dic.update(distance_tables(return_dic))
+
     return return_dic
 
 
+def group_scenarios(scenarios):
+    """Merges the wind scenarios with the same power generation : the curtailing only depends on the power,
+    so the cost engines evaluate each distinct power once, and weight it by the probability of each scenario
+    :param scenarios: the list of (power generation, probability) of every scenario
+    :return: the list of (power generation, list of the probabilities of the scenarios with this power),
+    in the order of the first scenario with each power
+    :raises InstanceError if the probabilities do not sum to 1
+    """
+    total = fsum(prob for _, prob in scenarios)
+    if abs(total - 1) > PROBABILITY_TOLERANCE:
+        raise InstanceError(
+            [f"The probabilities of the wind scenarios should sum to 1, but they sum to {total}"]
+        )
+    groups = {}
+    for power, prob in scenarios:
+        groups.setdefault(power, []).append(prob)
+    return list(groups.items())
+
+
+def distance_tables(instance):
+    """Precomputes the distances used by the construction cost, once per instance,
+    so that the construction cost of each solution only looks them up
+    :param instance: the converted instance
+    :return: a dictionnary with the SITE_LAND_DIST {site id: distance to the main land station},
+    SITE_SITE_DIST {site id: {site id: distance}} and TURBINE_SITE_DIST {turbine id: {site id: distance}}
+    tables, the last two being None above MAX_DISTANCE_PAIRS pairs
+    :raises InstanceError if a position is missing a coordinate
+    """
+    try:
+        land = instance[GEN_PARAMETERS][MAIN_LAND_STATION]
+        land_pos = (land[X], land[Y])
+        sites = {id: (site[X], site[Y]) for id, site in instance[SUBSTATION_LOCATION].items()}
+        turbines = {id: (turbine[X], turbine[Y]) for id, turbine in instance[WIND_TURBINES].items()}
+    except KeyError as err:
+        raise InstanceError([f"A position of the instance is missing its {err} key"])
+
+    def table(points):
+        if len(points) * len(sites) > MAX_DISTANCE_PAIRS:
+            return None
+        # The same operations as in cost.construction_cost, so that the costs are exactly the same
+        return {
+            id: {site_id: dist(site_pos, pos) for site_id, site_pos in sites.items()}
+            for id, pos in points.items()
+        }
+
+    return {
+        SITE_LAND_DIST: {id: dist(pos, land_pos) for id, pos in sites.items()},
+        SITE_SITE_DIST: table(sites),
+        TURBINE_SITE_DIST: table(turbines),
+    }
+
+
 def convert_solution(raw_solution):
     """Convert the lists in raw_instance, all containing dictionnaries with a key 'id'
     to a dictionnary with keys being the value of 'id'
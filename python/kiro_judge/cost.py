@@ -0,0 +1,562 @@
+from .constants import *
+from .converter import dist, distance_tables, group_scenarios
+from math import fsum
+from .errors import InstanceError
+from .timings import SCENARIOS, SCENARIOS_EVALUATED, FAILURE_CASES_EVALUATED, TURBINE_SCANS
+
+
+# Names of the available engines for the operational cost
+PYTHON_ENGINE = "python"  # Pure python, reference implementation
+NUMPY_ENGINE = "numpy"  # All the scenarios at once, see vectorized_cost.py
+SORTED_ENGINE = "sorted"  # Closed form over the scenarios sorted by power, see sorted_cost.py
+ENGINES = [PYTHON_ENGINE, NUMPY_ENGINE, SORTED_ENGINE]
+
+
+def cost(instance, solution, engine=PYTHON_ENGINE, upper_bound=None):
+    """
+    Main function calculating the score of a given solution to an instance
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidates
+    :param engine: the engine used for the operational cost, one of ENGINES
+    :param upper_bound: if given, the computation stops as soon as the cost is known to exceed it,
+    see bounded_cost (the engine is then not used)
+    :return: int score: the cost associated with the solution,
+    or value, exceeded if upper_bound is given, see bounded_cost
+    """
+    const_cost = construction_cost(instance, solution)
+    if upper_bound is not None:
+        return bounded_cost(instance, solution, const_cost, upper_bound)
+    oper_cost = operational_cost_engine(engine)(instance, solution)
+    return oper_cost + const_cost
+
+
+def operational_cost_engine(engine):
+    """Returns the function computing the operational cost with the given engine
+    The engines other than the pure python one are only imported when asked for,
+    so that their dependencies (numpy) stay optional.
+    :param engine: one of ENGINES
+    :return: a function with the same signature as operational_cost"""
+    if engine == PYTHON_ENGINE:
+        return operational_cost
+    if engine == NUMPY_ENGINE:
+        from .vectorized_cost import vectorized_operational_cost
+
+        return vectorized_operational_cost
+    if engine == SORTED_ENGINE:
+        from .sorted_cost import sorted_operational_cost
+
+        return sorted_operational_cost
+    raise ValueError(f"Unknown engine {engine}, expected one of {ENGINES}")
+
+
+def construction_cost(instance, solution, timings=None):
+    """
+    Function calculating the construction cost of a given solution to an instance
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidates
+    :param timings: a timings.Timings, whose counter of turbine scans is incremented if given
+    :return: int score: the cost associated with the solution
+    """
+    if timings is not None:
+        timings.count(TURBINE_SCANS, len(solution[TURBINES]))
+    if not isinstance(instance, dict):
+        # CompiledInstance, see compiled_instance.py
+        return instance.construction_cost(solution)
+    # Every term is gathered and summed by fsum, exactly rounded whatever the order of the lists
+    cost = []
+    site_land_dist, site_site_dist, turbine_site_dist = distances(instance)
+    # First we add the cost associated with the substations
+    for id, substation in solution[SUBSTATIONS].items():
+        # We first add the cost of building this substation, then the cost of the substation-land cable
+        cost.append(instance[SUBSTATION_TYPES][substation[SUB_TYPE]][COST])
+        cable_type = substation[LAND_CABLE_TYPE]
+        cost.append(instance[LAND_SUB_CABLE_TYPES][cable_type][FIX_COST])
+        cost.append(instance[LAND_SUB_CABLE_TYPES][cable_type][VAR_COST] * site_land_dist[id])
+
+    # Then the costs associated with the turbines
+    fix_cost_cable = instance[GEN_PARAMETERS][FIX_COST_CABLE]
+    var_cost_cable = instance[GEN_PARAMETERS][VAR_COST_CABLE]
+    for id, turbine in solution[TURBINES].items():
+        # The distance to the substation, computed here if the instance is too large for its table
+        sub_id = turbine[SUBSTATION_ID]
+        if turbine_site_dist is None:
+            dis_turb_sub = dist(
+                position(instance, SUBSTATION_LOCATION, sub_id), position(instance, WIND_TURBINES, id)
+            )
+        else:
+            dis_turb_sub = turbine_site_dist[id][sub_id]
+        cost.append(fix_cost_cable)
+        cost.append(var_cost_cable * dis_turb_sub)
+
+    # Then the costs associated with the substation-substation cables
+    # BEWARE, since we duplicated each cable to treat them as two one-way cables in the converter
+    # We only count each true cable from its end with the lowest id !!!
+
+    for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items():
+        id1 = id
+        id2 = cable[OTHER_SUB_ID]
+        if id1 > id2:
+            continue
+        cable_type = cable[CABLE_TYPE_SUBSUB]
+        if site_site_dist is None:
+            dis_sub_sub = dist(
+                position(instance, SUBSTATION_LOCATION, id1), position(instance, SUBSTATION_LOCATION, id2)
+            )
+        else:
+            dis_sub_sub = site_site_dist[id1][id2]
+        cost.append(instance[SUB_SUB_CABLE_TYPES][cable_type][FIX_COST])
+        cost.append(instance[SUB_SUB_CABLE_TYPES][cable_type][VAR_COST] * dis_sub_sub)
+
+    return fsum(cost)
+
+
+def distances(instance):
+    """Reads the distance tables of a converted instance, see converter.distance_tables.
+    They are built by convert_instance, and computed once for an instance converted otherwise
+    :return: site_land_dist, site_site_dist, turbine_site_dist, the last two None if not precomputed"""
+    if SITE_LAND_DIST not in instance:
+        instance.update(distance_tables(instance))
+    return instance[SITE_LAND_DIST], instance[SITE_SITE_DIST], instance[TURBINE_SITE_DIST]
+
+
+def position(instance, key, id):
+    """:return: the (x, y) position of the element id of the list at key in the instance"""
+    return (instance[key][id][X], instance[key][id][Y])
+
+
+def evaluation_context(instance, solution, timings=None):
+    """Precomputes, once per solution, everything the curtailing functions need to know
+    about each built substation, so that they never have to scan the turbines again
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param timings: a timings.Timings, whose counter of turbine scans is incremented if given
+    :return: context: a dictionnary with the built substation ids as keys, each value containing
+    the number of linked turbines, the capacity min(substation rating, land cable rating),
+    the probability of failure and the outgoing substation-substation cable (rating and other end),
+    in the order of the ids, so that the sums over the substations never depend on the order of the solution
+    """
+    if timings is not None:
+        timings.count(TURBINE_SCANS, len(solution[TURBINES]))
+    if not isinstance(instance, dict):
+        # CompiledInstance, see compiled_instance.py
+        return instance.evaluation_context(solution)
+    context = {}
+    for id in sorted(solution[SUBSTATIONS]):
+        substation = solution[SUBSTATIONS][id]
+        sub_type = substation[SUB_TYPE]
+        cable_type = substation[LAND_CABLE_TYPE]
+        context[id] = {
+            NB_TURBINES: 0,
+            CAPACITY: min(
+                instance[SUBSTATION_TYPES][sub_type][RATING],
+                instance[LAND_SUB_CABLE_TYPES][cable_type][RATING],
+            ),
+            PROB_FAIL: prob_failure(instance, substation),
+            CABLE_RATING: None,
+            OTHER_SUB_ID: None,
+        }
+    # A single pass through the turbines to count the load of each substation
+    for turbine in solution[TURBINES].values():
+        context[turbine[SUBSTATION_ID]][NB_TURBINES] += 1
+    # The cables are already duplicated one way each by the converter
+    for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items():
+        cable_type = cable[CABLE_TYPE_SUBSUB]
+        context[id][CABLE_RATING] = instance[SUB_SUB_CABLE_TYPES][cable_type][RATING]
+        context[id][OTHER_SUB_ID] = cable[OTHER_SUB_ID]
+    return context
+
+
+def no_failure_curtailing(context, power):
+    """Computes the no-failure curtailing given the evaluation context of a solution and the power in this scenario
+    (C^n(x, y, omega) in the mathematical notations)
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param power: the power generation in the wind scenario under which we compute this cost
+    :return: score: the curtailing associated with the solution under this scenario
+    """
+    curtailing = 0
+    for sub in context.values():
+        curtailing += power * sub[NB_TURBINES]
+        curtailing -= sub[CAPACITY]
+    return max(0, curtailing)
+
+
+def curtailing_failed_substation(context, sub_id, power):
+    """Computes the curtailing of a given failed substation
+    (First part of the (6) equation)
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param sub_id: the id of the failed substation
+    :param power: the power generated under the current scenario
+    returns the curtailing of failed substation"""
+    sub = context[sub_id]
+    curtailing = 0
+    # First add the received power
+    curtailing += power * sub[NB_TURBINES]
+    # Then substract the power that is sent to another substation if applicable
+    if sub[CABLE_RATING] is not None:
+        curtailing -= sub[CABLE_RATING]
+    return max(0, curtailing)
+
+
+def curtailing_non_failed_substation(context, sub_id, power, power_from_failed=0):
+    """Computes the curtailing of a given substation
+    (First part of the (6) equation)
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param sub_id: the id of the current substation
+    :param power: the power generated under the current scenario
+    :param power_from_failed: The power received from the failed substation (0 by default)
+    :return: the curtailing of the substation"""
+    sub = context[sub_id]
+    curtailing = 0
+    # First add the power from the turbines
+    curtailing += power * sub[NB_TURBINES]
+    # Then the power received from failed substation
+    curtailing += power_from_failed
+    # Then substract the capacity of this substation
+    curtailing -= sub[CAPACITY]
+
+    return max(0, curtailing)
+
+
+def curtailing_given_failed_sub(context, power, fail_id):
+    """Computes the total curtailing given the evaluation context of a solution, the generated power and the id of the failed substation
+    (C^n(x, y, omega) in the mathematical notations)
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param power: the power generation in the wind scenario under which we compute this cost
+    :param fail_id: id of the failed substation
+    :return: score: the curtailing associated with the solution under this scenario
+    """
+    curtailing = 0
+    failed = context[fail_id]
+    # The substation linked to the failed one, might be None
+    other_id = failed[OTHER_SUB_ID]
+    # The power received by the failed substation
+    power_received = failed[NB_TURBINES] * power
+    # Power sent
+    power_sent = 0
+    if other_id is not None:
+        power_sent = min(power_received, failed[CABLE_RATING])
+    # First add the cost of the curtailing of the failed substation
+    curtailing += curtailing_failed_substation(context, fail_id, power)
+    # Then iterate through the rest of the substations
+    for id in context.keys():
+        # We already took this cost into account
+        if id == fail_id:
+            continue
+        # If this substation is receiving from the failed one, use the power sent to it.
+        elif id == other_id:
+            curtailing += curtailing_non_failed_substation(
+                context, id, power, power_sent
+            )
+        else:
+            curtailing += curtailing_non_failed_substation(context, id, power)
+
+    return curtailing
+
+
+def exact_partials(values):
+    """Sums values without any rounding error (Shewchuk's algorithm, as math.fsum does internally)
+    :return: a short list of non-overlapping floats whose exact sum is the exact sum of values"""
+    partials = []
+    for x in values:
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            high = x + y
+            low = y - (high - x)
+            if low:
+                partials[i] = low
+                i += 1
+            x = high
+        partials[i:] = [x]
+    return partials
+
+
+def compensated_sum(values, high=0, low=0):
+    """Adds values to a compensated sum (Neumaier's variant of Kahan summation), in their order.
+    vectorized_cost.compensated_add does the same operations elementwise, so that both engines
+    give bit-identical results.
+    :param values: the floats added
+    :param high, low: the compensated sum the values are added to, whose value is high + low
+    :return: high, low: the new compensated sum"""
+    for x in values:
+        total = high + x
+        if abs(high) >= abs(x):
+            low += (high - total) + x
+        else:
+            low += (x - total) + high
+        high = total
+    return high, low
+
+
+def scenario_curtailings(context, power):
+    """Computes the curtailing of every failure case and of the no-failure case under one scenario.
+    The curtailings of the substations when none fails (the no-failure vector) are summed once,
+    and each failure case only replaces the terms of the failed substation and of its partner,
+    in time linear in the number of built substations instead of quadratic.
+    All the sums are compensated (see compensated_sum), in the order of the context.
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param power: the power generation in the wind scenario
+    :return: failure_curtailings, no_fail_curtailing: the list of the values of curtailing_given_failed_sub
+    for every substation, in the order of the context, and the value of no_failure_curtailing
+    (up to the rounding of the sums, which these functions do one term at a time)
+    """
+    vector = []
+    excess = []
+    for sub in context.values():
+        load = power * sub[NB_TURBINES]
+        excess.append(load - sub[CAPACITY])
+        vector.append(max(0, excess[-1]))
+    high, low = compensated_sum(vector)
+    index = {id: i for i, id in enumerate(context)}
+
+    failure_curtailings = []
+    for i, (id, failed) in enumerate(context.items()):
+        terms = [-vector[i], curtailing_failed_substation(context, id, power)]
+        other_id = failed[OTHER_SUB_ID]
+        if other_id is not None and other_id != id:
+            power_sent = min(failed[NB_TURBINES] * power, failed[CABLE_RATING])
+            terms.append(-vector[index[other_id]])
+            terms.append(
+                curtailing_non_failed_substation(context, other_id, power, power_sent)
+            )
+        case_high, case_low = compensated_sum(terms, high, low)
+        failure_curtailings.append(case_high + case_low)
+    no_fail_high, no_fail_low = compensated_sum(excess)
+    return failure_curtailings, max(0, no_fail_high + no_fail_low)
+
+
+def curtailing_parameters(instance):
+    """Reads the parameters of the cost of curtailing
+    :param instance: the instance addressed by the solution
+    :return: linear_cost, pena_cost, max_curtailing: c⁰, c^p and C_max
+    """
+    if not isinstance(instance, dict):
+        return instance.curtailing_parameters()
+    gen_parameters = instance[GEN_PARAMETERS]
+    return (
+        gen_parameters[CURTAILING_COST],
+        gen_parameters[CURTAILING_PENA],
+        gen_parameters[MAX_CURTAILING],
+    )
+
+
+def wind_scenarios(instance):
+    """Reads the wind scenarios
+    :param instance: the instance addressed by the solution
+    :return: the list of (power generation, probability) of every scenario
+    """
+    if not isinstance(instance, dict):
+        return instance.wind_scenarios()
+    return [
+        (scenario[POWER_GENERATION], scenario[PROBABILITY])
+        for scenario in instance[WIND_SCENARIOS].values()
+    ]
+
+
+def scenario_groups(instance):
+    """Reads the wind scenarios merged by power, see converter.group_scenarios.
+    They are built by convert_instance, and computed once for a CompiledInstance (kept in its cache)
+    :param instance: the instance addressed by the solution
+    :return: the list of (power generation, list of the probabilities of the scenarios with this power)
+    :raises InstanceError if the probabilities do not sum to 1
+    """
+    cache = instance if isinstance(instance, dict) else instance.cache
+    if SCENARIO_GROUPS not in cache:
+        cache[SCENARIO_GROUPS] = group_scenarios(wind_scenarios(instance))
+    return cache[SCENARIO_GROUPS]
+
+
+def cost_of_curtailing(instance, curtailing):
+    """Computes the cost of the given curtailing
+    using the formula c^c(C) = c⁰C + c^p[C-C_max]⁺
+    :param instance: the instance addressed by the solution
+    :param curtailing: the curtailing we want to know the cost of
+    :return: cost: the cost of the curtailing
+    """
+    linear_cost, pena_cost, max_curtailing = curtailing_parameters(instance)
+    cost = linear_cost * curtailing
+    cost += pena_cost * max(0, curtailing - max_curtailing)
+    return cost
+
+
+def prob_failure(instance, substation):
+    """Computes the probability of failure for a given substation
+    :param instance: the instance addressed by the solution
+    :param substation: the dictionnary of the substation we compute p^f for
+    :return: prob: the probability of failure of this substation"""
+    prob = 0
+    sub_type = substation[SUB_TYPE]
+    cab_type = substation[LAND_CABLE_TYPE]
+    prob += instance[SUBSTATION_TYPES][sub_type][PROB_FAIL]
+    prob += instance[LAND_SUB_CABLE_TYPES][cab_type][PROB_FAIL]
+    return prob
+
+
+def no_failure_probability(context):
+    """Computes the probability that no substation fails
+    :param context: the evaluation context of the solution, see evaluation_context
+    :return: prob: the probability of a non-failure
+    :raises InstanceError if this probability is not in [0,1]"""
+    no_fail_proba = max(0, 1 - fsum(sub[PROB_FAIL] for sub in context.values()))
+    if not (0 <= no_fail_proba <= 1):
+        raise InstanceError(
+            [
+                f"The probability of a non-failure should be in [0,1], but it is {no_fail_proba}"
+            ]
+        )
+    return no_fail_proba
+
+
+def scenario_cost(instance, context, no_fail_proba, scenario_power):
+    """Computes the expected cost of the curtailing under one scenario, over all the failure cases
+    :param instance: the instance addressed by the solution
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param no_fail_proba: the probability that no substation fails, see no_failure_probability
+    :param scenario_power: the power generation in the wind scenario
+    :return: the cost of the scenario, to weight by its probability"""
+    fail_curtailings, no_fail_curtailing = scenario_curtailings(context, scenario_power)
+    high, low = compensated_sum(
+        sub[PROB_FAIL] * cost_of_curtailing(instance, fail_curt)
+        for sub, fail_curt in zip(context.values(), fail_curtailings)
+    )
+    high, low = compensated_sum(
+        [no_fail_proba * cost_of_curtailing(instance, no_fail_curtailing)], high, low
+    )
+    return high + low
+
+
+def weighted_scenario_costs(instance, context, no_fail_proba, groups):
+    """Computes prob * cost of every scenario, the cost being evaluated once per distinct power
+    :param instance: the instance addressed by the solution
+    :param context: the evaluation context of the solution, see evaluation_context
+    :param no_fail_proba: the probability that no substation fails, see no_failure_probability
+    :param groups: the scenarios merged by power, see scenario_groups
+    :return: a generator of prob(scenario) * cost(scenario), in the order of groups"""
+    for scenario_power, probabilities in groups:
+        power_cost = scenario_cost(instance, context, no_fail_proba, scenario_power)
+        for scenario_prob in probabilities:
+            yield scenario_prob * power_cost
+
+
+def operational_cost(instance, solution, context=None, workers=None, budget=None, seed=0):
+    """Computes the operationnal cost of a given solution, defined in (7)
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :param workers: if given, the scenarios are evaluated by chunks on this number of processes,
+    see parallel_cost.py, with exactly the same result whatever the number of workers
+    :param budget: if given, screening mode : the cost is estimated from this number of scenarios drawn,
+    each stratum whose draws cost the same evaluating up to two more, see screening.py (workers is then not used)
+    :param seed: the seed of the screening mode, the same seed giving the same estimate
+    :return: the operational cost of the solution,
+    or in screening mode estimate, low, high: the estimate and its 95% confidence interval"""
+    if budget is not None:
+        from .screening import screened_operational_cost
+
+        return screened_operational_cost(instance, solution, budget, seed, context=context)
+    if workers is not None:
+        from .parallel_cost import parallel_operational_cost
+
+        return parallel_operational_cost(instance, solution, workers, context)
+    if context is None:
+        context = evaluation_context(instance, solution)
+    no_fail_proba = no_failure_probability(context)
+    # We then enumerate through the scenarios, whose costs are summed exactly rounded
+    return fsum(
+        weighted_scenario_costs(instance, context, no_fail_proba, scenario_groups(instance))
+    )
+
+
+def bound_ordered_scenarios(instance):
+    """Sorts the scenarios merged by power by decreasing probability x power, the order in which they
+    weigh the most in the operational cost, computed once per instance and kept in the instance
+    under the BOUND_ORDER key (in its cache for a CompiledInstance)
+    :param instance: the instance addressed by the solution
+    :return: the scenarios merged by power, see scenario_groups, in this order
+    """
+    cache = instance if isinstance(instance, dict) else instance.cache
+    if BOUND_ORDER not in cache:
+        cache[BOUND_ORDER] = sorted(
+            scenario_groups(instance), key=lambda group: group[0] * fsum(group[1]), reverse=True
+        )
+    return cache[BOUND_ORDER]
+
+
+def bounded_cost(instance, solution, const_cost, upper_bound, context=None):
+    """Computes the cost of a solution with the reference engine, stopping as soon as it exceeds a bound.
+    The construction cost comes first, then the expected costs of the scenarios, which are nonnegative,
+    are added in the order of bound_ordered_scenarios, so that a solution worse than the bound is
+    usually rejected after a few scenarios.
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param const_cost: the construction cost of the solution
+    :param upper_bound: the cost above which the computation stops
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :return: value, exceeded: if exceeded, the cost is above upper_bound and value is a lower bound of it
+    (the construction cost plus the scenarios evaluated), otherwise value is exactly the cost given by cost
+    """
+    if const_cost > upper_bound:
+        return const_cost, True
+    if context is None:
+        context = evaluation_context(instance, solution)
+    no_fail_proba = no_failure_probability(context)
+    scenario_costs = []
+    partial_cost = const_cost
+    for weighted_cost in weighted_scenario_costs(
+        instance, context, no_fail_proba, bound_ordered_scenarios(instance)
+    ):
+        scenario_costs.append(weighted_cost)
+        partial_cost += weighted_cost
+        if partial_cost > upper_bound:
+            # The running sum may be rounded up, the exactly rounded one never exceeds the cost
+            lower_bound = fsum(scenario_costs) + const_cost
+            if lower_bound > upper_bound:
+                return lower_bound, True
+    # Same sums as operational_cost and cost
+    total = fsum(scenario_costs) + const_cost
+    return total, total > upper_bound
+
+
+def operational_cost_breakdown(instance, solution, context=None, timings=None):
+    """Same as operational_cost, keeping the expected cost of each scenario and of each case
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :param timings: a timings.Timings, whose counters of scenarios and failure cases
+    (and of turbine scans, if the context is built here) are incremented if given
+    :return: cost, scenario_costs, failure_case_costs, no_failure_cost: the operational cost (exactly the
+    one of operational_cost), the list of prob(scenario) * cost(scenario) in the order of the scenarios,
+    the dictionnary of the expected cost of the failure of each built substation, over all the scenarios,
+    and the expected cost of the no-failure case"""
+    if context is None:
+        context = evaluation_context(instance, solution, timings)
+    power_costs = {}
+    failure_case_costs = {id: [] for id in context}
+    no_failure_costs = []
+    no_fail_proba = no_failure_probability(context)
+    for scenario_power, probabilities in scenario_groups(instance):
+        fail_curtailings, no_fail_curtailing = scenario_curtailings(context, scenario_power)
+        if timings is not None:
+            timings.count(SCENARIOS_EVALUATED, 1)
+            timings.count(FAILURE_CASES_EVALUATED, len(fail_curtailings))
+        case_costs = [
+            sub[PROB_FAIL] * cost_of_curtailing(instance, fail_curt)
+            for sub, fail_curt in zip(context.values(), fail_curtailings)
+        ]
+        case_costs.append(no_fail_proba * cost_of_curtailing(instance, no_fail_curtailing))
+        # Same sums as scenario_cost
+        high, low = compensated_sum(case_costs)
+        power_costs[scenario_power] = high + low
+        for scenario_prob in probabilities:
+            for id, case_cost in zip(context, case_costs):
+                failure_case_costs[id].append(scenario_prob * case_cost)
+            no_failure_costs.append(scenario_prob * case_costs[-1])
+    scenario_costs = [
+        scenario_prob * power_costs[scenario_power]
+        for scenario_power, scenario_prob in wind_scenarios(instance)
+    ]
+    if timings is not None:
+        timings.count(SCENARIOS, len(scenario_costs))
+    failure_case_costs = {id: fsum(costs) for id, costs in failure_case_costs.items()}
+    return fsum(scenario_costs), scenario_costs, failure_case_costs, fsum(no_failure_costs)
@@ -0,0 +1,17 @@
+# Codes of the errors reported in a result.JudgeResult
+FILE_NOT_FOUND = "file_not_found"
+BAD_JSON = "bad_json"  # One of the files is not valid json
+INVALID_SOLUTION = "invalid_solution"  # The solution is badly formatted or breaks a constraint
+INVALID_INSTANCE = "invalid_instance"  # The instance can't be converted or evaluated
+
+
+class InstanceError(Exception):
+    def __init__(self, problems):
+        """
+        :param problems: The list of problems encountered which led to the exception raise
+        """
+        self._errors_list = problems
+
+    @property
+    def list(self):
+        return self._errors_list
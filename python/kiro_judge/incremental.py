@@ -0,0 +1,271 @@
+from .constants import *
+from .cost import (
+    dist,
+    evaluation_context,
+    exact_partials,
+    no_failure_probability,
+    prob_failure,
+)
+from .errors import InstanceError
+from math import fsum
+from .sorted_cost import (
+    sorted_scenarios,
+    substations_events,
+    failure_case_cost,
+    no_failure_case_cost,
+)
+
+
+class IncrementalEvaluator:
+    """Keeps the cost of a solution up to date while it is modified one move at a time.
+    The converted solution given is modified in place, so that it always describes the current state.
+    Each move only updates the construction terms it touches and the evaluation context of the
+    substations involved. The construction terms are kept as the partials of an exact sum (see
+    cost.exact_partials), so that the construction cost stays exactly the one of cost.construction_cost
+    however many moves are made. Each move then recomputes the failure cases it affects with the
+    closed-form engine of sorted_cost.py, whose cost does not depend on the number of scenarios.
+    """
+
+    def __init__(self, instance, solution):
+        """
+        :param instance: the converted instance addressed by the solution
+        :param solution: the converted solution, assumed to be valid
+        """
+        self.instance = instance
+        self.solution = solution
+        self.context = evaluation_context(instance, solution)
+        self.scenarios = sorted_scenarios(instance)
+        terms = []
+        for site in solution[SUBSTATIONS]:
+            terms.extend(self._substation_terms(site))
+        for turbine_id, turbine in solution[TURBINES].items():
+            terms.extend(self._turbine_terms(turbine_id, turbine[SUBSTATION_ID]))
+        for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items():
+            # Each cable is counted from its end with the lowest id, a cable looping on its site once
+            if id <= cable[OTHER_SUB_ID]:
+                terms.extend(self._cable_terms(id, cable[OTHER_SUB_ID], cable[CABLE_TYPE_SUBSUB]))
+        self.partials = exact_partials(terms)
+        # Expected cost of the curtailing under the failure of each substation, and without failure
+        self.case_costs = {}
+        self.no_fail_cost = 0
+        self._update_cases(self.context.keys())
+
+    def operational(self):
+        """:return: the current operational cost"""
+        cost = [sub[PROB_FAIL] * self.case_costs[id] for id, sub in self.context.items()]
+        cost.append(no_failure_probability(self.context) * self.no_fail_cost)
+        return fsum(cost)
+
+    @property
+    def construction(self):
+        """The current construction cost, exactly rounded as cost.construction_cost"""
+        return fsum(self.partials)
+
+    def cost(self):
+        """:return: the current total cost"""
+        return self.construction + self.operational()
+
+    def _update_cases(self, fail_ids):
+        """Recomputes the failure cases of fail_ids and the no-failure case"""
+        sub_events = substations_events(self.context)
+        for fail_id in fail_ids:
+            self.case_costs[fail_id] = failure_case_cost(
+                self.instance, self.scenarios, self.context, fail_id, sub_events
+            )
+        self.no_fail_cost = no_failure_case_cost(
+            self.instance, self.scenarios, self.context
+        )
+
+    def _update_construction(self, removed=(), added=()):
+        """Removes and adds construction terms to the exact sum"""
+        self.partials = exact_partials([*self.partials, *(-term for term in removed), *added])
+
+    def _position(self, key, id):
+        return (self.instance[key][id][X], self.instance[key][id][Y])
+
+    def _substation_terms(self, site):
+        """Construction terms of the substation built on site and of its land cable"""
+        substation = self.solution[SUBSTATIONS][site]
+        land = self.instance[GEN_PARAMETERS][MAIN_LAND_STATION]
+        cable = self.instance[LAND_SUB_CABLE_TYPES][substation[LAND_CABLE_TYPE]]
+        dis_sub_land = dist(self._position(SUBSTATION_LOCATION, site), (land[X], land[Y]))
+        return (
+            self.instance[SUBSTATION_TYPES][substation[SUB_TYPE]][COST],
+            cable[FIX_COST],
+            cable[VAR_COST] * dis_sub_land,
+        )
+
+    def _turbine_terms(self, turbine_id, sub_id):
+        """Construction terms of the cable between a turbine and a substation"""
+        dis_turb_sub = dist(
+            self._position(SUBSTATION_LOCATION, sub_id),
+            self._position(WIND_TURBINES, turbine_id),
+        )
+        gen_parameters = self.instance[GEN_PARAMETERS]
+        return gen_parameters[FIX_COST_CABLE], gen_parameters[VAR_COST_CABLE] * dis_turb_sub
+
+    def _cable_terms(self, id1, id2, cable_type):
+        """Construction terms of a (two ways) substation-substation cable"""
+        cable = self.instance[SUB_SUB_CABLE_TYPES][cable_type]
+        dis_sub_sub = dist(
+            self._position(SUBSTATION_LOCATION, id1),
+            self._position(SUBSTATION_LOCATION, id2),
+        )
+        return cable[FIX_COST], cable[VAR_COST] * dis_sub_sub
+
+    def _check_built(self, site):
+        if site not in self.context:
+            raise InstanceError([f"There is no substation built on site {site}"])
+
+    def _check_type(self, key, type_id):
+        if type_id not in self.instance[key]:
+            raise InstanceError([f"{type_id} does not exist in the list of {key}"])
+
+    def _update_substation(self, site):
+        """Updates the capacity and probability of failure of site after a change of its types"""
+        substation = self.solution[SUBSTATIONS][site]
+        self.context[site][CAPACITY] = min(
+            self.instance[SUBSTATION_TYPES][substation[SUB_TYPE]][RATING],
+            self.instance[LAND_SUB_CABLE_TYPES][substation[LAND_CABLE_TYPE]][RATING],
+        )
+        self.context[site][PROB_FAIL] = prob_failure(self.instance, substation)
+
+    def move_turbine(self, turbine_id, new_sub):
+        """Links a turbine to another built substation
+        :param turbine_id: id of the turbine
+        :param new_sub: id of the site of the substation it is now linked to
+        :return: the new total cost"""
+        if turbine_id not in self.solution[TURBINES]:
+            raise InstanceError([f"{turbine_id} does not exist in the list of {WIND_TURBINES}"])
+        self._check_built(new_sub)
+        turbine = self.solution[TURBINES][turbine_id]
+        old_sub = turbine[SUBSTATION_ID]
+        if old_sub == new_sub:
+            return self.cost()
+        self._update_construction(
+            self._turbine_terms(turbine_id, old_sub), self._turbine_terms(turbine_id, new_sub)
+        )
+        turbine[SUBSTATION_ID] = new_sub
+        self.context[old_sub][NB_TURBINES] -= 1
+        self.context[new_sub][NB_TURBINES] += 1
+        # Both substations appear in every failure case
+        self._update_cases(self.context.keys())
+        return self.cost()
+
+    def set_substation_type(self, site, sub_type):
+        """Changes the type of the substation built on site
+        :param site: id of the site
+        :param sub_type: id of the new substation type
+        :return: the new total cost"""
+        self._check_built(site)
+        self._check_type(SUBSTATION_TYPES, sub_type)
+        removed = self._substation_terms(site)
+        self.solution[SUBSTATIONS][site][SUB_TYPE] = sub_type
+        self._update_construction(removed, self._substation_terms(site))
+        self._update_substation(site)
+        self._update_cases(self.context.keys())
+        return self.cost()
+
+    def set_land_cable(self, site, cable_type):
+        """Changes the type of the cable linking the substation built on site to the land
+        :param site: id of the site
+        :param cable_type: id of the new land-substation cable type
+        :return: the new total cost"""
+        self._check_built(site)
+        self._check_type(LAND_SUB_CABLE_TYPES, cable_type)
+        removed = self._substation_terms(site)
+        self.solution[SUBSTATIONS][site][LAND_CABLE_TYPE] = cable_type
+        self._update_construction(removed, self._substation_terms(site))
+        self._update_substation(site)
+        self._update_cases(self.context.keys())
+        return self.cost()
+
+    def add_cable(self, id1, id2, cable_type):
+        """Builds a substation-substation cable between two built substations
+        :param id1, id2: ids of the sites of both substations
+        :param cable_type: id of the substation-substation cable type
+        :return: the new total cost"""
+        self._check_built(id1)
+        self._check_built(id2)
+        self._check_type(SUB_SUB_CABLE_TYPES, cable_type)
+        cables = self.solution[SUBSTATION_SUBSTATION_CABLES]
+        for id in (id1, id2):
+            if id in cables:
+                raise InstanceError(
+                    [f"The substation {id} is already linked to another substation"]
+                )
+        self._update_construction(added=self._cable_terms(id1, id2, cable_type))
+        rating = self.instance[SUB_SUB_CABLE_TYPES][cable_type][RATING]
+        for id, other_id in ((id1, id2), (id2, id1)):
+            cables[id] = {OTHER_SUB_ID: other_id, CABLE_TYPE_SUBSUB: cable_type}
+            self.context[id][CABLE_RATING] = rating
+            self.context[id][OTHER_SUB_ID] = other_id
+        # A cable only matters when one of its ends fails
+        self._update_cases({id1, id2})
+        return self.cost()
+
+    def remove_cable(self, site):
+        """Removes the substation-substation cable of the substation built on site
+        :param site: id of the site at either end of the cable
+        :return: the new total cost"""
+        cables = self.solution[SUBSTATION_SUBSTATION_CABLES]
+        if site not in cables:
+            raise InstanceError(
+                [f"The substation {site} is not linked to another substation"]
+            )
+        other_id = cables[site][OTHER_SUB_ID]
+        self._update_construction(
+            self._cable_terms(site, other_id, cables[site][CABLE_TYPE_SUBSUB])
+        )
+        for id in (site, other_id):
+            cables.pop(id, None)
+            self.context[id][CABLE_RATING] = None
+            self.context[id][OTHER_SUB_ID] = None
+        self._update_cases({site, other_id})
+        return self.cost()
+
+    def open_site(self, site, sub_type, land_cable_type):
+        """Builds a substation, with no turbine linked to it yet
+        :param site: id of the site
+        :param sub_type: id of the substation type
+        :param land_cable_type: id of the land-substation cable type
+        :return: the new total cost"""
+        if site not in self.instance[SUBSTATION_LOCATION]:
+            raise InstanceError([f"{site} does not exist in the list of {SUBSTATION_LOCATION}"])
+        if site in self.context:
+            raise InstanceError([f"Two or more substation are built on site {site}"])
+        self._check_type(SUBSTATION_TYPES, sub_type)
+        self._check_type(LAND_SUB_CABLE_TYPES, land_cable_type)
+        self.solution[SUBSTATIONS][site] = {
+            SUB_TYPE: sub_type,
+            LAND_CABLE_TYPE: land_cable_type,
+        }
+        self._update_construction(added=self._substation_terms(site))
+        self.context[site] = {
+            NB_TURBINES: 0,
+            CABLE_RATING: None,
+            OTHER_SUB_ID: None,
+        }
+        self._update_substation(site)
+        # Without turbines, it does not curtail in the failure cases of the other substations
+        self._update_cases({site})
+        return self.cost()
+
+    def close_site(self, site):
+        """Removes the substation built on site, and its substation-substation cable if any
+        No turbine must be linked to it anymore.
+        :param site: id of the site
+        :return: the new total cost"""
+        self._check_built(site)
+        if self.context[site][NB_TURBINES]:
+            raise InstanceError(
+                [f"The substation {site} cannot be removed, turbines are still linked to it"]
+            )
+        if site in self.solution[SUBSTATION_SUBSTATION_CABLES]:
+            self.remove_cable(site)
+        self._update_construction(self._substation_terms(site))
+        del self.solution[SUBSTATIONS][site]
+        del self.context[site]
+        del self.case_costs[site]
+        self._update_cases(())
+        return self.cost()
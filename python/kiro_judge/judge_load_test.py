@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from .loader import load_json
+import argparse
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+
+def post(url, payload):
+    """Sends one scoring request
+    :return: the latency in seconds and the http status"""
+    request = urllib.request.Request(
+        url, data=payload, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        status = err.code
+    return time.perf_counter() - start, status
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def load_test(url, instance_path, solution_path, requests, concurrency):
+    """Sends the same solution many times to a running judge_server
+    :param url: the url of the /score endpoint
+    :param instance_path: file path to the instance, as seen by the server
+    :param solution_path: file path to the solution sent
+    :param requests: the total number of requests
+    :param concurrency: the number of requests in flight at once
+    :return: a dictionnary with the throughput, p50 and p99 latencies (ms) and the count of each status
+    """
+    payload = json.dumps(
+        {"instance": os.path.abspath(instance_path), "solution": load_json(solution_path)}
+    ).encode()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: post(url, payload), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p99_ms": 1000 * percentile(latencies, 99),
+        "statuses": statuses,
+    }
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Load test of a running judge_server."
+    )
+    python_parser.add_argument("--url", dest="url", default="http://127.0.0.1:8023/score")
+    python_parser.add_argument("-i", "--instance", dest="instance_path", required=True)
+    python_parser.add_argument("-s", "--solution", dest="solution_path", required=True)
+    python_parser.add_argument("-n", "--requests", dest="requests", type=int, default=200)
+    python_parser.add_argument("-c", "--concurrency", dest="concurrency", type=int, default=8)
+
+    args = python_parser.parse_args()
+
+    report = load_test(
+        args.url, args.instance_path, args.solution_path, args.requests, args.concurrency
+    )
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,275 @@
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .converter import convert_instance
+from .cost import construction_cost, operational_cost_engine, PYTHON_ENGINE, ENGINES
+from .errors import InstanceError
+from .rteparser import error_message, score_solution
+from .score_cache import ScoreCache, content_hash
+from .solution_pipeline import check_and_convert_solution
+from .constraints import check_constraints
+import argparse
+import json
+import os
+import threading
+
+# Long-running judge : POST /score with the json body {"instance": <path>, "solution": <solution>}
+# answers {"score": <score>, "errors": null} or {"score": -1, "errors": <message>},
+# with the same score and messages as rteparser.parser.
+# GET /stats answers the hit and miss counts of the score cache.
+# The instance path is relative to the instances directory of the server (--instances-dir,
+# by default the instances/input directory of the repository, wherever the server is run from),
+# and an instance outside of it is refused (403), so that clients cannot read any file of the server.
+# The solutions are scored on a pool of threads, which share the caches. The pure python engine holds the GIL,
+# so the threads overlap the reading and the checking of the requests but not the scoring itself :
+# run several servers for more throughput. A thread cannot be interrupted either, so the timeout only
+# bounds the time a client waits : a scoring still running goes on and keeps its slot until it ends.
+
+
+def instance_file(instances_dir, instance_path):
+    """Resolves the path of an instance sent by a client
+    :param instances_dir: the directory the server reads the instances from
+    :param instance_path: the path sent, relative to instances_dir or absolute
+    :return: the real path of the instance, None if it is not in instances_dir (symbolic links resolved)
+    """
+    root = os.path.realpath(instances_dir)
+    path = os.path.realpath(os.path.join(root, instance_path))
+    return path if os.path.commonpath([root, path]) == root else None
+
+
+class InstanceCache:
+    """LRU cache of converted instances, keyed by path. The file is read and hashed again only when
+    its modification time or size changed, so that an instance modified on disk is converted again"""
+
+    def __init__(self, size):
+        """:param size: the maximum number of instances kept"""
+        self.size = size
+        # path: ((modification time, size), hash of the content, converted instance)
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, instance_path):
+        """
+        :param instance_path: file path to the instance
+        :return: the converted instance, and the hash of its file (see score_cache.content_hash)
+        :raises OSError, InstanceError: like loader.load_json and convert_instance
+        """
+        stat = os.stat(instance_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._instances.get(instance_path)
+            if entry is not None and entry[0] == stamp:
+                self._instances.move_to_end(instance_path)
+                return entry[2], entry[1]
+        with open(instance_path, "rb") as file:
+            content = file.read()
+        instance_hash = content_hash(content)
+        try:
+            instance = convert_instance(json.loads(content))
+        except json.decoder.JSONDecodeError as err:
+            raise InstanceError([f"Error: bad JSON formatting : {err}"])
+        with self._lock:
+            self._instances[instance_path] = (stamp, instance_hash, instance)
+            self._instances.move_to_end(instance_path)
+            while len(self._instances) > self.size:
+                self._instances.popitem(last=False)
+        return instance, instance_hash
+
+
+def judge(cache, instance_path, raw_solution, engine, score_cache=None):
+    """Scores a solution, returning what the server answers
+    :param score_cache: a score_cache.ScoreCache, consulted before the solution is checked,
+    then once it is checked, if given
+    :return: a dictionnary with the keys "score" and "errors", see above"""
+    try:
+        instance, instance_hash = cache.get(instance_path)
+        if score_cache is None:
+            return {"score": score_solution(instance, raw_solution, engine), "errors": None}
+        # Same as score_solution, the costs being looked up before the checks and before they are computed
+        payload_key, costs = score_cache.lookup_payload(instance_hash, engine, raw_solution)
+        if costs is None:
+            solution = check_and_convert_solution(instance, raw_solution)
+            check_constraints(solution, instance)
+            keys, costs = score_cache.lookup_solution(instance_hash, engine, solution, payload_key)
+        if costs is None:
+            costs = (
+                construction_cost(instance, solution),
+                operational_cost_engine(engine)(instance, solution),
+            )
+            score_cache.put(keys, *costs)
+        const_cost, oper_cost = costs
+        return {"score": oper_cost + const_cost, "errors": None}
+    except FileNotFoundError:
+        return {"score": -1, "errors": "Error: File not found, parsing aborted"}
+    except OSError as err:
+        # A directory, or a file the server cannot read
+        return {"score": -1, "errors": f"Error: cannot read the instance ({err.strerror}), parsing aborted"}
+    except InstanceError as errors:
+        return {"score": -1, "errors": error_message(errors)}
+
+
+class JudgeServer(ThreadingHTTPServer):
+    """HTTP server scoring the solutions on a pool of threads.
+    At most workers + queue_size requests are accepted at once, the others are answered 503,
+    and a request waiting more than timeout seconds is answered 504 (see above, the scoring is not stopped).
+    Only the instances of instances_dir are read."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        cache_size,
+        workers,
+        queue_size,
+        timeout,
+        engine,
+        instances_dir,
+        score_cache_size=0,
+        score_cache_path=None,
+    ):
+        super().__init__(address, JudgeRequestHandler)
+        self.cache = InstanceCache(cache_size)
+        self.score_cache = None
+        if score_cache_size > 0:
+            self.score_cache = ScoreCache(score_cache_size, score_cache_path)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # The scorings not finished yet, the queued ones being cancelled when the server closes
+        self.futures = set()
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+        self.engine = engine
+        self.instances_dir = instances_dir
+
+    def server_close(self):
+        super().server_close()
+        if self.score_cache is not None:
+            self.score_cache.close()
+        # As shutdown(cancel_futures=True), which needs python 3.9
+        for future in list(self.futures):
+            future.cancel()
+        self.executor.shutdown(wait=False)
+
+
+class JudgeRequestHandler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path != "/stats":
+            self.send_json(404, {"errors": f"Unknown path {self.path}"})
+            return
+        score_cache = self.server.score_cache
+        self.send_json(
+            200, {"score_cache": score_cache.stats() if score_cache is not None else None}
+        )
+
+    def do_POST(self):
+        if self.path != "/score":
+            self.send_json(404, {"score": -1, "errors": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            instance_path, raw_solution = body["instance"], body["solution"]
+            instance_path = instance_file(self.server.instances_dir, instance_path)
+        except (ValueError, KeyError, TypeError):
+            self.send_json(
+                400,
+                {"score": -1, "errors": 'Expected a json body {"instance": ..., "solution": ...}'},
+            )
+            return
+        if instance_path is None:
+            self.send_json(
+                403, {"score": -1, "errors": "Error: the instance is not in the instances directory"}
+            )
+            return
+
+        server = self.server
+        if not server.slots.acquire(blocking=False):
+            self.send_json(503, {"score": -1, "errors": "Error: the judge is busy"})
+            return
+        future = server.executor.submit(
+            judge,
+            server.cache,
+            instance_path,
+            raw_solution,
+            server.engine,
+            server.score_cache,
+        )
+        server.futures.add(future)
+        # The slot is freed when the scoring really ends, even after a timeout
+        future.add_done_callback(lambda _: server.slots.release())
+        future.add_done_callback(server.futures.discard)
+        try:
+            self.send_json(200, future.result(timeout=server.timeout))
+        except TimeoutError:
+            # Only a request still queued is cancelled, a running scoring cannot be interrupted
+            future.cancel()
+            self.send_json(504, {"score": -1, "errors": "Error: scoring timed out"})
+        except CancelledError:
+            self.send_json(503, {"score": -1, "errors": "Error: the judge is closing"})
+        except Exception as err:
+            # judge answers the errors of the instance and the solution, anything else is a bug of the judge
+            self.send_json(500, {"score": -1, "errors": f"Error: internal error of the judge ({err!r})"})
+
+    def log_message(self, format, *args):
+        # Do not log every request
+        pass
+
+
+if __name__ == "__main__":
+    python_parser = argparse.ArgumentParser(
+        description="Long-running judge of the Rte KIRO Problem, scoring solutions sent over HTTP."
+    )
+    python_parser.add_argument("--host", dest="host", default="127.0.0.1")
+    python_parser.add_argument("-p", "--port", dest="port", type=int, default=8023)
+    python_parser.add_argument("--cache-size", dest="cache_size", type=int, default=16)
+    python_parser.add_argument("-w", "--workers", dest="workers", type=int, default=4)
+    python_parser.add_argument("--queue-size", dest="queue_size", type=int, default=64)
+    python_parser.add_argument(
+        "-t", "--timeout", dest="timeout", type=float, default=60,
+        help="in seconds, bounds the wait of a client but does not stop the scoring"
+    )
+    python_parser.add_argument(
+        "-e", "--engine", dest="engine", choices=ENGINES, default=PYTHON_ENGINE
+    )
+    python_parser.add_argument(
+        "--instances-dir", dest="instances_dir",
+        default=os.path.join(os.path.dirname(__file__), "..", "..", "instances", "input"),
+        help="directory of the instances the clients can score solutions of",
+    )
+    python_parser.add_argument(
+        "--score-cache-size", dest="score_cache_size", type=int, default=1024,
+        help="number of scores kept in memory, see score_cache.py, 0 to disable",
+    )
+    python_parser.add_argument(
+        "--score-cache-db", dest="score_cache_path", default=None,
+        help="SQLite file keeping the scores between runs",
+    )
+
+    args = python_parser.parse_args()
+
+    server = JudgeServer(
+        (args.host, args.port),
+        args.cache_size,
+        args.workers,
+        args.queue_size,
+        args.timeout,
+        args.engine,
+        args.instances_dir,
+        args.score_cache_size,
+        args.score_cache_path,
+    )
+    print(f"Judge listening on http://{args.host}:{server.server_port}/score")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
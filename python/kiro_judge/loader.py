@@ -1,5 +1,5 @@
 import json
-from errors import InstanceError
+from .errors import InstanceError
 
 
 def load_json(file_path):
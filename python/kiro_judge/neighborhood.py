@@ -0,0 +1,174 @@
+import numpy as np
+from .constants import *
+from .cost import dist, evaluation_context, curtailing_parameters
+from .vectorized_cost import context_arrays, cost_of_curtailing_array, scenario_arrays
+
+# Change of cost of every single-turbine reassignment of a solution, all computed at once.
+# Moving a turbine from the substation a to the substation s only changes its own cable and the
+# number of turbines of a and s. Under each scenario, the curtailing of a failure case f is
+# X + d[f], where X is the total curtailing of the working substations (the no-failure vector)
+# and d[f] the correction of the failed substation and of its partner (see cost.scenario_curtailings) :
+# the move changes X, and d only for the cases f involving a or s (at most 4 of them).
+# The expected cost sum_f p_f c^c(X + d[f]) is a piecewise-linear function of X, read from prefix sums
+# of the cases sorted by d, so that every move costs O(log nb_substations) per scenario.
+# The no-failure curtailing only depends on the total power, which a move does not change.
+#
+# As for sorted_cost.py, the deltas match the difference of the costs given by cost.cost
+# to both solutions up to floating point rounding.
+
+
+def failure_corrections(load, capacity, cable_rating, partner):
+    """Computes, for every scenario and every failure case, the correction d such that
+    the curtailing of the case is the total curtailing of the working substations plus d
+    :param load: the (nb_scenarios, nb_substations) array of the power received by each substation
+    :param capacity, cable_rating, partner: see vectorized_cost.context_arrays
+    :return: the (nb_scenarios, nb_substations) array of the corrections d
+    """
+    positions = np.arange(len(partner))
+    linked = (partner >= 0) & (partner != positions)
+    other = np.where(partner >= 0, partner, positions)
+    own_curt = np.maximum(0, load - capacity)
+    failed_curt = np.maximum(0, load - cable_rating)
+    other_curt = np.maximum(0, load[..., other] + np.minimum(load, cable_rating) - capacity[other])
+    return failed_curt - own_curt + np.where(linked, other_curt - own_curt[..., other], 0)
+
+
+def hinge_sums(corrections, weights, queries):
+    """Computes, for every scenario, sum_f weights[f] * max(0, q + corrections[f]) for many values of q
+    :param corrections: the (nb_scenarios, nb_cases) array of the corrections d of each case
+    :param weights: the array of the weights of the cases
+    :param queries: the (nb_scenarios, nb_queries) array of the values q
+    :return: the (nb_scenarios, nb_queries) array of the sums
+    """
+    nb_cases = corrections.shape[1]
+    # The case f counts from q > -d[f] onwards : sorted by breakpoint -d[f], the sum for q
+    # is q * (sum of the weights) + (sum of weights * d) over the k first cases, whose breakpoint is below q
+    order = np.argsort(-corrections, axis=1)
+    corrections = np.take_along_axis(corrections, order, axis=1)
+    weights = weights[order]
+    zeros = np.zeros((len(corrections), 1))
+    cum_weight = np.concatenate([zeros, np.cumsum(weights, axis=1)], axis=1)
+    cum_weight_correction = np.concatenate(
+        [zeros, np.cumsum(weights * corrections, axis=1)], axis=1
+    )
+    # k for every query, by sorting the queries among the breakpoints of their scenario
+    merged = np.argsort(np.concatenate([-corrections, queries], axis=1), axis=1, kind="stable")
+    ranks = np.empty_like(merged)
+    np.put_along_axis(ranks, merged, np.cumsum(merged < nb_cases, axis=1), axis=1)
+    k = ranks[:, nb_cases:]
+    return queries * np.take_along_axis(cum_weight, k, axis=1) + np.take_along_axis(
+        cum_weight_correction, k, axis=1
+    )
+
+
+def move_operational_deltas(instance, context, scenarios=None):
+    """Computes the change of the operational cost of the solution when one turbine is moved
+    from any substation to any other
+    :param instance: the instance addressed by the solution
+    :param context: the evaluation context of the solution, see cost.evaluation_context
+    :param scenarios: the scenarios, see vectorized_cost.scenario_arrays
+    :return: a (nb_substations, nb_substations) array, whose [a, s] element is the change of the
+    operational cost when a turbine of the a-th substation of the context is linked to the s-th one instead
+    (0 if a == s, nan if the a-th substation has no turbine)
+    """
+    if scenarios is None:
+        scenarios = scenario_arrays(instance)
+    powers, probabilities, positions = scenarios
+    # Probability of each distinct power
+    probabilities = np.bincount(positions, weights=probabilities, minlength=len(powers))
+    nb_turbines, capacity, prob_fail, cable_rating, partner = context_arrays(context)
+    linear_cost, pena_cost, max_curtailing = curtailing_parameters(instance)
+    nb_subs = len(nb_turbines)
+    positions = np.arange(nb_subs)
+    linked = (partner >= 0) & (partner != positions)
+    other = np.where(partner >= 0, partner, positions)
+
+    load = powers[:, None] * nb_turbines
+    own_curt = np.maximum(0, load - capacity)
+    total_curt = own_curt.sum(axis=1)
+    corrections = failure_corrections(load, capacity, cable_rating, partner)
+    # Change of the curtailing of each substation when it loses or receives a turbine
+    lost = np.maximum(0, load - powers[:, None] - capacity) - own_curt
+    received = np.maximum(0, load + powers[:, None] - capacity) - own_curt
+    sum_prob_fail = prob_fail.sum()
+    sum_prob_correction = corrections @ prob_fail
+
+    def all_cases_cost(total):
+        # sum_f p_f c^c(total + d[f]) for every column of total
+        return linear_cost * (total * sum_prob_fail + sum_prob_correction[:, None]) + pena_cost * (
+            hinge_sums(corrections, prob_fail, total - max_curtailing)
+        )
+
+    current = all_cases_cost(total_curt[:, None])
+    deltas = np.full((nb_subs, nb_subs), np.nan)
+    for source in np.flatnonzero(nb_turbines):
+        # One column per destination s
+        moved = nb_turbines - (positions == source)
+        total = total_curt[:, None] + lost[:, [source]] + received
+        cost = all_cases_cost(total) - current
+
+        def moved_count(sub):
+            return moved[sub] + (sub == positions)
+
+        def replace_case(case, mask):
+            # Replaces the cost of the case in the sum by its cost after the move
+            case_load = powers[:, None] * moved_count(case)
+            other_load = powers[:, None] * moved_count(other[case])
+            case_capacity, case_rating = capacity[case], cable_rating[case]
+            other_capacity = capacity[other[case]]
+            curtailing = (
+                total
+                - np.maximum(0, case_load - case_capacity)
+                + np.maximum(0, case_load - case_rating)
+                + np.where(
+                    linked[case],
+                    np.maximum(0, other_load + np.minimum(case_load, case_rating) - other_capacity)
+                    - np.maximum(0, other_load - other_capacity),
+                    0,
+                )
+            )
+            change = cost_of_curtailing_array(instance, curtailing) - cost_of_curtailing_array(
+                instance, total + corrections[:, case].reshape(len(powers), -1)
+            )
+            return np.where(mask, prob_fail[case] * change, 0)
+
+        # The cases of a, of s, and of their partners, each counted once
+        cost += replace_case(source, True)
+        cost += replace_case(positions, True)
+        cost += replace_case(other[source], linked[source] & (other[source] != positions))
+        cost += replace_case(other, linked & (other != source))
+        deltas[source] = probabilities @ cost
+        deltas[source, source] = 0
+    return deltas
+
+
+def turbine_move_deltas(instance, solution, context=None):
+    """Scores every single-turbine reassignment of a solution at once
+    :param instance: the converted instance addressed by the solution
+    :param solution: the converted solution, assumed to be valid
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :return: deltas, turbine_ids, site_ids: deltas[i, j] is the change of the total cost when the turbine
+    turbine_ids[i] is linked to the substation built on site_ids[j] (0 for its current substation),
+    turbines in the order of their ids and substations in the order of the context
+    """
+    if context is None:
+        context = evaluation_context(instance, solution)
+    turbine_ids = sorted(solution[TURBINES])
+    site_ids = list(context.keys())
+    position = {id: j for j, id in enumerate(site_ids)}
+    sources = [position[solution[TURBINES][id][SUBSTATION_ID]] for id in turbine_ids]
+    operational = move_operational_deltas(instance, context)
+
+    # Only the cable of the turbine changes in the construction cost
+    var_cost = instance[GEN_PARAMETERS][VAR_COST_CABLE]
+    sub_positions = [
+        (instance[SUBSTATION_LOCATION][id][X], instance[SUBSTATION_LOCATION][id][Y])
+        for id in site_ids
+    ]
+    construction = np.empty((len(turbine_ids), len(site_ids)))
+    for i, id in enumerate(turbine_ids):
+        turb_pos = (instance[WIND_TURBINES][id][X], instance[WIND_TURBINES][id][Y])
+        cables = [var_cost * dist(sub_pos, turb_pos) for sub_pos in sub_positions]
+        construction[i] = np.array(cables) - cables[sources[i]]
+
+    return operational[sources] + construction, turbine_ids, site_ids
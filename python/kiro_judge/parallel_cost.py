@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+from .cost import (
+    evaluation_context,
+    exact_partials,
+    no_failure_probability,
+    scenario_groups,
+    weighted_scenario_costs,
+)
+from math import fsum
+
+# Opt-in parallel evaluation of the operational cost, see cost.operational_cost(workers=...).
+# The scenarios, merged by power (see cost.scenario_groups), are split in contiguous chunks, evaluated by a pool of processes that each receive
+# the instance and the evaluation context once, through the initializer of the pool.
+# Each chunk returns the exact partials of its sum (see cost.exact_partials) instead of a rounded sum,
+# and math.fsum adds them up : the result is the correctly rounded sum of prob * cost of every scenario,
+# the same whatever the number of workers and of chunks.
+
+# State of a worker, set by init_worker
+_instance = None
+_context = None
+_no_fail_proba = None
+_groups = None
+
+
+def init_worker(instance, context):
+    global _instance, _context, _no_fail_proba, _groups
+    _instance = instance
+    _context = context
+    _no_fail_proba = no_failure_probability(context)
+    _groups = scenario_groups(instance)
+
+
+def chunk_partials(chunk):
+    """:param chunk: the (start, stop) indices of the distinct powers evaluated
+    :return: the exact partials of the sum of prob * cost of the scenarios of the chunk"""
+    start, stop = chunk
+    return exact_partials(
+        weighted_scenario_costs(_instance, _context, _no_fail_proba, _groups[start:stop])
+    )
+
+
+def scenario_chunks(nb_scenarios, nb_chunks):
+    """:return: nb_chunks contiguous (start, stop) ranges of about the same size covering the scenarios,
+    without the empty ones"""
+    nb_chunks = max(1, min(nb_chunks, nb_scenarios))
+    bounds = [nb_scenarios * i // nb_chunks for i in range(nb_chunks + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(nb_chunks) if bounds[i] < bounds[i + 1]]
+
+
+def parallel_operational_cost(instance, solution, workers, context=None, chunks_per_worker=4):
+    """
+    Computes the operational cost with the scenarios split between processes, see above
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param workers: the number of processes, 1 evaluating the chunks in this process
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :param chunks_per_worker: the number of chunks given to each worker, to balance the load
+    :return: the operational cost of the solution
+    """
+    global _instance, _context, _no_fail_proba, _groups
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, not {workers}")
+    if context is None:
+        context = evaluation_context(instance, solution)
+    # Raises in this process rather than in the workers
+    no_failure_probability(context)
+    chunks = scenario_chunks(len(scenario_groups(instance)), workers * chunks_per_worker)
+    if workers == 1:
+        init_worker(instance, context)
+        try:
+            partials = [chunk_partials(chunk) for chunk in chunks]
+        finally:
+            _instance = _context = _no_fail_proba = _groups = None
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(instance, context)
+        ) as executor:
+            partials = list(executor.map(chunk_partials, chunks))
+    return fsum(value for chunk in partials for value in chunk)
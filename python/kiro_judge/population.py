@@ -0,0 +1,150 @@
+import numpy as np
+from .constants import *
+from math import fsum
+from .compiled_instance import compile_instance
+from .vectorized_cost import operational_costs, scenario_arrays
+
+# Scores a whole population of solutions of the same instance in one call, for the solvers
+# which evaluate many candidates per generation. The solutions are encoded as integer arrays
+# over the dense positions of a CompiledInstance (the element of id i at position i - 1) :
+#   turbine_sites[k, t]: the site the turbine t is linked to in the k-th solution
+#   sub_types[k, s]: the type of the substation built on the site s, -1 if the site is not built
+#   land_cables[k, s]: the type of its land cable (ignored if the site is not built)
+#   partners[k, s]: the other end of the substation-substation cable of s, -1 if none,
+#   given from both ends as the converter does
+#   cable_types[k, s]: the type of this cable (ignored if there is none)
+# Every site is kept in the arrays, unbuilt sites having no turbine, capacity or probability of failure,
+# so that the whole population is evaluated by the numpy engine over (solutions, scenarios, sites) arrays.
+# An unbuilt site only adds zeros to the sums, and the costs are exactly the ones given by cost.cost.
+
+# Maximal number of (solution, scenario, site) elements evaluated in one batch
+BATCH_ELEMENTS = 1 << 21
+
+
+def encode_population(instance, solutions):
+    """Encodes converted solutions as the arrays of score_population
+    :param instance: the instance addressed by the solutions, converted or compiled
+    :param solutions: the list of the converted solutions, assumed to be valid
+    :return: turbine_sites, sub_types, land_cables, partners, cable_types: the (nb_solutions, nb_turbines)
+    and (nb_solutions, nb_sites) integer arrays describing the solutions
+    """
+    if isinstance(instance, dict):
+        nb_sites, nb_turbines = len(instance[SUBSTATION_LOCATION]), len(instance[WIND_TURBINES])
+    else:
+        nb_sites = instance.list_size(SUBSTATION_LOCATION)
+        nb_turbines = instance.list_size(WIND_TURBINES)
+    shape = (len(solutions), nb_sites)
+    turbine_sites = np.zeros((len(solutions), nb_turbines), dtype=np.intp)
+    sub_types = np.full(shape, -1, dtype=np.intp)
+    land_cables = np.full(shape, -1, dtype=np.intp)
+    partners = np.full(shape, -1, dtype=np.intp)
+    cable_types = np.full(shape, -1, dtype=np.intp)
+    for k, solution in enumerate(solutions):
+        for id, turbine in solution[TURBINES].items():
+            turbine_sites[k, id - 1] = turbine[SUBSTATION_ID] - 1
+        for id, substation in solution[SUBSTATIONS].items():
+            sub_types[k, id - 1] = substation[SUB_TYPE] - 1
+            land_cables[k, id - 1] = substation[LAND_CABLE_TYPE] - 1
+        for id, cable in solution[SUBSTATION_SUBSTATION_CABLES].items():
+            partners[k, id - 1] = cable[OTHER_SUB_ID] - 1
+            cable_types[k, id - 1] = cable[CABLE_TYPE_SUBSUB] - 1
+    return turbine_sites, sub_types, land_cables, partners, cable_types
+
+
+def population_construction_costs(instance, turbine_sites, sub_types, land_cables, partners, cable_types):
+    """Same as cost.construction_cost for every solution of a population, with the same terms and fsum
+    :param instance: the CompiledInstance addressed by the solutions
+    :param turbine_sites, sub_types, land_cables, partners, cable_types: the solutions, see encode_population
+    :return: the array of the construction costs of the solutions
+    """
+    built = sub_types >= 0
+    sites = np.arange(sub_types.shape[1])
+    # Each cable is counted from its end with the lowest id
+    counted = (partners >= 0) & (partners >= sites)
+    other = np.where(counted, partners, sites)
+    terms = [
+        np.where(built, instance.sub_cost[sub_types], 0),
+        np.where(built, instance.land_fix_cost[land_cables], 0),
+        np.where(built, instance.land_var_cost[land_cables] * instance.site_land_dist, 0),
+        np.full(turbine_sites.shape, instance.fixed_cost_cable),
+        instance.variable_cost_cable
+        * instance.turbine_site_dist(np.arange(turbine_sites.shape[1]), turbine_sites),
+        np.where(counted, instance.subsub_fix_cost[cable_types], 0),
+        np.where(
+            counted, instance.subsub_var_cost[cable_types] * instance.site_site_dist[sites, other], 0
+        ),
+    ]
+    return np.array([fsum(row) for row in np.concatenate(terms, axis=1).tolist()])
+
+
+def population_operational_costs(instance, turbine_sites, sub_types, land_cables, partners, cable_types):
+    """Same as cost.operational_cost for every solution of a population, with the numpy engine
+    :param instance: the CompiledInstance addressed by the solutions
+    :param turbine_sites, sub_types, land_cables, partners, cable_types: the solutions, see encode_population
+    :return: the array of the operational costs of the solutions
+    """
+    nb_solutions, nb_sites = sub_types.shape
+    built = sub_types >= 0
+    # Arrays of the evaluation context of every solution, see vectorized_cost.context_arrays
+    rows = np.arange(nb_solutions)[:, None] * nb_sites
+    nb_turbines = np.bincount(
+        (turbine_sites + rows).ravel(), minlength=nb_solutions * nb_sites
+    ).reshape(nb_solutions, nb_sites).astype(float)
+    capacity = np.where(
+        built, np.minimum(instance.sub_rating[sub_types], instance.land_rating[land_cables]), 0
+    )
+    prob_fail = np.where(
+        built, instance.sub_prob_fail[sub_types] + instance.land_prob_fail[land_cables], 0
+    )
+    cable_rating = np.where(partners >= 0, instance.subsub_rating[cable_types], 0)
+    # Same as cost.no_failure_probability
+    no_fail_proba = np.array([max(0, 1 - fsum(row)) for row in prob_fail.tolist()])
+
+    # Only the built sites are evaluated : they are moved first, in the order of their ids,
+    # and the arrays are cut after the largest number of built sites of the population
+    order = np.argsort(~built, axis=1, kind="stable")
+    position = np.empty_like(order)
+    np.put_along_axis(position, order, np.arange(nb_sites)[None, :], axis=1)
+    partners = np.where(
+        partners >= 0, np.take_along_axis(position, np.maximum(partners, 0), axis=1), -1
+    )
+    order = order[:, : max(1, built.sum(axis=1).max())]
+    nb_turbines, capacity, prob_fail, cable_rating, partners = (
+        np.take_along_axis(array, order, axis=1)
+        for array in (nb_turbines, capacity, prob_fail, cable_rating, partners)
+    )
+    nb_sites = order.shape[1]
+
+    scenarios = scenario_arrays(instance)
+    batch = max(1, BATCH_ELEMENTS // (len(scenarios[0]) * nb_sites))
+    costs = np.empty(nb_solutions)
+    for start in range(0, nb_solutions, batch):
+        part = slice(start, start + batch)
+        costs[part] = operational_costs(
+            instance,
+            nb_turbines[part],
+            capacity[part],
+            prob_fail[part],
+            cable_rating[part],
+            partners[part],
+            no_fail_proba[part],
+            scenarios,
+        )
+    return costs
+
+
+def score_population(instance, turbine_sites, sub_types, land_cables, partners, cable_types):
+    """Scores many solutions of the same instance at once
+    :param instance: the instance addressed by the solutions, converted or compiled
+    (a converted instance is compiled at each call, compile it once to score several populations)
+    :param turbine_sites, sub_types, land_cables, partners, cable_types: the solutions, see encode_population,
+    assumed to be valid
+    :return: the array of the total costs of the solutions, the same as cost.cost gives to each of them
+    """
+    if isinstance(instance, dict):
+        instance = compile_instance(instance)
+    solutions = (turbine_sites, sub_types, land_cables, partners, cable_types)
+    # Same sum as cost.cost
+    return population_operational_costs(instance, *solutions) + population_construction_costs(
+        instance, *solutions
+    )
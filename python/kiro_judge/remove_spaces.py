@@ -30,7 +30,7 @@ def clean_keys(raw_data):
 
 
 if __name__ == "__main__":
-    import loader
+    from . import loader
 
     data1 = loader.load_json("instances/input/tiny.json")
     data2 = loader.load_json("instances/input/tiny3.json")
@@ -0,0 +1,70 @@
+from .errors import FILE_NOT_FOUND
+import json
+
+# Result of rteparser.parser : the score and its breakdown, or the errors found.
+
+
+class JudgeResult:
+    """Score of a solution with its breakdown, or the errors that made it invalid"""
+
+    __slots__ = (
+        "construction_cost",
+        "operational_cost",
+        "scenario_costs",  # prob(scenario) * cost(scenario), in the order of the scenarios
+        "failure_case_costs",  # Expected cost of the failure of each built substation
+        "no_failure_cost",  # Expected cost of the no-failure case
+        "errors",  # List of {"code": one of the codes of errors.py, "message": ...}
+        "timings",  # The timings.Timings of the parsing, if asked for
+    )
+
+    def __init__(self, timings=None):
+        self.construction_cost = None
+        self.operational_cost = None
+        self.scenario_costs = None
+        self.failure_case_costs = None
+        self.no_failure_cost = None
+        self.errors = []
+        self.timings = timings
+
+    def add_errors(self, code, messages):
+        """:param messages: the list of messages of an error, all with the same code"""
+        self.errors.extend({"code": code, "message": message} for message in messages)
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    @property
+    def score(self):
+        """:return: the total cost of the solution, -1 if it is not valid"""
+        if not self.valid:
+            return -1
+        return self.operational_cost + self.construction_cost
+
+    def message(self):
+        """:return: the error message, as rteparser.parser used to return it"""
+        if self.errors[0]["code"] == FILE_NOT_FOUND:
+            return self.errors[0]["message"]
+        message = "Error: instance is not valid, traceback list for information:\n"
+        for error in self.errors:
+            message += error["message"]
+            message += "\n"
+        return message
+
+    def to_dict(self):
+        """:return: the result as a dictionnary of json types"""
+        result = {
+            "score": self.score,
+            "construction_cost": self.construction_cost,
+            "operational_cost": self.operational_cost,
+            "scenario_costs": self.scenario_costs,
+            "failure_case_costs": self.failure_case_costs,
+            "no_failure_cost": self.no_failure_cost,
+            "errors": self.errors,
+        }
+        if self.timings is not None:
+            result["timings"] = self.timings.to_dict()
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
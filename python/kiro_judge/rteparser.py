@@ -0,0 +1,232 @@
+from json import decoder
+from .converter import convert_instance
+from .loader import load_json
+from .solution_pipeline import check_and_convert_solution
+from .constraints import check_constraints
+from .cost import (
+    cost,
+    construction_cost,
+    operational_cost_breakdown,
+    PYTHON_ENGINE,
+)
+from .errors import InstanceError, FILE_NOT_FOUND, BAD_JSON, INVALID_SOLUTION, INVALID_INSTANCE
+from .result import JudgeResult
+from .timings import (
+    Timings,
+    LOAD_INSTANCE,
+    LOAD_SOLUTION,
+    CHECK_AND_CONVERT_SOLUTION,
+    CONVERT_INSTANCE,
+    CHECK_CONSTRAINTS,
+    SCORE_CACHE,
+    CONSTRUCTION_COST,
+    OPERATIONAL_COST,
+)
+import argparse
+import json
+import sys
+
+# Only what scoring one solution needs is imported here : the score cache, the profiler
+# and the engines other than the python one are imported when asked for (see benchmark/startup.py).
+
+
+def error_message(errors):
+    """
+    Formats the problems of an InstanceError the way the judge reports them
+    :param errors: the InstanceError raised
+    :return: the error message
+    """
+    message = "Error: instance is not valid, traceback list for information:\n"
+    for i in errors.list:
+        message += i
+        message += "\n"
+    return message
+
+
+def score_solution(converted_instance, raw_solution, engine=PYTHON_ENGINE):
+    """
+    Checks and scores a solution against an instance that was already loaded and converted
+    :param converted_instance: the instance, as returned by convert_instance
+    :param raw_solution: the candidate's solution, as loaded from its json file
+    :param engine: the engine used for the operational cost, see cost.ENGINES
+    :return: the score
+    :raises InstanceError with details in case it spots an error
+    """
+    # The checks only need the size of the lists of the instance, which the conversion keeps
+    converted_solution = check_and_convert_solution(converted_instance, raw_solution)
+    check_constraints(converted_solution, converted_instance)
+    return cost(converted_instance, converted_solution, engine)
+
+
+def parser(instance_path, solution_path, timings=None, cache=None):
+    """
+    Global function, does everything
+    :param instance_path: file path to the instance
+    :param solution_path: file path to the candidate's solution
+    :param timings: a timings.Timings, filled with the time of each stage and the counters if given
+    :param cache: a score_cache.ScoreCache, consulted before validating and before costing if given
+    :return: the result.JudgeResult, with the cost breakdown if the solution is valid, else the errors
+    (the breakdown is not kept in the cache, a score found in it comes without breakdown)
+    """
+    result = JudgeResult(timings)
+    if timings is None:
+        timings = Timings()
+
+    # The code of the errors raised by the current stage
+    code = BAD_JSON
+    try:
+        if cache is not None:
+            from .score_cache import file_hash
+
+            with timings.stage(SCORE_CACHE):
+                instance_hash = file_hash(instance_path)
+                file_key, cached = cache.lookup_file(instance_hash, PYTHON_ENGINE, solution_path)
+            if cached is not None:
+                result.construction_cost, result.operational_cost = cached
+                return result
+
+        # We import both files in variables
+        with timings.stage(LOAD_INSTANCE):
+            raw_instance = load_json(instance_path)
+        with timings.stage(LOAD_SOLUTION):
+            raw_solution = load_json(solution_path)
+
+        # We check the validity of the solution's format, and convert it in the same pass
+        code = INVALID_SOLUTION
+        with timings.stage(CHECK_AND_CONVERT_SOLUTION):
+            converted_solution = check_and_convert_solution(raw_instance, raw_solution, timings)
+
+        if cache is not None:
+            with timings.stage(SCORE_CACHE):
+                keys, cached = cache.lookup_solution(
+                    instance_hash, PYTHON_ENGINE, converted_solution, file_key
+                )
+            if cached is not None:
+                result.construction_cost, result.operational_cost = cached
+                return result
+
+        # we convert the instance in order to manipulate it more easily
+        code = INVALID_INSTANCE
+        with timings.stage(CONVERT_INSTANCE):
+            converted_instance = convert_instance(raw_instance)
+
+        # We check whether the solution verifies all constraints
+        code = INVALID_SOLUTION
+        with timings.stage(CHECK_CONSTRAINTS):
+            check_constraints(converted_solution, converted_instance)
+
+        # We calculate its cost, as cost.cost does
+        code = INVALID_INSTANCE
+        with timings.stage(CONSTRUCTION_COST):
+            result.construction_cost = construction_cost(
+                converted_instance, converted_solution, timings
+            )
+        with timings.stage(OPERATIONAL_COST):
+            (
+                result.operational_cost,
+                result.scenario_costs,
+                result.failure_case_costs,
+                result.no_failure_cost,
+            ) = operational_cost_breakdown(converted_instance, converted_solution, timings=timings)
+        if cache is not None:
+            cache.put(keys, result.construction_cost, result.operational_cost)
+
+    except FileNotFoundError:
+        result.add_errors(FILE_NOT_FOUND, ["Error: File not found, parsing aborted"])
+
+    except decoder.JSONDecodeError:
+        result.add_errors(BAD_JSON, ["Error: File is not a valid Json"])
+
+    except InstanceError as errors:
+        result.add_errors(code, errors.list)
+
+    return result
+
+
+def main(argv=None):
+    """Command line of the judge, installed as the kiro-judge console script
+    :param argv: the arguments, those of the command line if None"""
+    # The ArgumentParser method allows to create an object that will parse what is typed in the command line
+    python_parser = argparse.ArgumentParser(
+        description="Check if a solution is a valid solution of the Rte "
+        "KIRO Problem and give it a score."
+    )
+    python_parser.add_argument("-i", "--instance", dest="instance_path", default=None)
+    python_parser.add_argument("-s", "--solution", dest="solution_path", default=None)
+    python_parser.add_argument(
+        "--timings",
+        dest="timings",
+        action="store_true",
+        help="print a json report of the time of each stage and of the counters",
+    )
+    python_parser.add_argument(
+        "--json",
+        dest="json",
+        action="store_true",
+        help="print the result, with the cost breakdown or the error codes, as json",
+    )
+    python_parser.add_argument(
+        "--cache",
+        dest="cache_path",
+        default=None,
+        help="SQLite file of the score cache, see score_cache.py, no cache if not given",
+    )
+    python_parser.add_argument(
+        "--profile",
+        dest="profile_path",
+        default=None,
+        help="write a cProfile dump of the parsing to this file, to read with pstats",
+    )
+
+    args = python_parser.parse_args(argv)
+
+    solution_path = None
+    instance_path = None
+
+    if args.instance_path:
+        instance_path = args.instance_path
+    else:
+        sys.exit(1)
+
+    if args.solution_path:
+        solution_path = args.solution_path
+    else:
+        sys.exit(1)
+
+    timings = Timings() if args.timings else None
+    cache = None
+    if args.cache_path:
+        from .score_cache import ScoreCache
+
+        cache = ScoreCache(path=args.cache_path)
+    if args.profile_path:
+        import cProfile
+
+        profile = cProfile.Profile()
+        result = profile.runcall(parser, instance_path, solution_path, timings, cache)
+        profile.dump_stats(args.profile_path)
+    else:
+        result = parser(instance_path, solution_path, timings, cache)
+    if cache is not None:
+        cache.close()
+
+    if args.json:
+        # The timings, if asked for, are part of the result
+        print(result.to_json())
+        return
+
+    if result.valid:
+        print(result.score)
+    else:
+        # There have been problems. We therefore negate the score and print the problems
+        print(-1)
+        print(result.message())
+    if timings is not None:
+        report = timings.to_dict()
+        if cache is not None:
+            report["score_cache"] = cache.stats()
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+from array import array
+from collections import OrderedDict
+from .constants import *
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# Content-addressed cache of the scores of valid solutions.
+# A score is stored under two keys, both prefixed with the hash of the instance file and the engine :
+# - the hash of the bytes of the solution file (or of the canonical json of a solution sent to
+#   the judge server), looked up before anything else, so that an identical resubmission is neither
+#   validated nor costed again,
+# - the canonical hash of the converted solution, looked up once it is checked and converted,
+#   so that a solution that only differs by the order of its lists is not costed again.
+# The in-memory LRU layer can be backed by an SQLite file, shared by processes and runs,
+# whose least recently used entries are evicted above a maximum number of entries.
+# The number of entries is kept in the file itself, so that no store has to count the whole table,
+# and the eviction deletes a tenth of the entries at once, through an index on the time of last use.
+# The keys also hold CACHE_VERSION, and an SQLite file written with another version is emptied when opened,
+# so that the scores of an older judge are never served.
+
+CACHE_VERSION = 1  # To increase whenever the scores given to the same solution may change
+MEMORY = "memory"
+DISK = "disk"
+
+
+def content_hash(content):
+    """:return: the hash of the bytes of a file"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(file_path):
+    """:return: the hash of the content of a file
+    :raises FileNotFoundError if the file doesn't exist"""
+    with open(file_path, "rb") as file:
+        return content_hash(file.read())
+
+
+def solution_hash(solution):
+    """
+    Canonical hash of a converted solution, the same whatever the order of the lists of the raw solution
+    :param solution: the converted solution, already checked
+    :return: the hash
+    """
+    digest = hashlib.sha256()
+    substations = solution[SUBSTATIONS]
+    digest.update(b"substations")
+    digest.update(
+        array(
+            "q",
+            (
+                value
+                for id in sorted(substations)
+                for value in (id, substations[id][SUB_TYPE], substations[id][LAND_CABLE_TYPE])
+            ),
+        ).tobytes()
+    )
+    # The turbine ids are 1 ... N, each one exactly once
+    turbines = solution[TURBINES]
+    linked = array("q", bytes(8 * len(turbines)))
+    for id, turbine in turbines.items():
+        linked[id - 1] = turbine[SUBSTATION_ID]
+    digest.update(b"turbines")
+    digest.update(linked.tobytes())
+    cables = solution[SUBSTATION_SUBSTATION_CABLES]
+    digest.update(b"cables")
+    digest.update(
+        array(
+            "q",
+            (
+                value
+                for id in sorted(cables)
+                for value in (id, cables[id][OTHER_SUB_ID], cables[id][CABLE_TYPE_SUBSUB])
+            ),
+        ).tobytes()
+    )
+    return digest.hexdigest()
+
+
+class ScoreCache:
+    """Cache of (construction cost, operational cost), see above. Safe to share between threads."""
+
+    def __init__(self, size=1024, path=None, max_disk_entries=1000000):
+        """
+        :param size: the maximum number of entries kept in memory
+        :param path: the SQLite file of the disk layer, no disk layer if None
+        :param max_disk_entries: the maximum number of entries kept on disk, a tenth of them being evicted
+        at once when it is exceeded
+        """
+        self.size = size
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {MEMORY: 0, DISK: 0}
+        self.misses = 0
+        self._db = None
+        if path is not None:
+            # The connection is used by every thread, always under the lock
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "key TEXT PRIMARY KEY, construction REAL, operational REAL, used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS scores_used ON scores (used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS entries (count INTEGER)")
+            (version,) = self._db.execute("PRAGMA user_version").fetchone()
+            if version != CACHE_VERSION:
+                self._db.execute("DELETE FROM scores")
+                self._db.execute("DELETE FROM entries")
+                self._db.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            if self._db.execute("SELECT count FROM entries").fetchone() is None:
+                # A new file (or one written before the count was kept) : counted once
+                self._db.execute("INSERT INTO entries SELECT COUNT(*) FROM scores")
+            self._db.commit()
+
+    @staticmethod
+    def key(instance_hash, engine, solution_hash):
+        return f"{CACHE_VERSION}:{instance_hash}:{engine}:{solution_hash}"
+
+    def lookup_file(self, instance_hash, engine, solution_path):
+        """First lookup, before the solution is even loaded
+        :return: file_key, costs: the key of the content of the solution file,
+        and its (construction cost, operational cost), None if unknown"""
+        file_key = self.key(instance_hash, engine, file_hash(solution_path))
+        return file_key, self.get(file_key)
+
+    def lookup_payload(self, instance_hash, engine, raw_solution):
+        """First lookup of a solution received already loaded (by the judge server), before it is checked
+        :param raw_solution: the raw solution, as loaded from json
+        :return: payload_key, costs: as lookup_file, the key being the hash of the canonical json of the solution"""
+        payload = json.dumps(raw_solution, sort_keys=True).encode()
+        payload_key = self.key(instance_hash, engine, content_hash(payload))
+        return payload_key, self.get(payload_key)
+
+    def lookup_solution(self, instance_hash, engine, solution, file_key=None):
+        """Second lookup, once the solution is checked and converted
+        :param solution: the converted solution
+        :param file_key: the key of lookup_file or lookup_payload, if any, under which the costs found
+        are also stored
+        :return: keys, costs: the keys to store the costs under once computed,
+        and the (construction cost, operational cost) of the solution, None if unknown"""
+        keys = [self.key(instance_hash, engine, solution_hash(solution))]
+        if file_key is not None:
+            keys.append(file_key)
+        costs = self.get(keys[0])
+        if costs is not None and file_key is not None:
+            # Known under another order of the lists
+            self.put([file_key], *costs)
+        return keys, costs
+
+    def get(self, key):
+        """:return: (construction cost, operational cost) stored under key, None if there are none"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits[MEMORY] += 1
+                return self._entries[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT construction, operational FROM scores WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE scores SET used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._db.commit()
+                    self.hits[DISK] += 1
+                    self._remember(key, row)
+                    return row
+            self.misses += 1
+            return None
+
+    def put(self, keys, construction_cost, operational_cost):
+        """Stores the costs of a valid solution under each of the keys"""
+        value = (construction_cost, operational_cost)
+        with self._lock:
+            for key in keys:
+                self._remember(key, value)
+            if self._db is not None:
+                keys = set(keys)
+                now = time.time()
+                # No other process may store the same keys between the count and the insertion
+                self._db.execute("BEGIN IMMEDIATE")
+                (known,) = self._db.execute(
+                    f"SELECT COUNT(*) FROM scores WHERE key IN ({', '.join('?' * len(keys))})",
+                    tuple(keys),
+                ).fetchone()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+                    [(key, *value, now) for key in keys],
+                )
+                self._db.execute("UPDATE entries SET count = count + ?", (len(keys) - known,))
+                self._evict()
+                self._db.commit()
+
+    def _remember(self, key, value):
+        self._entries[key] = tuple(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def _evict(self):
+        """Once the disk layer holds more than max_disk_entries, deletes its least recently used entries
+        down to nine tenths of max_disk_entries"""
+        (count,) = self._db.execute("SELECT count FROM entries").fetchone()
+        if count > self.max_disk_entries:
+            kept = self.max_disk_entries - self.max_disk_entries // 10
+            deleted = self._db.execute(
+                "DELETE FROM scores WHERE key IN "
+                "(SELECT key FROM scores ORDER BY used LIMIT ?)",
+                (count - kept,),
+            ).rowcount
+            self._db.execute("UPDATE entries SET count = count - ?", (deleted,))
+
+    def stats(self):
+        """:return: the numbers of hits of each layer and of misses, and the number of entries in memory
+        (counted per lookup : a solution never seen misses both lookup_file and lookup_solution)"""
+        with self._lock:
+            lookups = self.hits[MEMORY] + self.hits[DISK] + self.misses
+            return {
+                "memory_hits": self.hits[MEMORY],
+                "disk_hits": self.hits[DISK],
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0,
+                "memory_entries": len(self._entries),
+            }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
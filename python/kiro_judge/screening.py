@@ -0,0 +1,159 @@
+from .cost import (
+    evaluation_context,
+    no_failure_probability,
+    scenario_cost,
+    scenario_groups,
+    weighted_scenario_costs,
+)
+from math import atan, cos, fsum, pi, sin, sqrt
+from statistics import NormalDist
+import random
+
+# Screening mode of the operational cost, see cost.operational_cost(budget=...) : an estimate of the cost
+# with a confidence interval, from a sample of about budget scenarios, to rank many candidates cheaply.
+# The distinct powers (see cost.scenario_groups) are sorted and split in strata of about the same
+# probability. Since the cost of a scenario grows with its power, it varies little within a stratum.
+# In each stratum, SAMPLES_PER_STRATUM distinct powers are drawn, and the mean of their costs weighted
+# by their probabilities (a ratio estimator, the probabilities of the powers varying a lot) times the
+# probability of the stratum estimates its part of the cost. The variance of each part is the jackknife one,
+# from the ratios leaving out each draw, with the finite population correction (the variance of the weighted
+# residuals of so few draws underestimates it, by a tenth on the small instance), and the interval uses the
+# Student quantile of Satterthwaite's degrees of freedom, as each part estimates its variance from a few draws.
+# When the draws of a stratum cost the same, they tell nothing of its variance : the lowest and highest powers
+# of the stratum are evaluated too. If they cost the same, so does the whole stratum, known exactly then, else
+# the part lies between them, and Popoviciu's inequality bounds its variance, known without draws.
+# Strata with no more powers than the draws are evaluated exactly, and so is the whole cost when the budget
+# covers every distinct power.
+# The draws come from random.Random(seed), the same seed giving the same result.
+
+SAMPLES_PER_STRATUM = 2
+
+
+def student_quantile(confidence, dof):
+    """Two-sided quantile of the Student distribution, by bisection of its distribution function
+    (Abramowitz and Stegun 26.7.3 and 26.7.4)
+    :param confidence: the probability that |T| is below the quantile
+    :param dof: the degrees of freedom, rounded down to an integer (at least 1)
+    :return: the quantile
+    """
+    dof = max(1, int(dof))
+
+    def inside(t):
+        # Probability that |T| < t
+        theta = atan(t / sqrt(dof))
+        cos2 = cos(theta) ** 2
+        if dof % 2:
+            term, series = cos(theta), 0
+            for k in range(1, (dof - 1) // 2 + 1):
+                series += term
+                term *= cos2 * 2 * k / (2 * k + 1)
+            return 2 / pi * (theta + sin(theta) * series)
+        term, series = 1, 0
+        for k in range(1, dof // 2 + 1):
+            series += term
+            term *= cos2 * (2 * k - 1) / (2 * k)
+        return sin(theta) * series
+
+    low, high = 0, 1
+    while inside(high) < confidence:
+        low, high = high, 2 * high
+    for _ in range(60):
+        middle = (low + high) / 2
+        if inside(middle) < confidence:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def power_strata(groups, nb_strata):
+    """Splits the distinct powers in strata of consecutive powers of about the same probability
+    :param groups: the scenarios merged by power, see cost.scenario_groups
+    :param nb_strata: the number of strata wanted
+    :return: the list of the non-empty strata, each a list of (power, total probability of its scenarios)
+    """
+    scenarios = sorted((power, fsum(probs)) for power, probs in groups)
+    total = fsum(prob for _, prob in scenarios)
+    strata = [[] for _ in range(nb_strata)]
+    cumulated = 0
+    for power, prob in scenarios:
+        # The stratum of the middle of the probability of this power
+        strata[min(nb_strata - 1, int(nb_strata * (cumulated + prob / 2) / total))].append(
+            (power, prob)
+        )
+        cumulated += prob
+    return [stratum for stratum in strata if stratum]
+
+
+def screened_operational_cost(instance, solution, budget, seed=0, confidence=0.95, context=None):
+    """Estimates the operational cost of a solution from a sample of the scenarios, see above
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param budget: the number of scenarios drawn, at least SAMPLES_PER_STRATUM, each stratum whose draws cost
+    the same evaluating up to two more
+    :param seed: the seed of the draws
+    :param confidence: the probability that the interval contains the cost
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :return: estimate, low, high: the estimate of the operational cost and its confidence interval,
+    all three exactly the operational cost if the budget covers every distinct power
+    """
+    if budget < SAMPLES_PER_STRATUM:
+        raise ValueError(f"The budget must be at least {SAMPLES_PER_STRATUM}, not {budget}")
+    if context is None:
+        context = evaluation_context(instance, solution)
+    no_fail_proba = no_failure_probability(context)
+    groups = scenario_groups(instance)
+    if budget >= len(groups):
+        cost = fsum(weighted_scenario_costs(instance, context, no_fail_proba, groups))
+        return cost, cost, cost
+
+    rng = random.Random(seed)
+
+    estimates = []
+    variances = []
+    dof_terms = []
+    for stratum in power_strata(groups, budget // SAMPLES_PER_STRATUM):
+        if len(stratum) <= SAMPLES_PER_STRATUM:
+            estimates.extend(
+                prob * scenario_cost(instance, context, no_fail_proba, power) for power, prob in stratum
+            )
+            continue
+        drawn = rng.sample(stratum, SAMPLES_PER_STRATUM)
+        costs = [scenario_cost(instance, context, no_fail_proba, power) for power, _ in drawn]
+        stratum_prob = fsum(prob for _, prob in stratum)
+        if len(set(costs)) == 1:
+            # The cost grows with the power, and the strata are sorted by power
+            lowest, highest = (
+                costs[0] if (power, prob) in drawn else scenario_cost(instance, context, no_fail_proba, power)
+                for power, prob in (stratum[0], stratum[-1])
+            )
+            estimates.append(stratum_prob * costs[0])
+            variances.append((stratum_prob * (highest - lowest)) ** 2 / 4)
+            continue
+        drawn_prob = fsum(prob for _, prob in drawn)
+        weighted = fsum(prob * cost for (_, prob), cost in zip(drawn, costs))
+        # Mean cost of the powers drawn, weighted by their probabilities
+        estimates.append(stratum_prob * weighted / drawn_prob)
+        # Jackknife variance of the ratio estimate
+        left_out = [(weighted - prob * cost) / (drawn_prob - prob) for (_, prob), cost in zip(drawn, costs)]
+        mean = fsum(left_out) / len(left_out)
+        correction = 1 - len(drawn) / len(stratum)
+        variance = (
+            stratum_prob**2 * correction * (len(drawn) - 1) / len(drawn)
+            * fsum((ratio - mean) ** 2 for ratio in left_out)
+        )
+        variances.append(variance)
+        dof_terms.append(variance**2 / (len(drawn) - 1))
+
+    estimate = fsum(estimates)
+    variance = fsum(variances)
+    if variance == 0:
+        return estimate, estimate, estimate
+    dof_sum = fsum(dof_terms)
+    if dof_sum == 0:
+        # Only variances known without draws : the normal quantile
+        quantile = NormalDist().inv_cdf((1 + confidence) / 2)
+    else:
+        quantile = student_quantile(confidence, variance**2 / dof_sum)
+    half_width = quantile * sqrt(variance)
+    return estimate, max(0, estimate - half_width), estimate + half_width
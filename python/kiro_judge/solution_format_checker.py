@@ -1,5 +1,5 @@
-from constants import *
-from errors import InstanceError
+from .constants import *
+from .errors import InstanceError
 
 
 def solution_checker(instance, solution):
@@ -0,0 +1,336 @@
+from .constants import *
+from .errors import InstanceError
+from .timings import TURBINE_SCANS
+
+# Single pass version of solution_format_checker.solution_checker followed by converter.convert_solution.
+# Each element of the solution is read once, and the errors are collected per check of the
+# original pipeline, so that the same messages are raised in the same order : the checks raise
+# one after the other, so only the errors of the first failing check are reported.
+# Once a check has failed, the work of the later checks and of the conversion is skipped.
+
+# The checks, in the order solution_checker runs them, then the conversion
+LIST_SUBSTATIONS = 0
+LIST_TURBINES = 1
+LIST_SUBSUB_CABLES = 2
+SUBSTATIONS_CONTENT = 3
+TURBINES_CONTENT = 4
+SUBSUB_CABLES_CONTENT = 5
+CONVERSION = 6
+NB_STAGES = 7
+
+
+class Stages:
+    """Errors collected for every check"""
+
+    def __init__(self):
+        self.errors = [[] for _ in range(NB_STAGES)]
+
+    def failed_before(self, stage):
+        """:return: True if a check preceding stage has failed, making stage useless"""
+        return any(self.errors[s] for s in range(stage))
+
+    def raise_first(self):
+        """Raises the errors of the first failed check, if any"""
+        for errors in self.errors:
+            if errors:
+                raise InstanceError(errors)
+
+    def fatal(self, stage, message):
+        """Adds an error after which the check cannot go on, and raises the first failed check"""
+        self.errors[stage].append(message)
+        self.raise_first()
+
+
+def check_format(solution):
+    """Same as solution_format_checker.check_format"""
+    if type(solution) is not dict:
+        raise InstanceError([f"The solution isn't a dictionnary"])
+    if set(solution.keys()) != set(KEYS_EXPECTED):
+        raise InstanceError(
+            [
+                f"The solution must contain exactly three keys : '{SUBSTATIONS}' and '{TURBINES}' and '{SUBSTATION_SUBSTATION_CABLES}"
+            ]
+        )
+
+
+def keys_errors(dic, expected, prefix, i):
+    """Error messages for the missing and unexpected keys of dic, in the order of solution_format_checker"""
+    errors = []
+    if set(expected) != set(dic.keys()):
+        missing_keys = set(expected) - set(dic.keys())
+        extra_keys = set(dic.keys()) - set(expected)
+        for key in missing_keys:
+            errors.append(f"In {prefix}, key {key} is missing from the dictionnary {i+1}")
+        for key in extra_keys:
+            errors.append(f"In {prefix}, key {key} is not expected in the dictionnary {i+1}")
+    return errors
+
+
+def is_in(value, values):
+    """value in values, False for an unhashable value"""
+    try:
+        return value in values
+    except TypeError:
+        return False
+
+
+def in_range(value, max_value):
+    """1 <= value <= max_value, False for a value that cannot be compared"""
+    try:
+        return 1 <= value <= max_value
+    except TypeError:
+        return False
+
+
+def list_size(instance, key):
+    """:return: the number of elements of the list at key in the instance, raw, converted or compiled"""
+    if isinstance(instance, dict):
+        return len(instance[key])
+    return instance.list_size(key)
+
+
+def walk_substations(instance, substations, stages, built, converted):
+    """Checks and converts the list of substations
+    :param substations: the list of substations, or any iterable over its elements
+    :param built: the set of built substation ids, filled here
+    :param converted: the converted substations, filled here"""
+    max_values = {
+        ID: list_size(instance, SUBSTATION_LOCATION),
+        SUB_TYPE: list_size(instance, SUBSTATION_TYPES),
+        LAND_CABLE_TYPE: list_size(instance, LAND_SUB_CABLE_TYPES),
+    }
+    instance_keys = {
+        ID: SUBSTATION_LOCATION,
+        SUB_TYPE: SUBSTATION_TYPES,
+        LAND_CABLE_TYPE: LAND_SUB_CABLE_TYPES,
+    }
+    list_errors = stages.errors[LIST_SUBSTATIONS]
+    content_errors = stages.errors[SUBSTATIONS_CONTENT]
+    conversion_errors = stages.errors[CONVERSION]
+    for i, sub_dict in enumerate(substations):
+        if type(sub_dict) != dict:
+            stages.fatal(
+                LIST_SUBSTATIONS, f"The list of substations must contains dictionnaries"
+            )
+        if set(KEYS_EXPECTED_SUBSTATION) != set(sub_dict.keys()):
+            missing_keys = set(KEYS_EXPECTED_SUBSTATION) - set(sub_dict.keys())
+            extra_keys = set(sub_dict.keys()) - set(KEYS_EXPECTED_SUBSTATION)
+            for key in missing_keys:
+                list_errors.append(
+                    f"In {SUBSTATIONS}, key '{key}' is missing from the substation {i+1}"
+                )
+            for key in extra_keys:
+                list_errors.append(
+                    f"In {SUBSTATIONS}, key '{key}' is not expected in the substationn {i+1}"
+                )
+        if list_errors:
+            continue
+
+        for key, max_value in max_values.items():
+            id = sub_dict[key]
+            if not (type(id)) == int:
+                content_errors.append(f"The {key} of substation {i+1} must be an integer")
+            elif not (1 <= id <= max_value):
+                content_errors.append(
+                    f"The {key} of substation {i+1} is not valid, it does not exist in the list of {instance_keys[key]}"
+                )
+        if content_errors:
+            continue
+
+        id = sub_dict[ID]
+        if id in built:
+            conversion_errors.append(f"Two or more substation are built on site {id}")
+        built.add(id)
+        if not conversion_errors:
+            sub_dict.pop(ID)
+            converted[id] = sub_dict
+    if list_errors:
+        stages.raise_first()
+
+
+def turbine_content_errors(tur_dict, i, max_id_turbine, built, encountered_id):
+    """Error messages for the content of a turbine, in the order of solution_format_checker
+    :param encountered_id: the set of turbine ids met so far, updated here"""
+    errors = []
+    tur_id = tur_dict[ID]
+    if is_in(tur_id, encountered_id):
+        errors.append(f"The turbine with id {tur_id} appears at least twice")
+    elif tur_id.__hash__ is not None:
+        encountered_id.add(tur_id)
+    if not (type(tur_id) == int):
+        errors.append(f"The id of turbine {i+1} must be an integer")
+    if not in_range(tur_id, max_id_turbine):
+        errors.append(
+            f"The id of turbine {i + 1} is not valid - it doesn't exist in the list of turbines"
+        )
+    linked_sub = tur_dict[SUBSTATION_ID]
+    if not (type(linked_sub) == int):
+        errors.append(
+            f"The id for the linked substation of turbine {i+1} must be an integer"
+        )
+    if not is_in(linked_sub, built):
+        errors.append(f"The turbine {i+1} is linked to a substation that doesn't exist")
+    return errors
+
+
+def walk_turbines(instance, turbines, stages, built, converted):
+    """Checks and converts the list of turbines
+    This is the longest list by far, so valid turbines go through a fast path
+    :param turbines: the list of turbines, or any iterable over its elements
+    :param built: the set of built substation ids
+    :param converted: the converted turbines, filled here"""
+    max_id_turbine = list_size(instance, WIND_TURBINES)
+    expected_keys = set(KEYS_EXPECTED_TURBINES)
+    list_errors = stages.errors[LIST_TURBINES]
+    content_errors = stages.errors[TURBINES_CONTENT]
+    check_content = not stages.failed_before(TURBINES_CONTENT)
+    encountered_id = set()
+    for i, tur_dict in enumerate(turbines):
+        if type(tur_dict) != dict:
+            stages.fatal(LIST_TURBINES, f"The list of turbines must contains dictionnaries")
+        if tur_dict.keys() != expected_keys:
+            list_errors += keys_errors(tur_dict, KEYS_EXPECTED_TURBINES, TURBINES, i)
+            check_content = False
+        if not check_content:
+            continue
+
+        tur_id = tur_dict[ID]
+        linked_sub = tur_dict[SUBSTATION_ID]
+        if (
+            type(tur_id) == int
+            and type(linked_sub) == int
+            and 1 <= tur_id <= max_id_turbine
+            and tur_id not in encountered_id
+            and linked_sub in built
+        ):
+            encountered_id.add(tur_id)
+            if not content_errors:
+                del tur_dict[ID]
+                converted[tur_id] = tur_dict
+        else:
+            content_errors += turbine_content_errors(
+                tur_dict, i, max_id_turbine, built, encountered_id
+            )
+    if list_errors:
+        stages.raise_first()
+    if not check_content:
+        return
+    # Without errors, the ids met are distinct and in 1 ... max_id_turbine
+    if content_errors or len(encountered_id) != max_id_turbine:
+        missing_ids = set(range(1, max_id_turbine + 1)) - encountered_id
+        for id in missing_ids:
+            content_errors.append(
+                f"The turbine with id {id} does not appear in the list of turbines, but it should"
+            )
+
+
+def walk_subsub_cables(instance, cables, stages, built, converted):
+    """Checks and converts the list of substation-substation cables
+    :param cables: the list of cables, or any iterable over its elements
+    :param built: the set of built substation ids
+    :param converted: the converted cables, two one-way cables per cable, filled here"""
+    max_id_cable = list_size(instance, SUB_SUB_CABLE_TYPES)
+    list_errors = stages.errors[LIST_SUBSUB_CABLES]
+    content_errors = stages.errors[SUBSUB_CABLES_CONTENT]
+    conversion_errors = stages.errors[CONVERSION]
+    check_content = not stages.failed_before(SUBSUB_CABLES_CONTENT)
+    for i, cable in enumerate(cables):
+        if type(cable) != dict:
+            stages.fatal(
+                LIST_SUBSUB_CABLES,
+                f"The list of substation-substation cables must contains dictionnaries",
+            )
+        if set(KEYS_EXPECTED_SUB_SUB_CABLE) != set(cable.keys()):
+            list_errors += keys_errors(
+                cable, KEYS_EXPECTED_SUB_SUB_CABLE, SUBSTATION_SUBSTATION_CABLES, i
+            )
+        if list_errors or not check_content:
+            continue
+
+        id1 = cable[SUBSTATION_ID]
+        id2 = cable[OTHER_SUB_ID]
+        cable_type = cable[CABLE_TYPE_SUBSUB]
+        if not type(id1) == int:
+            content_errors.append(f"For cable {i+1}, {SUBSTATION_ID} must be an integer")
+        if not type(id2) == int:
+            content_errors.append(f"For cable {i+1}, {OTHER_SUB_ID} must be an integer")
+        if not type(cable_type) == int:
+            content_errors.append(
+                f"For cable {i+1}, {CABLE_TYPE_SUBSUB} must be an integer"
+            )
+        if not is_in(id1, built):
+            content_errors.append(
+                f"The cable {i+1} is linked to the substation {id1}, which does not exist."
+            )
+        if not is_in(id2, built):
+            content_errors.append(
+                f"The cable {i+1} is linked to the substation {id2}, which does not exist."
+            )
+        if not in_range(cable_type, max_id_cable):
+            content_errors.append(
+                f"For cable {i+1}, the {CABLE_TYPE_SUBSUB} is not valid, it does not exist in the list of substation-substation cable types"
+            )
+        if content_errors or stages.failed_before(CONVERSION):
+            continue
+
+        if id1 in converted:
+            conversion_errors.append(
+                f"The substation {id1} is linked to two or more substations, this is not allowed"
+            )
+        if id2 in converted:
+            conversion_errors.append(
+                f"The substation {id2} is linked to two or more substations, this is not allowed"
+            )
+        converted[id1] = {OTHER_SUB_ID: id2, CABLE_TYPE_SUBSUB: cable_type}
+        converted[id2] = {OTHER_SUB_ID: id1, CABLE_TYPE_SUBSUB: cable_type}
+    if list_errors:
+        stages.raise_first()
+
+
+def check_list(value, key, stages):
+    """Checks that the element at key in the solution is a list
+    :raises InstanceError if it is not"""
+    if type(value) != list:
+        stages.fatal(LIST_STAGES[key], f"The element at key '{key}' is not a list")
+
+
+def new_converted_solution():
+    """:return: an empty converted solution, with the keys in the order of convert_solution"""
+    return {TURBINES: {}, SUBSTATIONS: {}, SUBSTATION_SUBSTATION_CABLES: {}}
+
+
+# The lists of a solution in the order they are checked, with the check of their format and their walk
+LIST_STAGES = {
+    SUBSTATIONS: LIST_SUBSTATIONS,
+    TURBINES: LIST_TURBINES,
+    SUBSTATION_SUBSTATION_CABLES: LIST_SUBSUB_CABLES,
+}
+WALKS = {
+    SUBSTATIONS: walk_substations,
+    TURBINES: walk_turbines,
+    SUBSTATION_SUBSTATION_CABLES: walk_subsub_cables,
+}
+
+
+def check_and_convert_solution(instance, solution, timings=None):
+    """
+    Verifies that the solution provided is correctly written and converts it, in a single pass.
+    Same as solution_checker(instance, solution) followed by convert_solution(solution).
+    :param instance: The instance it refers to, raw or converted (only the size of its lists is used)
+    :param solution: The solution given by the candidate
+    :param timings: a timings.Timings, whose counter of turbine scans is incremented if given
+    :return: the converted solution
+    :raises InstanceError with details in case it spots an error
+    """
+    check_format(solution)
+    stages = Stages()
+    built = set()
+    converted = new_converted_solution()
+    for key, walk in WALKS.items():
+        check_list(solution[key], key, stages)
+        walk(instance, solution[key], stages, built, converted[key])
+    if timings is not None:
+        # walk_turbines reads each turbine once
+        timings.count(TURBINE_SCANS, len(solution[TURBINES]))
+    stages.raise_first()
+    return converted
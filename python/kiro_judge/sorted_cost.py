@@ -0,0 +1,193 @@
+from bisect import bisect_right
+from itertools import accumulate
+from math import fsum, inf
+from .constants import *
+from .cost import (
+    evaluation_context,
+    no_failure_probability,
+    curtailing_parameters,
+    scenario_groups,
+)
+
+# Closed-form engine for the operational cost (7).
+# For a fixed solution, the curtailing of every failure case is a piecewise-linear, nondecreasing
+# function of the scenario power, and so is its cost c^c once the kink at C_max is added.
+# On each linear piece a*P + b, the expected cost over the scenarios falling in the piece is
+# a * sum(prob * power) + b * sum(prob), read from prefix sums over the scenarios sorted by power.
+# The cost of a failure case thus only depends on its few breakpoints, not on the number of scenarios.
+#
+# A piecewise-linear function is described by a list of events (position, d_slope, d_intercept):
+# from position onwards, its slope and intercept are increased by d_slope and d_intercept.
+#
+# The costs of the pieces and of the cases are summed by fsum, so that the result never depends on
+# the order of the solution, but since the scenarios are never evaluated one by one, it only matches
+# the reference engine of cost.py up to floating point rounding.
+
+
+def sorted_scenarios(instance):
+    """Sorts the distinct powers of the wind scenarios (see cost.scenario_groups), each with the total
+    probability of its scenarios, and computes the prefix sums of probability and probability x power
+    The result is computed once per instance, and kept in the instance under the SORTED_SCENARIOS key
+    (in its cache for a CompiledInstance)
+    :param instance: the instance addressed by the solution
+    :return: powers, cum_prob, cum_prob_power: the sorted powers, and the prefix sums such that
+    cum_prob[k] is the sum of the probabilities of the k scenarios with the lowest power
+    """
+    cache = instance if isinstance(instance, dict) else instance.cache
+    if SORTED_SCENARIOS not in cache:
+        scenarios = sorted((power, fsum(probs)) for power, probs in scenario_groups(instance))
+        powers = [power for power, _ in scenarios]
+        cum_prob = [0] + list(accumulate(prob for _, prob in scenarios))
+        cum_prob_power = [0] + list(accumulate(prob * power for power, prob in scenarios))
+        cache[SORTED_SCENARIOS] = (powers, cum_prob, cum_prob_power)
+    return cache[SORTED_SCENARIOS]
+
+
+def hinge_events(slope, threshold):
+    """Events of the function P -> max(0, slope * P - threshold), for a nonnegative slope
+    :param slope: the slope of the function once it is positive
+    :param threshold: the value substracted
+    :return: the list of events describing this function
+    """
+    if slope > 0:
+        return [(threshold / slope, slope, -threshold)]
+    if threshold < 0:
+        # Constant positive function
+        return [(-inf, 0, -threshold)]
+    return []
+
+
+def linked_events(nb_turbines, capacity, nb_failed, cable_rating):
+    """Events of the curtailing of a substation receiving power from a failed substation,
+    P -> max(0, nb_turbines * P - capacity + min(nb_failed * P, cable_rating))
+    :param nb_turbines: the number of turbines linked to the substation
+    :param capacity: the capacity of the substation
+    :param nb_failed: the number of turbines linked to the failed substation
+    :param cable_rating: the rating of the cable between both substations
+    :return: the list of events describing this function
+    """
+    if nb_failed == 0:
+        return hinge_events(nb_turbines, capacity - min(0, cable_rating))
+    # The cable is saturated from this power onwards
+    saturation = cable_rating / nb_failed
+    if nb_turbines * saturation - capacity + cable_rating > 0:
+        # The substation curtails before the cable is saturated
+        return [
+            (capacity / (nb_turbines + nb_failed), nb_turbines + nb_failed, -capacity),
+            (saturation, -nb_failed, cable_rating),
+        ]
+    return hinge_events(nb_turbines, capacity - cable_rating)
+
+
+def expected_curtailing_cost(instance, scenarios, events):
+    """Computes the expectation over the scenarios of the cost of a curtailing, c^c(C(P))
+    :param instance: the instance addressed by the solution
+    :param scenarios: the sorted scenarios, see sorted_scenarios
+    :param events: the events describing the curtailing C as a function of the power
+    :return: the expected cost of this curtailing
+    """
+    powers, cum_prob, cum_prob_power = scenarios
+    linear_cost, pena_cost, max_curtailing = curtailing_parameters(instance)
+
+    def piece_cost(low, high, slope, intercept):
+        # Expected value of slope * P + intercept over the scenarios with low < P <= high
+        i, j = bisect_right(powers, low), bisect_right(powers, high)
+        if i >= j:
+            return 0
+        return slope * (cum_prob_power[j] - cum_prob_power[i]) + intercept * (
+            cum_prob[j] - cum_prob[i]
+        )
+
+    cost = []
+    slope, intercept = 0, 0
+    low = -inf
+    for position, d_slope, d_intercept in sorted(events) + [(inf, 0, 0)]:
+        if position > low:
+            # The curtailing is slope * P + intercept on ]low, position], and since it is
+            # nondecreasing, the penalty applies on the right of the point where it reaches C_max
+            if slope > 0:
+                kink = min(max((max_curtailing - intercept) / slope, low), position)
+            else:
+                kink = low if intercept > max_curtailing else position
+            cost.append(piece_cost(low, kink, linear_cost * slope, linear_cost * intercept))
+            cost.append(
+                piece_cost(
+                    kink,
+                    position,
+                    (linear_cost + pena_cost) * slope,
+                    linear_cost * intercept + pena_cost * (intercept - max_curtailing),
+                )
+            )
+            low = position
+        slope += d_slope
+        intercept += d_intercept
+    return fsum(cost)
+
+
+def substations_events(context):
+    """Events of the curtailing of every working substation receiving nothing from a failed one
+    :param context: the evaluation context of the solution, see cost.evaluation_context
+    :return: the list of (event, substation id), sorted by position
+    """
+    return sorted(
+        (event, id)
+        for id, sub in context.items()
+        for event in hinge_events(sub[NB_TURBINES], sub[CAPACITY])
+    )
+
+
+def failure_case_cost(instance, scenarios, context, fail_id, sub_events):
+    """Computes the expected cost of the curtailing when a given substation fails
+    :param instance: the instance addressed by the solution
+    :param scenarios: the sorted scenarios, see sorted_scenarios
+    :param context: the evaluation context of the solution, see cost.evaluation_context
+    :param fail_id: id of the failed substation
+    :param sub_events: the events of every substation, see substations_events
+    :return: the expected cost over the scenarios of the curtailing under this failure
+    """
+    failed = context[fail_id]
+    other_id = failed[OTHER_SUB_ID]
+    cable_rating = failed[CABLE_RATING] if other_id is not None else 0
+    events = [event for event, id in sub_events if id != fail_id and id != other_id]
+    # The failed substation can only send through its cable
+    events += hinge_events(failed[NB_TURBINES], cable_rating)
+    if other_id is not None and other_id != fail_id:
+        other = context[other_id]
+        events += linked_events(
+            other[NB_TURBINES], other[CAPACITY], failed[NB_TURBINES], cable_rating
+        )
+    return expected_curtailing_cost(instance, scenarios, events)
+
+
+def no_failure_case_cost(instance, scenarios, context):
+    """Computes the expected cost of the curtailing when no substation fails
+    :param instance: the instance addressed by the solution
+    :param scenarios: the sorted scenarios, see sorted_scenarios
+    :param context: the evaluation context of the solution, see cost.evaluation_context
+    :return: the expected cost over the scenarios of the no-failure curtailing
+    """
+    events = hinge_events(
+        sum(sub[NB_TURBINES] for sub in context.values()),
+        fsum(sub[CAPACITY] for sub in context.values()),
+    )
+    return expected_curtailing_cost(instance, scenarios, events)
+
+
+def sorted_operational_cost(instance, solution, context=None):
+    """Computes the operationnal cost of a given solution, defined in (7), in closed form over the sorted scenarios
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :return: the operational cost of the solution"""
+    if context is None:
+        context = evaluation_context(instance, solution)
+    no_fail_proba = no_failure_probability(context)
+    scenarios = sorted_scenarios(instance)
+    sub_events = substations_events(context)
+
+    cost = [
+        failed[PROB_FAIL] * failure_case_cost(instance, scenarios, context, fail_id, sub_events)
+        for fail_id, failed in context.items()
+    ]
+    cost.append(no_fail_proba * no_failure_case_cost(instance, scenarios, context))
+    return fsum(cost)
@@ -0,0 +1,333 @@
+from array import array
+import json
+import numpy as np
+from .constants import *
+from .converter import list_to_dic_ids
+from .compiled_instance import CompiledInstance
+from .errors import InstanceError
+from .loader import load_json
+from .solution_pipeline import (
+    Stages,
+    WALKS,
+    check_format,
+    check_list,
+    new_converted_solution,
+)
+
+# Loader for very large instances and solutions.
+# The wind turbines and wind scenarios of an instance go straight into the arrays of a CompiledInstance,
+# and the turbines of a solution are checked and converted as they are read.
+# With the ijson backend the files are parsed element by element, and neither the whole text
+# nor the whole lists are ever held in memory. Without it, orjson (faster) or the standard json
+# module parse the whole file, which is then compiled without the intermediate converted dicts.
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+IJSON_BACKEND = "ijson"  # Streaming
+ORJSON_BACKEND = "orjson"  # Whole file, fast
+JSON_BACKEND = "json"  # Whole file, standard library
+BACKENDS = [IJSON_BACKEND, ORJSON_BACKEND, JSON_BACKEND]
+
+# The lists of the instance read into arrays, with the fields kept
+STREAMED_LISTS = {
+    WIND_TURBINES: [X, Y],
+    WIND_SCENARIOS: [POWER_GENERATION, PROBABILITY],
+}
+# The other lists of the instance, converted as by convert_instance
+CONVERTED_LISTS = [
+    SUBSTATION_TYPES,
+    LAND_SUB_CABLE_TYPES,
+    SUB_SUB_CABLE_TYPES,
+    SUBSTATION_LOCATION,
+]
+
+
+def available_backends():
+    """:return: the backends that can be used here, the preferred one first"""
+    return [
+        backend
+        for backend, module in [
+            (IJSON_BACKEND, ijson),
+            (ORJSON_BACKEND, orjson),
+            (JSON_BACKEND, json),
+        ]
+        if module is not None
+    ]
+
+
+def bad_json(err):
+    return InstanceError([f"Error: bad JSON formatting : {err}"])
+
+
+def load_whole(file_path, backend):
+    """Loads a whole json file with the orjson or json backend, like loader.load_json"""
+    if backend == ORJSON_BACKEND:
+        with open(file_path, "rb") as file:
+            try:
+                return orjson.loads(file.read())
+            except orjson.JSONDecodeError as err:
+                raise bad_json(err)
+    return load_json(file_path)
+
+
+class Columns:
+    """Fields of the elements of a list of the instance, gathered in compact arrays as they are read"""
+
+    def __init__(self, key, fields):
+        self.key = key
+        self.fields = fields
+        self.ids = array("q")
+        self.columns = [array("d") for _ in fields]
+
+    def append(self, i, element):
+        if type(element) != dict:
+            raise InstanceError(
+                [f"In the list of {self.key}, the element {i} is not a dictionnary"]
+            )
+        try:
+            self.ids.append(element[ID])
+            for column, field in zip(self.columns, self.fields):
+                column.append(element[field])
+        except KeyError as err:
+            raise InstanceError([f"An element of the {self.key} is missing its {err} key"])
+        except TypeError:
+            raise InstanceError([f"The fields of the {self.key} must be numbers"])
+
+    def arrays(self):
+        """:return: one array per field, the element of id i at position i - 1
+        :raises InstanceError if the ids are not 1 ... N"""
+        ids = np.frombuffer(self.ids, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        if not np.array_equal(ids[order], np.arange(1, len(ids) + 1)):
+            raise InstanceError([f"The ids of the {self.key} must be 1 ... {len(ids)}"])
+        return [np.frombuffer(column, dtype=float)[order] for column in self.columns]
+
+
+def compile_parts(raw_parts, columns):
+    """Builds the CompiledInstance from the small parts of the raw instance and the gathered columns"""
+    instance = {}
+    str_errors = []
+    try:
+        instance[GEN_PARAMETERS] = raw_parts[GEN_PARAMETERS]
+        for key in CONVERTED_LISTS:
+            instance[key] = list_to_dic_ids(raw_parts[key], key, str_errors)
+        turbines = columns[WIND_TURBINES].arrays()
+        scenarios = columns[WIND_SCENARIOS].arrays()
+    except KeyError as err:
+        raise InstanceError([f"The instance is missing the key {err}"])
+    if str_errors:
+        raise InstanceError(str_errors)
+    return CompiledInstance(instance, turbines, scenarios)
+
+
+# Streaming with ijson : the events (event, value) of ijson.basic_parse are consumed by the functions below
+
+
+def build_value(first, events):
+    """Builds the json value starting with the event first"""
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    event, value = first
+    while True:
+        builder.event(event, value)
+        if event == "start_map" or event == "start_array":
+            depth += 1
+        elif event == "end_map" or event == "end_array":
+            depth -= 1
+        if depth == 0:
+            return builder.value
+        event, value = next(events)
+
+
+def skip_value(first, events):
+    """Consumes the json value starting with the event first, without building it"""
+    depth = 0
+    event, _ = first
+    while True:
+        if event == "start_map" or event == "start_array":
+            depth += 1
+        elif event == "end_map" or event == "end_array":
+            depth -= 1
+        if depth == 0:
+            return
+        event, _ = next(events)
+
+
+class StreamedItems:
+    """Iterator over the elements of a json array being parsed, its start_array event already consumed"""
+
+    def __init__(self, events):
+        self.events = events
+        self.done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.done:
+            raise StopIteration
+        first = next(self.events)
+        if first[0] == "end_array":
+            self.done = True
+            raise StopIteration
+        return build_value(first, self.events)
+
+    def drain(self):
+        """Consumes the rest of the array"""
+        while not self.done:
+            first = next(self.events)
+            if first[0] == "end_array":
+                self.done = True
+            else:
+                skip_value(first, self.events)
+
+
+def stream_instance(file):
+    """Reads an instance with ijson, the streamed lists going straight into columns
+    :return: raw_parts, columns: the other parts of the raw instance, and the Columns of the streamed lists
+    """
+    events = ijson.basic_parse(file, use_float=True)
+    if next(events)[0] != "start_map":
+        raise InstanceError(["The instance isn't a dictionnary"])
+    raw_parts = {}
+    columns = {key: Columns(key, fields) for key, fields in STREAMED_LISTS.items()}
+    for event, key in events:
+        if event == "end_map":
+            break
+        first = next(events)
+        if key in STREAMED_LISTS:
+            if first[0] != "start_array":
+                raise InstanceError([f"The element at key '{key}' is not a list"])
+            for i, element in enumerate(StreamedItems(events)):
+                columns[key].append(i, element)
+        else:
+            raw_parts[key] = build_value(first, events)
+    # Makes sure there is nothing after the instance
+    for _ in events:
+        pass
+    return raw_parts, columns
+
+
+def load_compiled_instance(file_path, backend=None):
+    """
+    Loads an instance straight into a CompiledInstance
+    :param file_path: The path to the instance
+    :param backend: one of BACKENDS, the first available one if not given
+    :return: the CompiledInstance
+    :raises FileNotFoundError if the file doesn't exist, InstanceError if it is not valid
+    """
+    backend = backend or available_backends()[0]
+    if backend == IJSON_BACKEND:
+        with open(file_path, "rb") as file:
+            try:
+                raw_parts, columns = stream_instance(file)
+            except ijson.JSONError as err:
+                raise bad_json(err)
+        return compile_parts(raw_parts, columns)
+
+    raw_instance = load_whole(file_path, backend)
+    if type(raw_instance) != dict:
+        raise InstanceError(["The instance isn't a dictionnary"])
+    columns = {}
+    for key, fields in STREAMED_LISTS.items():
+        columns[key] = Columns(key, fields)
+        # The raw list is freed as soon as it is gathered
+        for i, element in enumerate(raw_instance.pop(key, [])):
+            columns[key].append(i, element)
+    return compile_parts(raw_instance, columns)
+
+
+class DuplicateKey(Exception):
+    """A key appears twice in the solution, which the streaming cannot handle"""
+
+
+def stream_solution(instance, file):
+    """Reads, checks and converts a solution with ijson
+    The lists are walked in the order of check_and_convert_solution : they are kept aside when they come
+    too early in the file, and the turbines are walked as they are parsed when the substations came before.
+    :return: the converted solution
+    :raises InstanceError with the same messages as check_and_convert_solution"""
+    events = ijson.basic_parse(file, use_float=True)
+    if next(events)[0] != "start_map":
+        # The whole file must still be valid json, as with json.load
+        for _ in events:
+            pass
+        raise InstanceError([f"The solution isn't a dictionnary"])
+
+    stages = Stages()
+    built = set()
+    converted = new_converted_solution()
+    order = list(WALKS.keys())
+    walked = 0
+    pending = {}
+    keys = {}
+    error = None
+    for event, key in events:
+        if event == "end_map":
+            break
+        if key in keys:
+            raise DuplicateKey()
+        keys[key] = None
+        first = next(events)
+        if error is not None or key not in WALKS:
+            skip_value(first, events)
+            continue
+        if key == order[walked] and key == TURBINES and first[0] == "start_array":
+            items = StreamedItems(events)
+            try:
+                WALKS[key](instance, items, stages, built, converted[key])
+                walked += 1
+            except InstanceError as err:
+                error = err
+            items.drain()
+        else:
+            pending[key] = build_value(first, events)
+        # Walks the lists that can be, in order
+        try:
+            while walked < len(order) and order[walked] in pending:
+                key = order[walked]
+                check_list(pending[key], key, stages)
+                WALKS[key](instance, pending.pop(key), stages, built, converted[key])
+                walked += 1
+        except InstanceError as err:
+            error = err
+    for _ in events:
+        pass
+
+    check_format(keys)
+    if error is not None:
+        raise error
+    stages.raise_first()
+    return converted
+
+
+def load_converted_solution(instance, file_path, backend=None):
+    """
+    Loads, checks and converts a solution, with the same messages as check_and_convert_solution
+    :param instance: the instance it refers to, raw or converted (only the size of its lists is used)
+    :param file_path: The path to the solution
+    :param backend: one of BACKENDS, the first available one if not given
+    :return: the converted solution
+    :raises FileNotFoundError if the file doesn't exist, InstanceError if it is not valid
+    """
+    from .solution_pipeline import check_and_convert_solution
+
+    backend = backend or available_backends()[0]
+    if backend == IJSON_BACKEND:
+        with open(file_path, "rb") as file:
+            try:
+                return stream_solution(instance, file)
+            except ijson.JSONError as err:
+                raise bad_json(err)
+            except DuplicateKey:
+                pass
+        # json.load keeps the last value of a duplicated key
+        backend = JSON_BACKEND
+    return check_and_convert_solution(instance, load_whole(file_path, backend))
@@ -1,9 +1,9 @@
-from loader import load_json, save_json
-from remove_spaces import clean_keys
-from solution_format_checker import solution_checker
-from converter import convert_instance, convert_solution
-from cost import cost, construction_cost, operational_cost
-from errors import InstanceError
+from .loader import load_json, save_json
+from .remove_spaces import clean_keys
+from .solution_format_checker import solution_checker
+from .converter import convert_instance, convert_solution
+from .cost import cost, construction_cost, operational_cost
+from .errors import InstanceError
 
 size = "tiny3"
 
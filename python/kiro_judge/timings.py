@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+import time
+
+# Time spent in each stage of the judge, and counters of the work done,
+# filled by rteparser.parser when it is given a Timings (the counters where the work is done).
+
+# Stages, in the order the parser runs them
+LOAD_INSTANCE = "load_instance"
+LOAD_SOLUTION = "load_solution"
+CHECK_AND_CONVERT_SOLUTION = "check_and_convert_solution"  # solution_checker + convert_solution
+CONVERT_INSTANCE = "convert_instance"
+CHECK_CONSTRAINTS = "check_constraints"
+CONSTRUCTION_COST = "construction_cost"
+OPERATIONAL_COST = "operational_cost"
+SCORE_CACHE = "score_cache"  # Hashing and lookups, when a score_cache.ScoreCache is used
+
+# Counters
+SCENARIOS = "scenarios"  # Wind scenarios of the instance
+SCENARIOS_EVALUATED = "scenarios_evaluated"  # Distinct powers, see cost.scenario_groups
+FAILURE_CASES_EVALUATED = "failure_cases_evaluated"  # (failed substation, distinct power) pairs
+# Turbine entries of the solution read, by solution_pipeline.check_and_convert_solution,
+# cost.evaluation_context and cost.construction_cost (the scans of check_constraints are not counted)
+TURBINE_SCANS = "turbine_scans"
+
+
+class Timings:
+    """Durations of the stages in seconds, and counters"""
+
+    __slots__ = ("stages", "counters")
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Times the block of the with statement as the stage name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.perf_counter() - start
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def total(self):
+        """:return: the time spent in all the stages, in seconds"""
+        return sum(self.stages.values())
+
+    def to_dict(self):
+        """:return: the report, as printed by rteparser --timings"""
+        return {
+            "stages": dict(self.stages),
+            "total": self.total(),
+            "counters": dict(self.counters),
+        }
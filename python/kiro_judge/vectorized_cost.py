@@ -0,0 +1,180 @@
+import numpy as np
+from .constants import *
+from math import fsum
+from .cost import (
+    evaluation_context,
+    no_failure_probability,
+    curtailing_parameters,
+    scenario_groups,
+)
+
+# Vectorized engine for the operational cost (7) : every scenario is evaluated at once.
+# The pure python functions of cost.py remain the reference implementation : this engine does
+# the same floating point operations elementwise, in the same order (see cost.compensated_sum),
+# and gives bit-identical results.
+
+
+def scenario_arrays(instance):
+    """Gathers the wind scenarios merged by power (see cost.scenario_groups) in arrays
+    :param instance: the instance addressed by the solution
+    :return: powers, probabilities, groups: the array of the distinct powers, and the arrays of the probability
+    of every scenario and of the position of its power in powers
+    """
+    groups = scenario_groups(instance)
+    powers = np.array([power for power, _ in groups], dtype=float)
+    probabilities = np.array([prob for _, probs in groups for prob in probs], dtype=float)
+    positions = np.repeat(np.arange(len(groups)), [len(probs) for _, probs in groups])
+    return powers, probabilities, positions
+
+
+def context_arrays(context):
+    """Converts the evaluation context of a solution into arrays indexed by the position
+    of each built substation in the context
+    :param context: the evaluation context of the solution, see cost.evaluation_context
+    :return: nb_turbines, capacity, prob_fail, cable_rating, partner: arrays of size nb_substations,
+    cable_rating is 0 and partner is -1 for substations without a substation-substation cable
+    """
+    index = {id: i for i, id in enumerate(context.keys())}
+    subs = context.values()
+    nb_turbines = np.array([sub[NB_TURBINES] for sub in subs], dtype=float)
+    capacity = np.array([sub[CAPACITY] for sub in subs], dtype=float)
+    prob_fail = np.array([sub[PROB_FAIL] for sub in subs], dtype=float)
+    cable_rating = np.array(
+        [sub[CABLE_RATING] if sub[CABLE_RATING] is not None else 0 for sub in subs],
+        dtype=float,
+    )
+    partner = np.array(
+        [index.get(sub[OTHER_SUB_ID], -1) for sub in subs],
+        dtype=int,
+    )
+    return nb_turbines, capacity, prob_fail, cable_rating, partner
+
+
+def cost_of_curtailing_array(instance, curtailing):
+    """Array version of cost.cost_of_curtailing, c^c(C) = c⁰C + c^p[C-C_max]⁺ elementwise
+    :param instance: the instance addressed by the solution
+    :param curtailing: an array of curtailings
+    :return: the array of the costs of these curtailings
+    """
+    linear_cost, pena_cost, max_curtailing = curtailing_parameters(instance)
+    return linear_cost * curtailing + pena_cost * np.maximum(
+        0, curtailing - max_curtailing
+    )
+
+
+def compensated_add(high, low, x):
+    """One step of cost.compensated_sum, elementwise. The rounding error of high + x is computed
+    without comparing the magnitudes (Knuth's two-sum), which gives exactly the same error
+    as the two branches of cost.compensated_sum, with fewer passes over the arrays.
+    :param high, low: arrays of compensated sums
+    :param x: the array of the values added
+    :return: high, low: the new compensated sums"""
+    total = high + x
+    x_part = total - high
+    # (high - (total - x_part)) + (x - x_part) + low, in two temporary arrays
+    error = total - x_part
+    np.subtract(high, error, out=error)
+    np.subtract(x, x_part, out=x_part)
+    error += x_part
+    return total, np.add(low, error, out=error)
+
+
+def compensated_sums(array):
+    """:return: high, low: the compensated sums of array over its last axis, added in order"""
+    high = np.zeros(array.shape[:-1])
+    low = np.zeros(array.shape[:-1])
+    # Contiguous columns
+    for column in np.ascontiguousarray(np.moveaxis(array, -1, 0)):
+        high, low = compensated_add(high, low, column)
+    return high, low
+
+
+def curtailing_matrices(nb_turbines, capacity, cable_rating, partner, powers):
+    """Computes the curtailing of every failure case and of the no-failure case for every scenario,
+    with the operations of cost.scenario_curtailings
+    :param nb_turbines, capacity, cable_rating, partner: the arrays describing the solution, see context_arrays,
+    of shape (nb_substations,), or (..., nb_substations) for a batch of solutions
+    :param powers: the array of the power generation of each scenario
+    :return: fail_curt, no_fail_curt: a (..., nb_scenarios, nb_substations) array where fail_curt[w, f] is
+    the total curtailing under scenario w when the f-th substation of the context fails,
+    and a (..., nb_scenarios) array of the no-failure curtailings
+    """
+    # Power received by each substation in each scenario
+    load = powers[:, None] * nb_turbines[..., None, :]
+    capacity = capacity[..., None, :]
+    # Curtailing of each substation when it works and receives nothing from a failed one
+    excess = load - capacity
+    own_curt = np.maximum(0, excess)
+    high, low = compensated_sums(own_curt)
+    no_fail_high, no_fail_low = compensated_sums(excess)
+    no_fail_curt = np.maximum(0, no_fail_high + no_fail_low)
+
+    # Curtailing of the failed substation itself, it can only send through its cable
+    failed_curt = np.maximum(0, load - cable_rating[..., None, :])
+    # The substation linked to the failed one receives what the cable can carry
+    # (a cable looping on a single substation carries nothing)
+    positions = np.arange(partner.shape[-1])
+    linked = ((partner >= 0) & (partner != positions))[..., None, :]
+    other = np.broadcast_to(np.where(partner >= 0, partner, positions)[..., None, :], load.shape)
+    power_sent = np.minimum(load, cable_rating[..., None, :])
+    other_own_curt = np.where(linked, np.take_along_axis(own_curt, other, axis=-1), 0)
+    other_curt = np.where(
+        linked,
+        np.maximum(
+            0,
+            (np.take_along_axis(load, other, axis=-1) + power_sent)
+            - np.take_along_axis(np.broadcast_to(capacity, load.shape), other, axis=-1),
+        ),
+        0,
+    )
+    # Every other substation behaves as in the no-failure case : starting from the sum of
+    # the no-failure vector, the terms of the failed substation and of its partner are replaced
+    # (adding zeros for the substations without partner leaves the sums unchanged)
+    high, low = high[..., None], low[..., None]
+    for x in (-own_curt, failed_curt, -other_own_curt, other_curt):
+        high, low = compensated_add(high, low, x)
+    return high + low, no_fail_curt
+
+
+def operational_costs(
+    instance, nb_turbines, capacity, prob_fail, cable_rating, partner, no_fail_proba, scenarios
+):
+    """Computes the operational cost of a solution, or of a batch of solutions at once,
+    from the arrays describing them
+    :param instance: the instance addressed by the solutions
+    :param nb_turbines, capacity, prob_fail, cable_rating, partner: the arrays describing the solutions,
+    see context_arrays, of shape (..., nb_substations)
+    :param no_fail_proba: the probability that no substation fails, a float or an array of shape (...)
+    :param scenarios: the scenarios, see scenario_arrays
+    :return: the operational cost of every solution, as an array of shape (...)"""
+    powers, probabilities, positions = scenarios
+    fail_curt, no_fail_curt = curtailing_matrices(
+        nb_turbines, capacity, cable_rating, partner, powers
+    )
+    # Same sums as cost.scenario_cost and cost.operational_cost
+    high, low = compensated_sums(
+        cost_of_curtailing_array(instance, fail_curt) * prob_fail[..., None, :]
+    )
+    high, low = compensated_add(
+        high,
+        low,
+        np.asarray(no_fail_proba)[..., None] * cost_of_curtailing_array(instance, no_fail_curt),
+    )
+    # Each distinct power was evaluated once, its cost is weighted by the probability of each of its scenarios
+    scenario_costs = probabilities * (high + low)[..., positions]
+    costs = [fsum(row) for row in scenario_costs.reshape(-1, len(probabilities)).tolist()]
+    return np.array(costs).reshape(scenario_costs.shape[:-1])
+
+
+def vectorized_operational_cost(instance, solution, context=None):
+    """Computes the operationnal cost of a given solution, defined in (7), with all the scenarios at once
+    :param instance: the instance addressed by the solution
+    :param solution: the solution given by the candidate
+    :param context: the evaluation context of the solution, built from instance and solution if not given
+    :return: the operational cost of the solution"""
+    if context is None:
+        context = evaluation_context(instance, solution)
+    no_fail_proba = no_failure_probability(context)
+    return operational_costs(
+        instance, *context_arrays(context), no_fail_proba, scenario_arrays(instance)
+    ).item()
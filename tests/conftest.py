@@ -0,0 +1,53 @@
+import glob
+import os
+
+import pytest
+
+from kiro_judge.api import load_instance, validate
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.converter import convert_instance, convert_solution
+from kiro_judge.loader import load_json
+
+# Shared data of the tests : the shipped instances, the shipped solutions which are valid
+# (most of them are not), and solutions generated on every instance by benchmark.generator.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTANCES = sorted(glob.glob(os.path.join(ROOT, "instances", "input", "*.json")))
+SOLUTIONS = sorted(glob.glob(os.path.join(ROOT, "instances", "output", "*.json")))
+
+
+def instance_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def solution_of(instance_path):
+    """:return: the path of the shipped solution of an instance, None if there is none"""
+    path = os.path.join(ROOT, "instances", "output", instance_name(instance_path) + "_sol.json")
+    return path if os.path.exists(path) else None
+
+
+def valid_pairs():
+    """:return: the list of the (instance path, solution path) of the valid shipped solutions"""
+    pairs = [(path, solution_of(path)) for path in INSTANCES if solution_of(path)]
+    return [(instance, solution) for instance, solution in pairs if not validate(load_instance(instance), solution)]
+
+
+@pytest.fixture(scope="session")
+def generated():
+    """Generates solutions of the shipped instances, once per session
+    :return: a function of the instance path and the number of solutions (3 by default)
+    returning the converted instance and the list of the converted solutions"""
+    cache = {}
+
+    def generated_solutions(path, nb_solutions=3):
+        if (path, nb_solutions) not in cache:
+            raw_instance = load_json(path)
+            raw_solutions = [generate_solution(raw_instance, seed) for seed in range(nb_solutions)]
+            # The converter modifies the raw instance
+            cache[path, nb_solutions] = (
+                convert_instance(raw_instance),
+                [convert_solution(solution) for solution in raw_solutions],
+            )
+        return cache[path, nb_solutions]
+
+    return generated_solutions
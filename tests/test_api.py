@@ -0,0 +1,42 @@
+import copy
+
+import pytest
+
+import kiro_judge
+from conftest import INSTANCES, instance_name, valid_pairs
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.constants import TURBINES
+from kiro_judge.converter import convert_solution
+from kiro_judge.cost import cost
+from kiro_judge.loader import load_json
+
+# The public API of the package, which never modifies the solutions it is given
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_validate_then_score(path):
+    instance = kiro_judge.load_instance(path)
+    raw_solution = generate_solution(load_json(path))
+    original = copy.deepcopy(raw_solution)
+    assert kiro_judge.validate(instance, raw_solution) == []
+    assert kiro_judge.score(instance, raw_solution) == cost(instance, convert_solution(copy.deepcopy(original)))
+    assert kiro_judge.score(instance, raw_solution) == kiro_judge.score(instance, raw_solution)
+    assert raw_solution == original
+
+
+@pytest.mark.parametrize("instance_path, solution_path", valid_pairs(), ids=lambda path: instance_name(path))
+def test_solution_files(instance_path, solution_path):
+    instance = kiro_judge.load_instance(instance_path)
+    assert kiro_judge.validate(instance, solution_path) == []
+    assert kiro_judge.score(instance, solution_path) == kiro_judge.score(instance, load_json(solution_path))
+
+
+def test_invalid_solution():
+    instance = kiro_judge.load_instance(INSTANCES[0])
+    raw_solution = generate_solution(load_json(INSTANCES[0]))
+    del raw_solution[TURBINES][0]
+    problems = kiro_judge.validate(instance, raw_solution)
+    assert problems
+    with pytest.raises(kiro_judge.InstanceError) as errors:
+        kiro_judge.score(instance, raw_solution)
+    assert errors.value.list == problems
@@ -0,0 +1,57 @@
+import shutil
+
+import pytest
+
+from conftest import INSTANCES, SOLUTIONS, instance_name
+from kiro_judge.batch_judge import batch_judge, solution_paths
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.loader import load_json, save_json
+from kiro_judge.rteparser import parser
+
+# The results of a batch are those of rteparser.parser, in the order of the paths, whatever the workers,
+# and a path that cannot be read only fails its own solution
+
+NB_GENERATED = 8
+
+
+@pytest.fixture(scope="module")
+def batch(tmp_path_factory):
+    """:return: the instance path and the directory of its solutions : the shipped ones (invalid for it),
+    generated ones, a malformed file, a file that is not text and a directory matched by the pattern"""
+    directory = tmp_path_factory.mktemp("solutions")
+    instance_path = next(path for path in INSTANCES if instance_name(path) == "medium")
+    for path in SOLUTIONS:
+        shutil.copy(path, directory)
+    for seed in range(NB_GENERATED):
+        save_json(generate_solution(load_json(instance_path), seed), directory / f"generated_{seed}.json")
+    (directory / "malformed.json").write_text('{"substations": [')
+    (directory / "undecodable.json").write_bytes(b"\xff\xfe\x00bad")
+    (directory / "directory.json").mkdir()
+    return instance_path, directory
+
+
+def without(results, names):
+    return [{name: value for name, value in result.items() if name not in names} for result in results]
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_workers(batch, cache):
+    instance_path, directory = batch
+    paths = solution_paths(str(directory))
+    sequential = batch_judge(instance_path, paths, workers=1, cache=cache)
+    assert [result["solution"] for result in sequential] == paths
+    # Each worker has its own cache in memory, so which solutions are found in it depends on the workers
+    ignored = ["time", "cached"] if cache else ["time"]
+    assert without(batch_judge(instance_path, paths, workers=2, cache=cache), ignored) == without(sequential, ignored)
+
+
+def test_results(batch):
+    instance_path, directory = batch
+    paths = solution_paths(str(directory))
+    results = batch_judge(instance_path, paths)
+    assert sum(result["score"] != -1 for result in results) >= NB_GENERATED
+    for result in results:
+        if result["solution"].endswith(("directory.json", "undecodable.json")):
+            assert result["score"] == -1 and "cannot read the solution" in result["errors"][0]
+        else:
+            assert result["score"] == parser(instance_path, result["solution"]).score
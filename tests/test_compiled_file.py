@@ -0,0 +1,77 @@
+import os
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.compiled_file import MAGIC, compiled_path, open_compiled_instance, read_compiled
+from kiro_judge.compiled_instance import CompiledInstance, compile_instance
+from kiro_judge.converter import convert_instance
+from kiro_judge.cost import cost
+from kiro_judge.loader import load_json
+
+# A compiled file gives back the CompiledInstance of its json instance, and the same scores,
+# and a truncated or corrupt compiled file is compiled again
+
+
+def assert_same_instance(compiled, reference):
+    for name in CompiledInstance.__slots__:
+        if name == "cache":
+            continue
+        expected, value = getattr(reference, name), getattr(compiled, name)
+        if isinstance(expected, np.ndarray):
+            assert np.array_equal(value, expected), name
+        else:
+            assert value == expected, name
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_round_trip(path, tmp_path, generated):
+    instance_path = str(tmp_path / "instance.json")
+    shutil.copy(path, instance_path)
+    reference = compile_instance(convert_instance(load_json(path)))
+    # Written by the first call, read by the second
+    open_compiled_instance(instance_path)
+    assert os.path.exists(compiled_path(instance_path))
+    compiled = open_compiled_instance(instance_path, write=False)
+    assert_same_instance(compiled, reference)
+    instance, solutions = generated(path)
+    for solution in solutions:
+        assert cost(compiled, solution) == cost(instance, solution)
+
+
+def corruptions(content):
+    """:return: the corrupt versions of the content of a compiled file, by name"""
+    header_start = len(MAGIC) + 8
+    header_length = int.from_bytes(content[len(MAGIC) : header_start], "little")
+    header_end = header_start + header_length
+    return {
+        "empty": b"",
+        "magic": content[: len(MAGIC) - 2],
+        "header_length": content[: header_start + 1],
+        "header": content[: header_end - 1],
+        "arrays": content[: header_end + (len(content) - header_end) // 2],
+        "last_byte": content[:-1],
+        "header_bytes": content[:header_start] + b"\xff" * header_length + content[header_end:],
+        "header_json": content[:header_start] + b"[" + b" " * (header_length - 1) + content[header_end:],
+        "huge_header_length": content[: len(MAGIC)] + (2**62).to_bytes(8, "little") + content[header_start:],
+    }
+
+
+def test_corrupt_file(tmp_path):
+    path = INSTANCES[0]
+    instance_path = str(tmp_path / "instance.json")
+    shutil.copy(path, instance_path)
+    reference = compile_instance(convert_instance(load_json(path)))
+    open_compiled_instance(instance_path)
+    with open(compiled_path(instance_path), "rb") as file:
+        content = file.read()
+    for name, corrupt in corruptions(content).items():
+        with open(compiled_path(instance_path), "wb") as file:
+            file.write(corrupt)
+        assert read_compiled(compiled_path(instance_path)) is None, name
+        # Compiled again, and written back
+        assert_same_instance(open_compiled_instance(instance_path), reference)
+        assert os.path.getsize(compiled_path(instance_path)) == len(content), name
@@ -0,0 +1,35 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.constants import SITE_SITE_DIST, TURBINE_SITE_DIST
+from kiro_judge.cost import construction_cost
+
+# A CompiledInstance gives exactly the construction cost of the converted instance,
+# and both give the same cost when the instance is too large for their distance tables
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_construction_cost(path, generated):
+    pytest.importorskip("numpy")
+    from kiro_judge.compiled_instance import compile_instance
+
+    instance, solutions = generated(path)
+    compiled = compile_instance(instance)
+    for solution in solutions:
+        assert construction_cost(compiled, solution) == construction_cost(instance, solution)
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_without_tables(path, generated, monkeypatch):
+    pytest.importorskip("numpy")
+    from kiro_judge import compiled_instance
+
+    instance, solutions = generated(path)
+    monkeypatch.setattr(compiled_instance, "MAX_TURBINE_SITE_TABLE", 0)
+    compiled = compiled_instance.compile_instance(instance)
+    assert compiled.turbine_site_table.size == 0
+    # As convert_instance leaves them above converter.MAX_DISTANCE_PAIRS
+    untabled = {**instance, SITE_SITE_DIST: None, TURBINE_SITE_DIST: None}
+    for solution in solutions:
+        assert construction_cost(compiled, solution) == construction_cost(instance, solution)
+        assert construction_cost(untabled, solution) == construction_cost(instance, solution)
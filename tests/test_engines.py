@@ -0,0 +1,28 @@
+import pytest
+
+from conftest import INSTANCES, instance_name, valid_pairs
+from kiro_judge.api import checked_solution, load_instance
+from kiro_judge.cost import cost, ENGINES, PYTHON_ENGINE
+
+# The numpy and sorted engines give the cost of the reference python engine
+
+
+def assert_engines_agree(instance, solution):
+    reference = cost(instance, solution, PYTHON_ENGINE)
+    for engine in ENGINES:
+        assert cost(instance, solution, engine) == pytest.approx(reference, rel=1e-12, abs=1e-9), engine
+
+
+@pytest.mark.parametrize("instance_path, solution_path", valid_pairs(), ids=lambda path: instance_name(path))
+def test_shipped_solutions(instance_path, solution_path):
+    pytest.importorskip("numpy")
+    instance = load_instance(instance_path)
+    assert_engines_agree(instance, checked_solution(instance, solution_path))
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_generated_solutions(path, generated):
+    pytest.importorskip("numpy")
+    instance, solutions = generated(path)
+    for solution in solutions:
+        assert_engines_agree(instance, solution)
@@ -0,0 +1,100 @@
+import copy
+import random
+
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.constants import *
+from kiro_judge.cost import construction_cost, cost
+from kiro_judge.errors import InstanceError
+from kiro_judge.incremental import IncrementalEvaluator
+
+# Random sequences of moves of the IncrementalEvaluator, checked against a full recompute of cost.cost
+
+NB_MOVES = 40
+
+
+def random_move(rng, instance, evaluator):
+    """Applies a random move to the solution of evaluator
+    :return: the total cost returned by the move"""
+    solution = evaluator.solution
+    built = sorted(solution[SUBSTATIONS])
+    unbuilt = sorted(set(instance[SUBSTATION_LOCATION]) - set(built))
+    empty = [site for site in built if not evaluator.context[site][NB_TURBINES]]
+    unlinked = [site for site in built if site not in solution[SUBSTATION_SUBSTATION_CABLES]]
+    moves = ["turbine", "sub_type", "land_cable"]
+    if len(unlinked) >= 2:
+        moves.append("add_cable")
+    if solution[SUBSTATION_SUBSTATION_CABLES]:
+        moves.append("remove_cable")
+    if unbuilt:
+        moves.append("open")
+    if empty:
+        moves.append("close")
+    move = rng.choice(moves)
+    if move == "turbine":
+        return evaluator.move_turbine(rng.choice(sorted(solution[TURBINES])), rng.choice(built))
+    if move == "sub_type":
+        return evaluator.set_substation_type(rng.choice(built), rng.choice(sorted(instance[SUBSTATION_TYPES])))
+    if move == "land_cable":
+        return evaluator.set_land_cable(rng.choice(built), rng.choice(sorted(instance[LAND_SUB_CABLE_TYPES])))
+    if move == "add_cable":
+        id1, id2 = rng.sample(unlinked, 2)
+        return evaluator.add_cable(id1, id2, rng.choice(sorted(instance[SUB_SUB_CABLE_TYPES])))
+    if move == "remove_cable":
+        return evaluator.remove_cable(rng.choice(sorted(solution[SUBSTATION_SUBSTATION_CABLES])))
+    if move == "open":
+        return evaluator.open_site(
+            rng.choice(unbuilt),
+            rng.choice(sorted(instance[SUBSTATION_TYPES])),
+            rng.choice(sorted(instance[LAND_SUB_CABLE_TYPES])),
+        )
+    return evaluator.close_site(rng.choice(empty))
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_random_moves(path, generated):
+    instance, solutions = generated(path)
+    rng = random.Random(0)
+    for solution in solutions:
+        # The evaluator modifies its solution
+        solution = copy.deepcopy(solution)
+        evaluator = IncrementalEvaluator(instance, solution)
+        for _ in range(NB_MOVES):
+            total = random_move(rng, instance, evaluator)
+            assert total == pytest.approx(cost(instance, solution), rel=1e-9)
+            assert evaluator.construction == construction_cost(instance, solution)
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_self_loop(path, generated):
+    # The validator accepts a cable linking a substation to itself, counted once
+    instance, solutions = generated(path)
+    solution = copy.deepcopy(solutions[0])
+    cables = solution[SUBSTATION_SUBSTATION_CABLES]
+    unlinked = sorted(site for site in solution[SUBSTATIONS] if site not in cables)
+    if not unlinked:
+        pytest.skip("every substation is linked")
+    site = unlinked[0]
+    cables[site] = {OTHER_SUB_ID: site, CABLE_TYPE_SUBSUB: min(instance[SUB_SUB_CABLE_TYPES])}
+    evaluator = IncrementalEvaluator(instance, solution)
+    assert evaluator.construction == construction_cost(instance, solution)
+    assert evaluator.cost() == pytest.approx(cost(instance, solution), rel=1e-9)
+    total = evaluator.remove_cable(site)
+    assert evaluator.construction == construction_cost(instance, solution)
+    assert total == pytest.approx(cost(instance, solution), rel=1e-9)
+    total = evaluator.add_cable(site, site, min(instance[SUB_SUB_CABLE_TYPES]))
+    assert evaluator.construction == construction_cost(instance, solution)
+    assert total == pytest.approx(cost(instance, solution), rel=1e-9)
+
+
+def test_invalid_moves(generated):
+    instance, solutions = generated(INSTANCES[0])
+    evaluator = IncrementalEvaluator(instance, copy.deepcopy(solutions[0]))
+    built = next(iter(evaluator.solution[SUBSTATIONS]))
+    with pytest.raises(InstanceError):
+        evaluator.move_turbine(len(instance[WIND_TURBINES]) + 1, built)
+    unbuilt = set(instance[SUBSTATION_LOCATION]) - set(evaluator.solution[SUBSTATIONS])
+    if unbuilt:
+        with pytest.raises(InstanceError):
+            evaluator.move_turbine(next(iter(evaluator.solution[TURBINES])), min(unbuilt))
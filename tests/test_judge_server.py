@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import SOLUTIONS, valid_pairs
+from kiro_judge.judge_server import InstanceCache, JudgeServer, judge
+from kiro_judge.loader import load_json
+from kiro_judge.rteparser import parser
+from kiro_judge.score_cache import ScoreCache
+
+# The server answers every request with a json body, the scores being those of rteparser.parser
+
+
+def post(server, body):
+    """:return: the status and the json body of the answer of the server to POST /score"""
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}/score", data=json.dumps(body).encode(), method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as answer:
+            return answer.status, json.loads(answer.read())
+    except urllib.error.HTTPError as answer:
+        return answer.code, json.loads(answer.read())
+
+
+@pytest.fixture
+def server(tmp_path):
+    instance_path, _ = valid_pairs()[0]
+    shutil.copy(instance_path, tmp_path / "instance.json")
+    (tmp_path / "directory.json").mkdir()
+    judge_server = JudgeServer(("127.0.0.1", 0), 4, 2, 4, 60, "python", str(tmp_path))
+    thread = threading.Thread(target=judge_server.serve_forever, daemon=True)
+    thread.start()
+    yield judge_server
+    judge_server.shutdown()
+    judge_server.server_close()
+
+
+def test_score(server):
+    instance_path, solution_path = valid_pairs()[0]
+    status, body = post(server, {"instance": "instance.json", "solution": load_json(solution_path)})
+    assert status == 200
+    assert body == {"score": parser(instance_path, solution_path).score, "errors": None}
+
+
+def test_unreadable_instance(server):
+    solution = load_json(SOLUTIONS[0])
+    status, body = post(server, {"instance": "directory.json", "solution": solution})
+    assert status == 200 and body["score"] == -1 and body["errors"]
+    status, body = post(server, {"instance": "../outside.json", "solution": solution})
+    assert status == 403
+
+
+def test_instance_cache(tmp_path, monkeypatch):
+    instance_path, _ = valid_pairs()[0]
+    path = tmp_path / "instance.json"
+    shutil.copy(instance_path, path)
+    cache = InstanceCache(1)
+    instance, instance_hash = cache.get(str(path))
+    # A file that did not change is neither read nor hashed again
+    monkeypatch.setattr("kiro_judge.judge_server.content_hash", None)
+    assert cache.get(str(path)) == (instance, instance_hash)
+    monkeypatch.undo()
+    # A file modified on disk is converted again
+    raw_instance = load_json(instance_path)
+    raw_instance["general_parameters"]["maximum_curtailing"] += 1
+    path.write_text(json.dumps(raw_instance))
+    os.utime(path, ns=(0, 0))
+    other, other_hash = cache.get(str(path))
+    assert other is not instance and other_hash != instance_hash
+
+
+def test_judge_score_cache(monkeypatch):
+    instance_path, solution_path = valid_pairs()[0]
+    cache, score_cache = InstanceCache(1), ScoreCache()
+    raw_solution = load_json(solution_path)
+    # The keys in another order, made before the checks, which modify the solution
+    reordered = json.loads(json.dumps(dict(reversed(list(raw_solution.items())))))
+    answer = judge(cache, instance_path, raw_solution, "python", score_cache)
+    assert answer == {"score": parser(instance_path, solution_path).score, "errors": None}
+    # The same solution, even written in another order, is found before it is checked
+    monkeypatch.setattr("kiro_judge.judge_server.check_and_convert_solution", None)
+    assert judge(cache, instance_path, reordered, "python", score_cache) == answer
+
+
+def test_judge_directory(tmp_path):
+    answer = judge(InstanceCache(1), str(tmp_path), {}, "python")
+    assert answer["score"] == -1 and "cannot read the instance" in answer["errors"]
+
+
+@pytest.mark.skipif(os.name != "posix" or os.geteuid() == 0, reason="root reads every file")
+def test_judge_unreadable(tmp_path):
+    path = tmp_path / "instance.json"
+    path.write_text("{}")
+    path.chmod(0)
+    answer = judge(InstanceCache(1), str(path), {}, "python")
+    assert answer["score"] == -1 and "cannot read the instance" in answer["errors"]
+
+
+def test_close_cancels_queued():
+    judge_server = JudgeServer(("127.0.0.1", 0), 4, 1, 4, 60, "python", ".")
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait()
+
+    running = judge_server.executor.submit(blocking)
+    queued = judge_server.executor.submit(lambda: None)
+    judge_server.futures.update((running, queued))
+    started.wait()
+    judge_server.server_close()
+    release.set()
+    assert queued.cancelled() and not running.cancelled()
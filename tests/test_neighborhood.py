@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.benchmark.neighborhood import rescored_delta
+from kiro_judge.cost import cost
+from kiro_judge.neighborhood import turbine_move_deltas
+
+# The batched turbine move deltas are the changes of cost.cost, up to rounding
+
+NB_SAMPLES = 10
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_turbine_move_deltas(path, generated):
+    instance, solutions = generated(path)
+    rng = random.Random(0)
+    for solution in solutions:
+        deltas, turbine_ids, site_ids = turbine_move_deltas(instance, solution)
+        assert deltas.shape == (len(turbine_ids), len(site_ids))
+        current = cost(instance, solution)
+        for _ in range(NB_SAMPLES):
+            i, j = rng.randrange(len(turbine_ids)), rng.randrange(len(site_ids))
+            delta, _ = rescored_delta(instance, solution, current, turbine_ids[i], site_ids[j])
+            assert abs(delta - deltas[i, j]) <= 1e-12 * current
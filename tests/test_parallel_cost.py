@@ -0,0 +1,24 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.cost import operational_cost
+
+# The parallel operational cost is exactly the sequential one, whatever the number of workers and chunks
+
+
+@pytest.mark.parametrize("path", INSTANCES[:2], ids=instance_name)
+def test_workers(path, generated):
+    instance, solutions = generated(path)
+    solution = solutions[0]
+    reference = operational_cost(instance, solution)
+    for workers in (1, 2, 3):
+        assert operational_cost(instance, solution, workers=workers) == reference
+
+
+def test_chunks(generated):
+    from kiro_judge.parallel_cost import parallel_operational_cost
+
+    instance, solutions = generated(INSTANCES[0])
+    reference = operational_cost(instance, solutions[0])
+    for chunks_per_worker in (1, 3, 1000):
+        assert parallel_operational_cost(instance, solutions[0], 1, chunks_per_worker=chunks_per_worker) == reference
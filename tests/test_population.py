@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.compiled_instance import compile_instance
+from kiro_judge.cost import cost
+from kiro_judge import population
+from kiro_judge.population import encode_population, score_population
+
+# score_population gives every solution exactly the cost of cost.cost
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_score_population(path, generated):
+    instance, solutions = generated(path, 10)
+    costs = score_population(instance, *encode_population(instance, solutions))
+    assert costs.tolist() == [cost(instance, solution) for solution in solutions]
+
+
+def test_batches(generated, monkeypatch):
+    instance, solutions = generated(INSTANCES[0], 10)
+    compiled = compile_instance(instance)
+    encoded = encode_population(compiled, solutions)
+    expected = score_population(compiled, *encoded)
+    # One solution per batch
+    monkeypatch.setattr(population, "BATCH_ELEMENTS", 1)
+    assert score_population(compiled, *encoded).tolist() == expected.tolist()
@@ -0,0 +1,71 @@
+import copy
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.benchmark.generator import SCALES, generate_instance, generate_solution
+from kiro_judge.compiled_instance import compile_instance
+from kiro_judge.constants import *
+from kiro_judge.converter import convert_instance, convert_solution
+from kiro_judge.cost import (
+    construction_cost,
+    operational_cost,
+    operational_cost_breakdown,
+    operational_cost_engine,
+    NUMPY_ENGINE,
+    PYTHON_ENGINE,
+    SORTED_ENGINE,
+)
+from kiro_judge.loader import load_json
+
+# A score is bit-identical whatever the path it is computed by : the python and numpy engines,
+# on the converted and on the compiled instance, in parallel, with the breakdown of rteparser,
+# and with the lists of the solution shuffled. The sorted engine only matches up to rounding.
+
+
+def shuffled(raw_solution, seed):
+    """:return: a copy of the raw solution with its lists and the ends of its cables in another order"""
+    rng = random.Random(seed)
+    solution = copy.deepcopy(raw_solution)
+    for key in (SUBSTATIONS, TURBINES, SUBSTATION_SUBSTATION_CABLES):
+        rng.shuffle(solution[key])
+    for cable in solution[SUBSTATION_SUBSTATION_CABLES]:
+        if rng.random() < 0.5:
+            cable[SUBSTATION_ID], cable[OTHER_SUB_ID] = cable[OTHER_SUB_ID], cable[SUBSTATION_ID]
+    return solution
+
+
+def assert_reproducible(raw_instance, raw_solution):
+    instance = convert_instance(copy.deepcopy(raw_instance))
+    compiled = compile_instance(instance)
+    solution = convert_solution(copy.deepcopy(raw_solution))
+    other_solution = convert_solution(shuffled(raw_solution, seed=len(solution[TURBINES])))
+
+    const_cost = construction_cost(instance, solution)
+    reference = const_cost + operational_cost(instance, solution)
+    for name, inst in (("converted", instance), ("compiled", compiled)):
+        for engine in (PYTHON_ENGINE, NUMPY_ENGINE):
+            function = operational_cost_engine(engine)
+            for sol in (solution, other_solution):
+                assert construction_cost(inst, sol) + function(inst, sol) == reference, (name, engine)
+    assert const_cost + operational_cost_breakdown(instance, solution)[0] == reference
+    assert const_cost + operational_cost(instance, solution, workers=2) == reference
+    sorted_score = const_cost + operational_cost_engine(SORTED_ENGINE)(instance, solution)
+    assert sorted_score == pytest.approx(reference, rel=1e-12)
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_shipped_instances(path):
+    raw_instance = load_json(path)
+    for seed in range(2):
+        assert_reproducible(raw_instance, generate_solution(raw_instance, seed))
+
+
+@pytest.mark.parametrize("scale", ["1e2", "1e3"])
+@pytest.mark.parametrize("seed", range(3))
+def test_synthetic_instances(scale, seed):
+    raw_instance = generate_instance(**SCALES[scale], seed=seed)
+    assert_reproducible(raw_instance, generate_solution(raw_instance, seed=seed))
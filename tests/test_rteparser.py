@@ -0,0 +1,32 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.constants import SUBSTATIONS, TURBINES, WIND_SCENARIOS
+from kiro_judge.converter import convert_instance, convert_solution
+from kiro_judge.cost import cost, scenario_groups
+from kiro_judge.loader import load_json, save_json
+from kiro_judge.rteparser import parser
+from kiro_judge.timings import Timings, SCENARIOS, SCENARIOS_EVALUATED, FAILURE_CASES_EVALUATED, TURBINE_SCANS
+
+# The parser scores a solution as cost.cost does, and counts the scenarios and failure cases it evaluates
+# and the turbines it reads
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_parser(path, tmp_path):
+    raw_solution = generate_solution(load_json(path))
+    solution_path = tmp_path / "solution.json"
+    save_json(raw_solution, solution_path)
+    timings = Timings()
+    result = parser(path, solution_path, timings)
+    instance, solution = convert_instance(load_json(path)), convert_solution(raw_solution)
+    assert result.score == cost(instance, solution)
+    nb_powers = len(scenario_groups(instance))
+    assert timings.counters == {
+        SCENARIOS: len(instance[WIND_SCENARIOS]),
+        SCENARIOS_EVALUATED: nb_powers,
+        FAILURE_CASES_EVALUATED: nb_powers * len(solution[SUBSTATIONS]),
+        # Checked and converted, then read by the construction cost and the evaluation context
+        TURBINE_SCANS: 3 * len(solution[TURBINES]),
+    }
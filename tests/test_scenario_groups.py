@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.benchmark.generator import generate_instance, generate_solution
+from kiro_judge.benchmark.scenario_groups import ungrouped
+from kiro_judge.converter import convert_instance, convert_solution, group_scenarios
+from kiro_judge.cost import cost, ENGINES, SORTED_ENGINE
+from kiro_judge.errors import InstanceError
+
+# Evaluating the scenarios once per distinct power gives the scores of one evaluation per scenario
+
+
+def assert_grouping_invariant(instance, solutions):
+    grouped = {
+        engine: [cost(instance, solution, engine) for solution in solutions] for engine in ENGINES
+    }
+    ungrouped(instance)
+    for engine in ENGINES:
+        for solution, score in zip(solutions, grouped[engine]):
+            if engine == SORTED_ENGINE:
+                assert cost(instance, solution, engine) == pytest.approx(score, rel=1e-12)
+            else:
+                assert cost(instance, solution, engine) == score, engine
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_shipped_instances(path, generated):
+    pytest.importorskip("numpy")
+    instance, solutions = generated(path)
+    # ungrouped modifies the instance
+    assert_grouping_invariant(dict(instance), solutions)
+
+
+def test_repeated_powers():
+    pytest.importorskip("numpy")
+    # Powers rounded to 3 decimals, many scenarios share one
+    raw_instance = generate_instance(50, 10, 4, 20000, seed=0)
+    raw_solutions = [generate_solution(raw_instance, seed) for seed in range(3)]
+    instance = convert_instance(raw_instance)
+    assert_grouping_invariant(instance, [convert_solution(solution) for solution in raw_solutions])
+
+
+def test_probabilities():
+    assert group_scenarios([(1.0, 0.25), (2.0, 0.5), (1.0, 0.25)]) == [(1.0, [0.25, 0.25]), (2.0, [0.5])]
+    with pytest.raises(InstanceError):
+        group_scenarios([(1.0, 0.7), (2.0, 0.7)])
@@ -0,0 +1,177 @@
+import copy
+import itertools
+from types import SimpleNamespace
+
+from conftest import INSTANCES, instance_name
+from kiro_judge import score_cache
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.converter import convert_instance
+from kiro_judge.loader import load_json, save_json
+from kiro_judge.score_cache import ScoreCache, solution_hash
+from kiro_judge.solution_pipeline import check_and_convert_solution
+
+# A score is found again from the same bytes of the solution file, or from the same solution whose lists
+# are in another order, in memory and on disk, the least recently used entries of both layers being evicted.
+# The disk layer keeps the scores between runs, unless the version of the cache changed.
+
+INSTANCE_HASH = "instance"
+ENGINE = "python"
+MEDIUM = next(path for path in INSTANCES if instance_name(path) == "medium")
+
+
+def reordered(raw_solution):
+    """:return: the raw solution with every list reversed"""
+    raw_solution = copy.deepcopy(raw_solution)
+    for value in raw_solution.values():
+        if isinstance(value, list):
+            value.reverse()
+    return raw_solution
+
+
+def solutions(tmp_path):
+    """:return: the converted instance of medium.json, a raw solution of it, its path, and the path
+    of the same solution with its lists reversed"""
+    raw_instance = load_json(MEDIUM)
+    raw_solution = generate_solution(raw_instance, seed=0)
+    instance = convert_instance(raw_instance)
+    save_json(raw_solution, tmp_path / "solution.json")
+    save_json(reordered(raw_solution), tmp_path / "reordered.json")
+    return instance, raw_solution, str(tmp_path / "solution.json"), str(tmp_path / "reordered.json")
+
+
+def keys(names):
+    return [ScoreCache.key(INSTANCE_HASH, ENGINE, name) for name in names]
+
+
+def test_solution_hash(tmp_path):
+    instance, raw_solution, _, _ = solutions(tmp_path)
+    solution = check_and_convert_solution(instance, copy.deepcopy(raw_solution))
+    other = check_and_convert_solution(instance, reordered(raw_solution))
+    assert solution_hash(other) == solution_hash(solution)
+    different = check_and_convert_solution(instance, generate_solution(load_json(MEDIUM), seed=1))
+    assert solution_hash(different) != solution_hash(solution)
+
+
+def test_lookups(tmp_path):
+    instance, raw_solution, solution_path, reordered_path = solutions(tmp_path)
+    cache = ScoreCache()
+    file_key, costs = cache.lookup_file(INSTANCE_HASH, ENGINE, solution_path)
+    assert costs is None
+    solution = check_and_convert_solution(instance, copy.deepcopy(raw_solution))
+    solution_keys, costs = cache.lookup_solution(INSTANCE_HASH, ENGINE, solution, file_key)
+    assert costs is None
+    cache.put(solution_keys, 1.0, 2.0)
+
+    # The same bytes, under another path
+    with open(solution_path, "rb") as file:
+        (tmp_path / "copy.json").write_bytes(file.read())
+    assert cache.lookup_file(INSTANCE_HASH, ENGINE, str(tmp_path / "copy.json"))[1] == (1.0, 2.0)
+
+    # Other bytes, but the same solution : found once converted, and stored under the key of its file
+    reordered_key, costs = cache.lookup_file(INSTANCE_HASH, ENGINE, reordered_path)
+    assert costs is None
+    other = check_and_convert_solution(instance, load_json(reordered_path))
+    assert cache.lookup_solution(INSTANCE_HASH, ENGINE, other, reordered_key)[1] == (1.0, 2.0)
+    assert cache.lookup_file(INSTANCE_HASH, ENGINE, reordered_path) == (reordered_key, (1.0, 2.0))
+
+    # Another engine or instance is not found
+    assert cache.lookup_file(INSTANCE_HASH, "numpy", solution_path)[1] is None
+    assert cache.lookup_file("other", ENGINE, solution_path)[1] is None
+
+
+def test_memory_eviction():
+    cache = ScoreCache(size=2)
+    a, b, c = keys("abc")
+    cache.put([a], 1.0, 1.0)
+    cache.put([b], 2.0, 2.0)
+    # a is now the most recently used
+    assert cache.get(a) == (1.0, 1.0)
+    cache.put([c], 3.0, 3.0)
+    assert cache.get(b) is None
+    assert cache.get(a) == (1.0, 1.0) and cache.get(c) == (3.0, 3.0)
+
+
+def test_disk_eviction(tmp_path, monkeypatch):
+    # A clock that always moves forward, so that no two entries are used at the same time
+    clock = itertools.count()
+    monkeypatch.setattr(score_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    path = str(tmp_path / "scores.db")
+    # Nothing kept in memory, every hit comes from the disk
+    cache = ScoreCache(size=0, path=path, max_disk_entries=2)
+    a, b, c = keys("abc")
+    cache.put([a], 1.0, 1.0)
+    cache.put([b], 2.0, 2.0)
+    assert cache.get(a) == (1.0, 1.0)
+    cache.put([c], 3.0, 3.0)
+    cache.close()
+
+    cache = ScoreCache(path=path, max_disk_entries=2)
+    assert cache.get(b) is None
+    assert cache.get(a) == (1.0, 1.0) and cache.get(c) == (3.0, 3.0)
+    assert cache._db.execute("SELECT COUNT(*) FROM scores").fetchone() == (2,)
+    cache.close()
+
+
+def test_disk_count(tmp_path):
+    path = str(tmp_path / "scores.db")
+    cache = ScoreCache(size=0, path=path, max_disk_entries=20)
+    names = [str(k) for k in range(20)]
+    for key in keys(names):
+        cache.put([key], 1.0, 1.0)
+    # Storing known keys again does not count them twice
+    cache.put(keys(names[:5]), 2.0, 2.0)
+    assert cache._db.execute("SELECT count FROM entries").fetchone() == (20,)
+    cache.close()
+
+    # Counted in the file, and exceeding the maximum evicts a tenth of the entries
+    cache = ScoreCache(size=0, path=path, max_disk_entries=20)
+    cache.put(keys(["new"]), 3.0, 3.0)
+    assert cache._db.execute("SELECT COUNT(*) FROM scores").fetchone() == (18,)
+    assert cache._db.execute("SELECT count FROM entries").fetchone() == (18,)
+    assert cache.get(keys(["new"])[0]) == (3.0, 3.0)
+    cache.close()
+
+
+def test_stats(tmp_path):
+    path = str(tmp_path / "scores.db")
+    a, b = keys("ab")
+    cache = ScoreCache(path=path)
+    assert cache.stats() == {
+        "memory_hits": 0, "disk_hits": 0, "misses": 0, "hit_rate": 0, "memory_entries": 0
+    }
+    assert cache.get(a) is None
+    cache.put([a, b], 1.0, 2.0)
+    cache.get(a)
+    cache.get(b)
+    assert cache.stats() == {
+        "memory_hits": 2, "disk_hits": 0, "misses": 1, "hit_rate": 2 / 3, "memory_entries": 2
+    }
+    cache.close()
+
+    cache = ScoreCache(path=path)
+    cache.get(a)
+    cache.get(a)
+    assert cache.stats() == {
+        "memory_hits": 1, "disk_hits": 1, "misses": 0, "hit_rate": 1, "memory_entries": 1
+    }
+    cache.close()
+
+
+def test_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "scores.db")
+    cache = ScoreCache(path=path)
+    key = cache.key("instance", "python", "solution")
+    cache.put([key], 1.0, 2.0)
+    cache.close()
+
+    cache = ScoreCache(path=path)
+    assert cache.get(key) == (1.0, 2.0)
+    cache.close()
+
+    monkeypatch.setattr(score_cache, "CACHE_VERSION", score_cache.CACHE_VERSION + 1)
+    cache = ScoreCache(path=path)
+    # Neither the old key nor the old rows are found
+    assert cache.get(key) is None
+    assert cache.get(cache.key("instance", "python", "solution")) is None
+    assert cache._db.execute("SELECT COUNT(*) FROM scores").fetchone() == (0,)
+    cache.close()
@@ -0,0 +1,88 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.benchmark.generator import generate_instance, generate_solution
+from kiro_judge.constants import *
+from kiro_judge.converter import convert_instance, convert_solution
+from kiro_judge.cost import evaluation_context, operational_cost, scenario_groups
+
+# The confidence intervals of the screening mode contain the exact operational cost about 95% of the time :
+# the coverage over many seeds must reach MIN_COVERAGE, below 95% to leave room for the sampling of the test.
+
+BUDGETS = [20, 50, 100]
+NB_SEEDS = 30
+MIN_COVERAGE = 0.92
+
+
+def coverage(instance, solutions, budgets, nb_seeds):
+    """:return: the share of the intervals containing the exact cost, over the solutions, budgets and seeds"""
+    covered = total = 0
+    for solution in solutions:
+        context = evaluation_context(instance, solution)
+        exact = operational_cost(instance, solution, context)
+        for budget in budgets:
+            for seed in range(nb_seeds):
+                _, low, high = operational_cost(instance, solution, context, budget=budget, seed=seed)
+                covered += low <= exact <= high
+                total += 1
+    return covered / total
+
+
+def no_failure_instance(rating):
+    """:return: a converted instance and solution where nothing fails and every capacity is rating,
+    the scenarios costing nothing below the power the capacities carry"""
+    raw_instance = generate_instance(20, 4, 2, 500, seed=0)
+    for key in (SUBSTATION_TYPES, LAND_SUB_CABLE_TYPES):
+        for kind in raw_instance[key]:
+            kind[PROB_FAIL] = 0
+    for key in (SUBSTATION_TYPES, LAND_SUB_CABLE_TYPES, SUB_SUB_CABLE_TYPES):
+        for kind in raw_instance[key]:
+            kind[RATING] = rating
+    raw_solution = generate_solution(raw_instance, seed=0)
+    return convert_instance(raw_instance), convert_solution(raw_solution)
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_coverage(path, generated):
+    instance, solutions = generated(path, 10)
+    budgets = [budget for budget in BUDGETS if budget < len(scenario_groups(instance))]
+    if not budgets:
+        pytest.skip("every budget covers the distinct powers")
+    assert coverage(instance, solutions, budgets, NB_SEEDS) >= MIN_COVERAGE
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_exact_budget(path, generated):
+    instance, solutions = generated(path)
+    budget = max(2, len(scenario_groups(instance)))
+    for solution in solutions:
+        exact = operational_cost(instance, solution)
+        assert operational_cost(instance, solution, budget=budget) == (exact, exact, exact)
+
+
+def test_same_seed(generated):
+    instance, solutions = generated(INSTANCES[0])
+    for solution in solutions:
+        for seed in range(3):
+            assert operational_cost(instance, solution, budget=20, seed=seed) == operational_cost(
+                instance, solution, budget=20, seed=seed
+            )
+
+
+def test_small_budget(generated):
+    instance, solutions = generated(INSTANCES[0])
+    with pytest.raises(ValueError):
+        operational_cost(instance, solutions[0], budget=1)
+
+
+def test_constant_cost():
+    # Every stratum costs nothing : the draws cost the same, and so do the ends of the strata
+    instance, solution = no_failure_instance(100000.0)
+    for seed in range(10):
+        assert operational_cost(instance, solution, budget=40, seed=seed) == (0, 0, 0)
+
+
+def test_constant_strata():
+    # Half the powers cost nothing : the strata whose draws cost the same get a width from their ends
+    instance, solution = no_failure_instance(90.0)
+    assert coverage(instance, [solution], [40], 100) >= MIN_COVERAGE
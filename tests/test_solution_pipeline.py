@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import INSTANCES, instance_name, solution_of
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.benchmark.solution_pipeline import two_passes
+from kiro_judge.errors import InstanceError
+from kiro_judge.loader import load_json
+from kiro_judge.solution_pipeline import check_and_convert_solution
+
+# The single pass check_and_convert_solution gives the same converted solution, or the same messages,
+# as solution_checker followed by convert_solution
+
+
+def outcome(function, instance, solution):
+    """:return: the converted solution, or the messages of the InstanceError raised"""
+    try:
+        return function(instance, solution)
+    except InstanceError as errors:
+        return errors.list
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_single_pass(path):
+    instance = load_json(path)
+    # The conversion modifies the solution, each function gets its own
+    if solution_of(path):
+        makers = [lambda: load_json(solution_of(path))]
+    else:
+        makers = []
+    makers += [lambda seed=seed: generate_solution(instance, seed) for seed in range(3)]
+    for make_solution in makers:
+        expected = outcome(two_passes, instance, make_solution())
+        assert outcome(check_and_convert_solution, instance, make_solution()) == expected
@@ -0,0 +1,21 @@
+import sys
+
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.benchmark.startup import HEAVY_MODULES, TINY_INSTANCE, best_run, imported_modules
+from kiro_judge.loader import load_json, save_json
+
+# Scoring one solution with the CLI imports none of the modules only some modes need
+# (the time budget of benchmark/startup.py depends on the machine, and is not checked here)
+
+
+def test_no_heavy_import(tmp_path):
+    solution_path = str(tmp_path / "solution.json")
+    save_json(generate_solution(load_json(TINY_INSTANCE)), solution_path)
+    command = [
+        sys.executable, "-X", "importtime", "-m", "kiro_judge.rteparser", "-i", TINY_INSTANCE, "-s", solution_path
+    ]
+    _, stderr = best_run(command, 1)
+    modules, _ = imported_modules(stderr)
+    # The CLI really ran (rteparser itself is run by runpy, not imported)
+    assert "kiro_judge.cost" in modules
+    assert [name for name in HEAVY_MODULES if name in modules] == []
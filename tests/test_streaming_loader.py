@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import INSTANCES, instance_name, solution_of
+from kiro_judge.benchmark.generator import generate_solution
+from kiro_judge.benchmark.streaming_loader import LOAD_JSON, NO_SOLUTION, peak_rss, run
+from kiro_judge.compiled_instance import CompiledInstance, compile_instance
+from kiro_judge.converter import convert_instance
+from kiro_judge.errors import InstanceError
+from kiro_judge.loader import load_json, save_json
+from kiro_judge.solution_pipeline import check_and_convert_solution
+from kiro_judge.streaming_loader import (
+    IJSON_BACKEND,
+    available_backends,
+    load_compiled_instance,
+    load_converted_solution,
+)
+
+# The streaming loader gives, with every available backend, the same compiled instances, converted solutions
+# and error messages as load_json followed by convert_instance, compile_instance and check_and_convert_solution.
+# With ijson, the peak memory of the process (measured as benchmark/streaming_loader.py does) is well below.
+
+# Size of the generated instance whose loading is measured, about 18 MB of json
+RSS_TURBINES = 100000
+RSS_SCENARIOS = 10000
+
+
+def outcome(load):
+    """:return: the converted solution, or the messages of the InstanceError raised"""
+    try:
+        return load()
+    except InstanceError as errors:
+        return errors.list
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_instances(path, backend):
+    reference = compile_instance(convert_instance(load_json(path)))
+    streamed = load_compiled_instance(path, backend)
+    for name in CompiledInstance.__slots__:
+        if name == "cache":
+            continue
+        expected, value = getattr(reference, name), getattr(streamed, name)
+        if isinstance(expected, np.ndarray):
+            assert np.array_equal(value, expected), name
+        else:
+            assert value == expected, name
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_solutions(path, backend, tmp_path):
+    instance = convert_instance(load_json(path))
+    # The shipped solution (mostly invalid ones) and a generated valid one
+    solution_paths = [solution_of(path)] if solution_of(path) else []
+    solution_paths.append(tmp_path / "generated.json")
+    save_json(generate_solution(load_json(path)), solution_paths[-1])
+    for solution_path in solution_paths:
+        expected = outcome(lambda: check_and_convert_solution(instance, load_json(solution_path)))
+        assert outcome(lambda: load_converted_solution(instance, solution_path, backend)) == expected
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_malformed_json(backend, tmp_path):
+    path = tmp_path / "malformed.json"
+    with open(INSTANCES[-1]) as file:
+        text = file.read()
+    path.write_text(text[: len(text) // 2])
+    with pytest.raises(InstanceError, match="bad JSON formatting"):
+        load_compiled_instance(path, backend)
+    with pytest.raises(InstanceError, match="bad JSON formatting"):
+        load_converted_solution(convert_instance(load_json(INSTANCES[-1])), path, backend)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="peak RSS read from /proc")
+def test_peak_rss(tmp_path):
+    if IJSON_BACKEND not in available_backends():
+        pytest.skip("the ijson backend is not installed")
+    run("--write", str(tmp_path), "-t", str(RSS_TURBINES), "-w", str(RSS_SCENARIOS))
+    instance_path, solution_path = str(tmp_path / "instance.json"), str(tmp_path / "solution.json")
+    # Each load in a fresh process, which holds about 30 MB before loading anything (numpy)
+    assert peak_rss(IJSON_BACKEND, instance_path, NO_SOLUTION) < 0.75 * peak_rss(LOAD_JSON, instance_path, NO_SOLUTION)
+    assert peak_rss(IJSON_BACKEND, instance_path, solution_path) < peak_rss(LOAD_JSON, instance_path, solution_path)
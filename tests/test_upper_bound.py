@@ -0,0 +1,26 @@
+import pytest
+
+from conftest import INSTANCES, instance_name
+from kiro_judge.cost import cost
+
+# The cost computed with an upper bound is the full cost when it does not exceed the bound,
+# and a lower bound of it above the bound otherwise
+
+
+def assert_bounded(instance, solution, full, bound):
+    value, exceeded = cost(instance, solution, upper_bound=bound)
+    if exceeded:
+        assert bound < full and value <= full
+    else:
+        assert value == full and full <= bound
+
+
+@pytest.mark.parametrize("path", INSTANCES, ids=instance_name)
+def test_upper_bound(path, generated):
+    instance, solutions = generated(path, 5)
+    costs = [cost(instance, solution) for solution in solutions]
+    ranked = sorted(costs)
+    bounds = [0, ranked[0], ranked[len(ranked) // 2], ranked[-1], float("inf")]
+    for solution, full in zip(solutions, costs):
+        for bound in bounds:
+            assert_bounded(instance, solution, full, bound)